@@ -1,11 +1,12 @@
 # api.py — thin runner for Negotiation Pro
 from __future__ import annotations
 
-import os
-from flask import request, jsonify
+import os, time, threading
+from flask import request
 
 # App factory lives in backend/app.py
 from backend.app import create_app
+from backend.serialization import json_response
 
 # Optional feedback store (loaded only if present)
 try:
@@ -13,11 +14,13 @@ try:
 except Exception:
     FeedbackStore = None  # fallback if module is not available
 
+from backend.feedback_analytics import NUMPY_AVAILABLE, CATEGORICAL
+
 app = create_app()
 
 @app.get("/healthz")
 def healthz():
-    return jsonify({"ok": True, "service": "NegotiationPro API runner"}), 200
+    return json_response({"ok": True, "service": "NegotiationPro API runner"})
 
 # Optional feedback endpoints (safe no-op if store missing)
 if FeedbackStore is not None:
@@ -29,11 +32,49 @@ if FeedbackStore is not None:
     def feedback():
         payload = request.get_json(silent=True) or {}
         feedback_store.add(payload)
-        return jsonify({"status": "ok", "aggregate": feedback_store.aggregate()}), 200
+        return json_response({"status": "ok", "aggregate": feedback_store.aggregate()})
 
     @app.get("/feedback/stats")
     def feedback_stats():
-        return jsonify({"status": "ok", "aggregate": feedback_store.aggregate()}), 200
+        return json_response({"status": "ok", "aggregate": feedback_store.aggregate()})
+
+    # Columnar analytics (needs numpy): built on first use, then refreshed with new log lines only
+    _table = {"t": None}
+    _table_lock = threading.Lock()
+
+    def _feedback_table():
+        from backend.feedback_analytics import FeedbackTable
+        with _table_lock:
+            if _table["t"] is None:
+                _table["t"] = FeedbackTable()
+            _table["t"].refresh(feedback_store)
+            return _table["t"]
+
+    @app.get("/feedback/analytics")
+    def feedback_analytics():
+        """
+        Success rate / usefulness by group over a window.
+          ?group_by=persona,country,scenario_id  (default)   ?days=30 | ?since=<unix>&until=<unix>
+          ?persona=Friend,Shark  ?country=UK  ?scenario_id=lowball  ?outcome=win  (comma = any of)
+        """
+        if not NUMPY_AVAILABLE:
+            return json_response({"status": "error", "error": "analytics needs numpy on the server"}, 501)
+        args = request.args
+        group_by = [g for g in (args.get("group_by") or "persona,country,scenario_id").split(",") if g]
+        filters = {c: args.get(c).split(",") for c in CATEGORICAL if args.get(c)}
+        try:
+            since = int(args["since"]) if "since" in args else None
+            until = int(args["until"]) if "until" in args else None
+            if "days" in args:
+                since = int(time.time() - float(args["days"]) * 86400)
+        except ValueError:
+            return json_response({"status": "error", "error": "since/until/days must be numbers"}, 400)
+        t0 = time.perf_counter()
+        try:
+            result = _feedback_table().query(group_by=group_by, since=since, until=until, **filters)
+        except ValueError as e:
+            return json_response({"status": "error", "error": str(e)}, 400)
+        return json_response({"status": "ok", **result, "ms": round((time.perf_counter() - t0) * 1000, 2)})
 
 
 if __name__ == "__main__":
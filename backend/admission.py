@@ -0,0 +1,136 @@
+# backend/admission.py
+# Admission control per endpoint class (report generation, PDF, static).
+# Each class has a concurrency limit and a bounded wait queue; a request that cannot start
+# within the class wait budget (or finds the queue full) gets a fast 503 + Retry-After
+# instead of piling up behind slow work.
+# Env (per class, "limit,queue,wait_seconds"): ADMISSION_REPORT, ADMISSION_PDF, ADMISSION_STATIC
+#   ADMISSION_ENABLED=0 turns the middleware off.
+
+from __future__ import annotations
+import os, math, time, threading
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask, g, request
+
+from backend.serialization import json_response
+
+# endpoint class -> (limit, max_queue, max_wait seconds)
+DEFAULT_LIMITS: Dict[str, Tuple[int, int, float]] = {
+    "report": (4, 16, 2.0),
+    "pdf": (2, 8, 1.0),
+    "static": (64, 256, 0.5),
+}
+
+# Flask endpoint name -> class; endpoints not listed are not admission-controlled
+DEFAULT_ENDPOINTS: Dict[str, str] = {
+    "questionnaire_report": "report",
+    "report_pdf": "pdf",
+    "index": "static",
+    "serve_frontend": "static",
+    "app_js_fallback": "static",
+    "report_embed_js_fallback": "static",
+}
+
+
+class AdmissionClass:
+    def __init__(self, name: str, limit: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max(0.0, max_wait)
+        self.active = 0
+        self.waiting = 0
+        self._cv = threading.Condition()
+        self.stats: Dict[str, int] = {"admitted": 0, "queued": 0, "rejected_full": 0, "rejected_timeout": 0}
+
+    def acquire(self) -> Optional[str]:
+        """Take a slot. Returns None when admitted, else the rejection reason."""
+        with self._cv:
+            if self.active < self.limit and not self.waiting:
+                self.active += 1
+                self.stats["admitted"] += 1
+                return None
+            if self.waiting >= self.max_queue:
+                self.stats["rejected_full"] += 1
+                return "queue_full"
+            self.waiting += 1
+            self.stats["queued"] += 1
+            t_end = time.monotonic() + self.max_wait
+            try:
+                while self.active >= self.limit:
+                    left = t_end - time.monotonic()
+                    if left <= 0:
+                        self.stats["rejected_timeout"] += 1
+                        return "timeout"
+                    self._cv.wait(left)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            self.stats["admitted"] += 1
+            return None
+
+    def release(self) -> None:
+        with self._cv:
+            self.active -= 1
+            self._cv.notify()
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.max_wait))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cv:
+            return dict(self.stats, active=self.active, queue_depth=self.waiting,
+                        limit=self.limit, max_queue=self.max_queue, max_wait=self.max_wait)
+
+
+def _limits_from_env(name: str, default: Tuple[int, int, float]) -> Tuple[int, int, float]:
+    raw = os.getenv(f"ADMISSION_{name.upper()}")
+    if not raw:
+        return default
+    try:
+        limit, queue, wait = [p.strip() for p in raw.split(",")]
+        return int(limit), int(queue), float(wait)
+    except ValueError:
+        return default
+
+
+class AdmissionController:
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, int, float]]] = None,
+                 endpoints: Optional[Dict[str, str]] = None):
+        limits = limits or {k: _limits_from_env(k, v) for k, v in DEFAULT_LIMITS.items()}
+        self.classes = {name: AdmissionClass(name, *spec) for name, spec in limits.items()}
+        self.endpoints = dict(DEFAULT_ENDPOINTS if endpoints is None else endpoints)
+
+    def classify(self, endpoint: Optional[str]) -> Optional[AdmissionClass]:
+        name = self.endpoints.get(endpoint or "")
+        return self.classes.get(name) if name else None
+
+    def init_app(self, app: Flask) -> None:
+        @app.before_request
+        def _admit():
+            cls = self.classify(request.endpoint)
+            if cls is None:
+                return None
+            reason = cls.acquire()
+            if reason is not None:
+                resp = json_response({"ok": False, "error": "server busy, retry shortly",
+                                      "class": cls.name, "reason": reason}, 503)
+                resp.headers["Retry-After"] = str(cls.retry_after())
+                return resp
+            g._admission = cls
+            return None
+
+        @app.teardown_request
+        def _release(_exc):
+            cls = g.pop("_admission", None)
+            if cls is not None:
+                cls.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: cls.snapshot() for name, cls in self.classes.items()}
+
+
+def controller_from_env() -> Optional[AdmissionController]:
+    if (os.getenv("ADMISSION_ENABLED", "1") or "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    return AdmissionController()
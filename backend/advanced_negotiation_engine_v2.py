@@ -3,13 +3,16 @@
 # NOTE: We DO NOT strip <script> tags — the template uses JS to render.
 
 from __future__ import annotations
-import os, json, re, traceback
-from typing import Dict, Any, List
+import os, json, traceback
+from typing import Dict, Any
 
 from backend.advanced_negotiation_engine import AdvancedNegotiationEngine
 from backend.rule_engine_expansion import RuleEngineExpansion
 from backend.questionnaire_mapper import map_questionnaire_to_inputs
 from backend.report_builder import build_report_html
+from backend.html_quality import HtmlQualityGate
+
+_QUALITY_GATE = HtmlQualityGate()
 
 def _clamp(v: float, lo: float = 0.0, hi: float = 100.0) -> float:
     return max(lo, min(hi, v))
@@ -40,32 +43,8 @@ class AdvancedNegotiationEngineV2:
         return int(_clamp(score, 35.0, 95.0))
 
     def _quality_note(self, html: str, persona: str | None, region: str | None) -> str:
-        warnings: List[str] = []
-        # Persona phrasing (counterpart-only)
-        head = html[:2000].lower()
-        if "negotiate as the friend" in head:
-            warnings.append("Persona phrasing: use counterpart style; avoid 'negotiate as The Friend'.")
-            html = re.sub(r"negotiate\s+as\s+(['\"]?)the\s+friend\1", "align with a Friend-style counterpart", html, flags=re.IGNORECASE)
-
-        # Currency consistency
-        if (region or "").lower().startswith("uk") and "£" not in html and "$" in html:
-            warnings.append("Currency mismatch: UK region should use GBP (£). Converted.")
-            html = html.replace("$", "£")
-
-        # Sources clickable (2+)
-        if html.lower().count("<a ") < 2:
-            warnings.append("Too few sources with links (need ≥ 2).")
-
-        # If we found issues — add an alert box (non-blocking)
-        if warnings:
-            alert = (
-                "<div style=\"background-color:#fffbe5;border:1px solid #fde047;"
-                "padding:12px;border-radius:8px;margin:16px 0;\">"
-                "<strong>AI Quality Alert:</strong> " + " ".join(warnings) +
-                "</div>"
-            )
-            # Put alert after <header> if exists
-            html = re.sub(r"(</header>)", r"\1" + alert, html, count=1, flags=re.IGNORECASE) if "</header>" in html else alert + html
+        # Persona phrasing, currency consistency, clickable sources, alert box — one pass (html_quality.py)
+        html, _warnings = _QUALITY_GATE.run(html, persona, region)
         return html
 
     def run(self, payload: Dict[str, Any]) -> Dict[str, Any]:
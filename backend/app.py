@@ -1,30 +1,73 @@
 # backend/app.py
 from __future__ import annotations
-import os, json, uuid, math
+import os, re, time, uuid, math, atexit, mimetypes
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Dict, Tuple
-from flask import Flask, jsonify, request, send_from_directory, make_response, Response
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+from flask import Flask, g, request, send_from_directory, make_response, Response
 from flask_cors import CORS
 
+from .report_sweeper import ReportSweeper
+from .pdf_renderer import PdfRenderer, PDF_AVAILABLE
+from .report_jobs import JobQueue
+from .serialization import dumps, dumps_bytes, loads, json_response
+from .llm_client import client_from_env
+from .slot_writer import SlotWriter, slot_key
+from .report_builder import set_slot_writer
+from .admission import controller_from_env
+from .profiling import profiler_from_env
+from .metrics import Registry, CONTENT_TYPE as METRICS_CONTENT_TYPE, rss_bytes, hit_ratio
+
 # ----- Optional PDF engine (WeasyPrint). Falls back gracefully if not installed. -----
-try:
-    from weasyprint import HTML  # pip install weasyprint
-    _PDF_AVAILABLE = True
-except Exception:
-    _PDF_AVAILABLE = False
+_PDF_AVAILABLE = PDF_AVAILABLE
 
 # ----- Paths -----
 BACKEND_DIR  = Path(__file__).resolve().parent
 ROOT_DIR     = BACKEND_DIR.parent
 FRONTEND_DIR = ROOT_DIR / "frontend"
+DIST_DIR     = FRONTEND_DIR / "dist"            # fingerprinted assets (scripts/build_assets.py)
 REPORTS_DIR  = BACKEND_DIR / "reports"          # runtime cache (HTML by report_id)
 SAVED_DIR    = BACKEND_DIR / "saved_reports"    # "save to profile" store
+PROFILES_DIR = BACKEND_DIR / "profiles"         # admin request profiles (PROFILING_ENABLED)
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 SAVED_DIR.mkdir(parents=True, exist_ok=True)
 
 BUILD = "negpro-backend-v9"
 REPORTS: Dict[str, str] = {}  # in-memory: report_id -> HTML
+REPORT_SECTIONS: Dict[str, Dict[str, Any]] = {}  # report_id -> per-section keys + HTML (incremental re-render)
+_RID_RE = re.compile(r"^[0-9a-f]{12}$")
+
+def _evict_report(rid: str) -> None:
+    REPORTS.pop(rid, None)
+    REPORT_SECTIONS.pop(rid, None)
+
+# ----- Retention: unsaved previews expire after REPORT_TTL_HOURS (saved ones are exempt) -----
+SWEEPER = ReportSweeper(REPORTS_DIR, SAVED_DIR, on_evict=_evict_report)
+
+# ----- PDF: rendered in a process pool (PDF_WORKERS), cached as reports/<rid>.<hash>.pdf -----
+PDF = PdfRenderer(REPORTS_DIR, base_url=str(ROOT_DIR))
+PDF_WAIT_SECONDS = float(os.getenv("PDF_WAIT_SECONDS", "10") or 10)
+
+# ----- Async report jobs (POST /questionnaire/report?mode=async) -----
+JOBS = JobQueue()
+
+# ----- Admission control: per-class concurrency + bounded wait, else 503 (ADMISSION_*) -----
+ADMISSION = controller_from_env()
+
+# ----- Opt-in request profiling (PROFILING_ENABLED + ADMIN_TOKEN; see profiling.py) -----
+PROFILER = profiler_from_env(PROFILES_DIR)
+
+# ----- Metrics (GET /metrics, Prometheus text format) -----
+METRICS = Registry()
+HTTP_REQUESTS = METRICS.counter("negpro_http_requests_total", "HTTP requests by route, method and status.",
+                                ("route", "method", "status"))
+HTTP_LATENCY = METRICS.histogram("negpro_http_request_duration_seconds", "HTTP request latency by route.",
+                                 ("route", "method"))
+REPORT_STAGE = METRICS.histogram("negpro_report_stage_duration_seconds", "Report pipeline stage timings.",
+                                 ("stage",))
+REPORT_BYTES = METRICS.counter("negpro_report_bytes_written_total", "Bytes of report artifacts written.",
+                               ("kind",))
 
 def _nocache(resp: Response) -> Response:
     resp.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
@@ -33,7 +76,31 @@ def _nocache(resp: Response) -> Response:
     return resp
 
 def _json(data: Any, code: int = 200) -> Response:
-    return _nocache(make_response(jsonify(data), code))
+    return _nocache(json_response(data, code))
+
+# ---------- Fingerprinted assets: frontend/dist/<name>.<hash>.<ext> never change ----------
+_HASHED_ASSET = re.compile(r"^dist/[\w.-]+\.[0-9a-f]{10}\.(?:js|css)$")
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+def _immutable(resp: Response) -> Response:
+    resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    resp.headers.pop("Pragma", None)
+    resp.headers.pop("Expires", None)
+    return resp
+
+def _send_hashed_asset(filename: str) -> Response:
+    """Serve a hashed asset, preferring a precompressed variant the client accepts."""
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in _PRECOMPRESSED:
+        if request.accept_encodings[encoding] and (FRONTEND_DIR / (filename + suffix)).exists():
+            resp = send_from_directory(str(FRONTEND_DIR), filename + suffix, mimetype=mimetype)
+            resp.headers["Content-Encoding"] = encoding
+            resp.headers.pop("Content-Disposition", None)
+            break
+    else:
+        resp = send_from_directory(str(FRONTEND_DIR), filename, mimetype=mimetype)
+    resp.headers["Vary"] = "Accept-Encoding"
+    return _immutable(resp)
 
 def _find_questionnaire() -> Path | None:
     candidates = [
@@ -57,37 +124,34 @@ def _make_engine():
 ENGINE = _make_engine()
 
 # ---------- OpenAI Enhancer (optional) ----------
+# Cached, concurrency-limited client with per-call deadline (see llm_client.py); None = disabled.
+# LLM_MODE=slots (default): the LLM writes only the summary + highlights slots, batched across
+#   concurrent reports (slot_writer.py). LLM_MODE=document: rewrite the whole report body.
+LLM = client_from_env()
+LLM_MODE = (os.getenv("LLM_MODE") or "slots").lower()
+SLOTS = SlotWriter(LLM) if LLM is not None and LLM_MODE == "slots" else None
+set_slot_writer(SLOTS)
+if SLOTS is not None:
+    atexit.register(SLOTS.close)
+
 def enhance_with_openai(html_content: str) -> str:
     """
-    If OPENAI_API_KEY exists:
+    If an LLM backend is configured (OPENAI_API_KEY or LLM_BACKEND):
       - Smooth, humanize, and slightly restructure the given HTML content.
-    If not present or fails:
+    If not configured, over its deadline, overloaded or failing:
       - Return the original html_content unchanged.
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return html_content
-    try:
-        import openai
-        openai.api_key = api_key
-        prompt = (
-            "You are a professional negotiation strategist and copywriter.\n"
-            "Take the following HTML report content and rewrite it in smooth, premium, human-friendly language.\n"
-            "Preserve the facts and intent. Keep valid HTML structure (<h3>, <ul>, <p>, etc.).\n\n"
-            f"{html_content}"
-        )
-        resp = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You improve and humanize HTML negotiation reports."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.6
-        )
-        return resp.choices[0].message["content"]
-    except Exception as e:
-        print(f"[OpenAI Enhancement Skipped] {e}")
+    if LLM is None:
         return html_content
+    return LLM.enhance(html_content)
+
+def _slots_for(answers: Dict[str, Any]) -> Dict[str, Any] | None:
+    """LLM summary + highlights for these answers (one batched write), or None to keep the rule text."""
+    if SLOTS is None:
+        return None
+    return SLOTS.write(answers.get("persona"), answers.get("country"),
+                       answers.get("salary_low"), answers.get("salary_high"),
+                       target=answers.get("salary_target"))
 
 # ---------- Helpers: market range ----------
 def _derive_range(low: float|None, high: float|None) -> Tuple[int|None,int|None,int|None,int|None,int|None]:
@@ -105,196 +169,399 @@ def _derive_range(low: float|None, high: float|None) -> Tuple[int|None,int|None,
     return (p25, median, p75, anchor, floor)
 
 # ---------- Premium HTML shell (self-contained, aligns with your theme) ----------
-def _html_shell(inner_html: str, title: str = "Strategic Negotiation Report") -> str:
-        return f"""<!doctype html>
-<html lang=\"en\">
+# Static parts are built once at import; each request only joins head + inner + tail.
+_SHELL_TITLE = "Strategic Negotiation Report"
+_SHELL_HEAD = """<!doctype html>
+<html lang="en">
 <head>
-<meta charset=\"utf-8\"><meta name=\"viewport\" content=\"width=device-width,initial-scale=1\">
-<title>{title}</title>
+<meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
+<title>%TITLE%</title>
 <style>
-    :root {{{{
+    :root {
         --bg:#0b1220; --panel:#151b2d; --ink:#e8ecff; --muted:#9FB1D9;
         --border:#28304a; --brand:#6EA8FF; --brand2:#7BF1A8; --accent:#A78BFA;
         --radius:18px; --shadow: 0 10px 28px rgba(0,0,0,.28);
-    }}}}
-    html,body{{{{height:100%}}}} body{{{{
+    }
+    html,body{height:100%} body{
         margin:0; background: radial-gradient(1200px 700px at 80% -10%, rgba(110,168,255,0.10), transparent 60%),
                                                  radial-gradient(900px 900px at -20% 10%, rgba(167,139,250,0.08), transparent 55%), var(--bg);
         color:var(--ink); font-family: Inter, system-ui, Segoe UI, Arial; line-height:1.55; padding:28px;
-    }}}}
-    .wrap{{{{max-width:1120px;margin:0 auto}}}}
-    .card{{{{background:linear-gradient(180deg, rgba(21,27,45,.92), rgba(11,18,32,.86));
-                 border:1px solid var(--border);border-radius:22px;padding:22px;box-shadow:var(--shadow)}}}}
-    h1{{{{margin:0 0 10px 0;font-size:28px}}}} h2,h3{{{{margin:.25rem 0 .5rem 0}}}}
-    .meta{{{{color:var(--muted);font-size:13px;margin-bottom:14px}}}}
-    .grid{{{{display:grid;gap:18px;grid-template-columns: 1.1fr .9fr}}}}
-    @media (max-width: 900px){{{{.grid{{{{grid-template-columns:1fr}}}}}}}}
+    }
+    .wrap{max-width:1120px;margin:0 auto}
+    .card{background:linear-gradient(180deg, rgba(21,27,45,.92), rgba(11,18,32,.86));
+                 border:1px solid var(--border);border-radius:22px;padding:22px;box-shadow:var(--shadow)}
+    h1{margin:0 0 10px 0;font-size:28px} h2,h3{margin:.25rem 0 .5rem 0}
+    .meta{color:var(--muted);font-size:13px;margin-bottom:14px}
+    .grid{display:grid;gap:18px;grid-template-columns: 1.1fr .9fr}
+    @media (max-width: 900px){.grid{grid-template-columns:1fr}}
     /* chips */
-    .chips{{{{display:flex;gap:8px;flex-wrap:wrap;margin-top:8px}}}}
-    .chip{{{{background:#0f1729;border:1px solid var(--border);padding:6px 10px;border-radius:999px;font-size:12px;color:var(--muted)}}}}
+    .chips{display:flex;gap:8px;flex-wrap:wrap;margin-top:8px}
+    .chip{background:#0f1729;border:1px solid var(--border);padding:6px 10px;border-radius:999px;font-size:12px;color:var(--muted)}
     /* range list */
-    .list{{{{display:flex;flex-direction:column;gap:10px}}}}
-    .row{{{{display:grid;grid-template-columns:140px 1fr 70px;gap:10px;align-items:center}}}}
-    .pill{{{{background:#10182a;border:1px solid var(--border);padding:10px 12px;border-radius:14px;color:var(--muted)}}}}
-    .bar{{{{position:relative;height:10px;background:#0e1526;border-radius:999px;overflow:hidden;border:1px solid var(--border)}}}}
-    .fill{{{{position:absolute;inset:0 0 0 0;transform:scaleX(0);transform-origin:left;animation:grow .9s ease forwards}}}}
-    @keyframes grow{{{{to{{{{transform:scaleX(var(--p))}}}}}}}}
-    .k{{{{
+    .list{display:flex;flex-direction:column;gap:10px}
+    .row{display:grid;grid-template-columns:140px 1fr 70px;gap:10px;align-items:center}
+    .pill{background:#10182a;border:1px solid var(--border);padding:10px 12px;border-radius:14px;color:var(--muted)}
+    .bar{position:relative;height:10px;background:#0e1526;border-radius:999px;overflow:hidden;border:1px solid var(--border)}
+    .fill{position:absolute;inset:0 0 0 0;transform:scaleX(0);transform-origin:left;animation:grow .9s ease forwards}
+    @keyframes grow{to{transform:scaleX(var(--p))}}
+    .k{
         background:linear-gradient(90deg, var(--brand), var(--brand2));
         mask:linear-gradient(90deg, #000 50%, rgba(0,0,0,.5) 100%);
         -webkit-mask:linear-gradient(90deg, #000 50%, rgba(0,0,0,.5) 100%);
-    }}}}
-    .actions{{{{display:flex;gap:10px;margin-top:18px}}}}
-    .btn{{{{appearance:none;border:1px solid var(--border);background:#0f1729;color:var(--ink);
-             border-radius:12px;padding:10px 14px;cursor:pointer;font-weight:700}}}}
-    .btn:hover{{{{filter:brightness(1.05)}}}}
-    .section{{{{margin-top:16px}}}}
-    details summary{{{{cursor:pointer;color:var(--muted)}}}}
-    table{{{{width:100%;border-collapse:collapse}}}} td,th{{{{border-bottom:1px solid var(--border);padding:8px;text-align:right}}}}
+    }
+    .actions{display:flex;gap:10px;margin-top:18px}
+    .btn{appearance:none;border:1px solid var(--border);background:#0f1729;color:var(--ink);
+             border-radius:12px;padding:10px 14px;cursor:pointer;font-weight:700}
+    .btn:hover{filter:brightness(1.05)}
+    .section{margin-top:16px}
+    details summary{cursor:pointer;color:var(--muted)}
+    table{width:100%;border-collapse:collapse} td,th{border-bottom:1px solid var(--border);padding:8px;text-align:right}
 </style>
 <script>
     // Animate bars based on data-range attributes
-    document.addEventListener('DOMContentLoaded', ()=>{{
-        document.querySelectorAll('[data-p]').forEach(el=>{{
+    document.addEventListener('DOMContentLoaded', ()=>{
+        document.querySelectorAll('[data-p]').forEach(el=>{
             const p = Math.max(0, Math.min(1, parseFloat(el.getAttribute('data-p')||'0')));
             el.style.setProperty('--p', p.toString());
-        }});
-    }});
+        });
+    });
 </script>
 </head>
 <body>
-    <div class=\"wrap\">
-        <div class=\"card\">
-            {inner_html}
-            <div class=\"actions\">
-                <button class=\"btn\" onclick=\"window.parent?.NP_Report?.downloadPDF()\">Download PDF</button>
-                <button class=\"btn\" onclick=\"window.parent?.NP_Report?.saveToProfile()\">Save to Profile</button>
+    <div class="wrap">
+        <div class="card">
+            """
+_SHELL_TAIL = """
+            <div class="actions">
+                <button class="btn" onclick="window.parent?.NP_Report?.downloadPDF()">Download PDF</button>
+                <button class="btn" onclick="window.parent?.NP_Report?.saveToProfile()">Save to Profile</button>
             </div>
         </div>
     </div>
 </body>
 </html>"""
 
-# ---------- Render premium report block ----------
-def _render_premium_report(data: Dict[str, Any]) -> str:
-    # Extract inputs (both mini-form flat and SPA {answers})
-    answers = data.get("answers") or data
-    industry = str(answers.get("industry", "General"))
-    role     = str(answers.get("role", "Professional"))
-    country  = str(answers.get("country", ""))
-    persona  = str(answers.get("persona", "neutral"))
-    tone     = str(answers.get("tone", "neutral"))
-
-    # arrays
-    priorities = answers.get("priorities") or []
-    if isinstance(priorities, str):
-        priorities = [x.strip() for x in priorities.split(",") if x.strip()]
-    impact = answers.get("impact") or []
-    if isinstance(impact, str):
-        impact = [x.strip() for x in impact.split(",") if x.strip()]
-
-    # numbers
-    def to_num(x):
-        try: return int(float(x))
-        except Exception: return None
-    low  = to_num(answers.get("salary_low"))
-    high = to_num(answers.get("salary_high"))
-    target = to_num(answers.get("salary_target"))
+@lru_cache(maxsize=8)
+def _shell_head(title: str) -> str:
+    return _SHELL_HEAD.replace("%TITLE%", title)
 
-    p25, median, p75, anchor, floor = _derive_range(low, high)
+def _html_shell(inner_html: str, title: str = _SHELL_TITLE) -> str:
+    return "".join((_shell_head(title), inner_html, _SHELL_TAIL))
 
-    # Build market range rows (hide values gracefully if missing)
-    def row(label, value, denom):
-        if value is None or low is None or high is None or high==low:
-            pill = f"<div class='pill'>—</div>"
-            bar  = "<div class='bar'><div class='fill k' data-p='0'></div></div>"
-            end  = "<div class='pill'>—</div>"
-        else:
-            # position bar by percentage of [low..high]
-            p = (value - low) / float(high - low)
-            pill = f"<div class='pill'>{label}</div>"
-            bar  = f"<div class='bar'><div class='fill k' data-p='{max(0,min(1,p))}'></div></div>"
-            end  = f"<div class='pill'>{value:,}</div>"
-        return f"<div class='row'>{pill}{bar}{end}</div>"
-
-    market_block = ""
-    if (low and high) or any(v is not None for v in (p25, median, p75, anchor, floor)):
-        market_block = f"""
+# ---------- Render premium report block ----------
+# Section templates are compiled once into bound str.format renderers.
+REPORT_DEBUG_SNAPSHOT = os.getenv("REPORT_DEBUG_SNAPSHOT", "").lower() in {"1", "true", "yes", "y"}
+
+_T_ROW = "<div class='row'>{}{}{}</div>".format
+_T_PILL = "<div class='pill'>{}</div>".format
+_T_BAR = "<div class='bar'><div class='fill k' data-p='{}'></div></div>".format
+_ROW_EMPTY = _T_ROW(_T_PILL("—"), _T_BAR(0), _T_PILL("—"))
+_T_LI = "<li>{}</li>".format
+_T_CHIP = "<span class='chip'>{}</span>".format
+_T_DEBUG_ROW = "<tr><td>{}</td><td>{}</td></tr>".format
+_T_HEADER = """
+      <h1>Strategic Negotiation Report</h1>
+      <div class="meta">{} • {} • Persona: {}</div>
+""".format
+_MARKET_OPEN = """
+      <div class="grid">
+        <div>
         <section class="section">
           <h3>Market Range</h3>
           <div class="list">
-            {row('p25', p25, high)}
-            {row('median', median, high)}
-            {row('p75', p75, high)}
-            {row('anchor', anchor, high)}
-            {row('floor', floor, high)}
+            """
+_MARKET_CLOSE = """
           </div>
         </section>
-        """
+        </div>
+"""
+_GRID_OPEN_EMPTY = """
+      <div class="grid">
+        <div>
+        </div>
+"""
+_T_HIGHLIGHTS = """        <div>
+          <section class="section">
+            <h3>Highlights</h3>
+            <ul>{}</ul>
+            <div class="chips">{}</div>
+          </section>
+        </div>
+      </div>
+""".format
+_T_SUMMARY = """
+      <section class="section">
+        <h3>Summary</h3>
+        <p>{}</p>
+      </section>
+""".format
+_DEBUG_OPEN = """
+    <details class="section"><summary>Debug Snapshot</summary>
+      <div class="card" style="margin-top:8px">
+        <table><thead><tr><th>Id</th><th>Value</th></tr></thead><tbody>"""
+_DEBUG_CLOSE = """</tbody></table>
+      </div>
+    </details>
+"""
+
+def _to_int(x: Any) -> int | None:
+    try: return int(float(x))
+    except Exception: return None
+
+def _as_list(x: Any) -> list:
+    if isinstance(x, str):
+        return [v.strip() for v in x.split(",") if v.strip()]
+    return x or []
+
+# Each section declares the answer fields it reads. A resubmission that names its previous
+# report re-renders only the sections whose inputs changed ("@date" = today, "*" = all answers).
+def _today() -> str:
+    return datetime.utcnow().strftime('%m/%d/%Y')
+
+def _sec_header(answers: Dict[str, Any], out: list, slots: Callable[[], Any]) -> None:
+    country = str(answers.get("country", ""))
+    persona = str(answers.get("persona", "neutral"))
+    out.append(_T_HEADER(country or '—', _today(), persona))
+
+def _sec_market(answers: Dict[str, Any], out: list, slots: Callable[[], Any]) -> None:
+    low  = _to_int(answers.get("salary_low"))
+    high = _to_int(answers.get("salary_high"))
+    p25, median, p75, anchor, floor = _derive_range(low, high)
+
+    # Market range rows (hide values gracefully if missing)
+    if not ((low and high) or any(v is not None for v in (p25, median, p75, anchor, floor))):
+        out.append(_GRID_OPEN_EMPTY)
+        return
+    out.append(_MARKET_OPEN)
+    for label, value in (("p25", p25), ("median", median), ("p75", p75), ("anchor", anchor), ("floor", floor)):
+        if value is None or low is None or high is None or high == low:
+            out.append(_ROW_EMPTY)
+        else:
+            # position bar by percentage of [low..high]
+            p = (value - low) / float(high - low)
+            out.append(_T_ROW(_T_PILL(label), _T_BAR(max(0, min(1, p))), _T_PILL(f"{value:,}")))
+    out.append(_MARKET_CLOSE)
+
+def _sec_highlights(answers: Dict[str, Any], out: list, slots: Callable[[], Any]) -> None:
+    country = str(answers.get("country", ""))
+    persona = str(answers.get("persona", "neutral"))
+    priorities = _as_list(answers.get("priorities"))
+    impact = _as_list(answers.get("impact"))
 
     # Highlights assembled from priorities/impact/persona
     hl_items = []
     if priorities: hl_items.append(f"Focus on {', '.join(priorities[:3])}")
     if impact:     hl_items.append("Lead with quantified achievements")
-    hl_items += ["Anchor high within reason", "Invite alignment on a shared goal"]
+    llm = slots()
+    hl_items += llm["strategic_highlights"] if llm else ["Anchor high within reason", "Invite alignment on a shared goal"]
+    chips = "".join(_T_CHIP(c) for c in (persona, country) if c)
+    out.append(_T_HIGHLIGHTS("".join(map(_T_LI, hl_items)), chips))
 
-    highlights = "".join(f"<li>{h}</li>" for h in hl_items)
+def _sec_summary(answers: Dict[str, Any], out: list, slots: Callable[[], Any]) -> None:
+    target = _to_int(answers.get("salary_target"))
+    p75 = _derive_range(_to_int(answers.get("salary_low")), _to_int(answers.get("salary_high")))[2]
 
     # Summary text (simple rule; OpenAI may smooth it)
-    summary_parts = []
     if p75 and target:
         if target >= p75:
-            summary_parts.append("Anchor near the 75th percentile with two quantified proof points.")
+            summary = "Anchor near the 75th percentile with two quantified proof points."
         else:
-            summary_parts.append("Anchor slightly above the median with evidence and flexible terms.")
+            summary = "Anchor slightly above the median with evidence and flexible terms."
     elif target:
-        summary_parts.append("Anchor with a clear target and emphasize mutual value.")
+        summary = "Anchor with a clear target and emphasize mutual value."
     else:
-        summary_parts.append("Use data-backed framing and tie requests to impact.")
-    summary = " ".join(summary_parts) + " Expect a decision within 5 business days."
-
-    # Chips for persona/region
-    chips = "".join(f"<span class='chip'>{c}</span>" for c in [persona, country] if c)
+        summary = "Use data-backed framing and tie requests to impact."
+    llm = slots()
+    summary = llm["executive_summary"] if llm else summary + " Expect a decision within 5 business days."
+    out.append(_T_SUMMARY(summary))
 
+def _sec_debug(answers: Dict[str, Any], out: list, slots: Callable[[], Any]) -> None:
     # Debug collapsible (to prove binding to answers)
-    rows = "".join(
-        f"<tr><td>{k}</td><td>{json.dumps(v, ensure_ascii=False)}</td></tr>"
-        for k, v in answers.items()
-    )
-    debug = f"""
-    <details class="section"><summary>Debug Snapshot</summary>
-      <div class="card" style="margin-top:8px">
-        <table><thead><tr><th>Id</th><th>Value</th></tr></thead><tbody>{rows}</tbody></table>
-      </div>
-    </details>
+    out.append(_DEBUG_OPEN)
+    out.extend(_T_DEBUG_ROW(k, dumps(v)) for k, v in answers.items())
+    out.append(_DEBUG_CLOSE)
+
+# Section renderers get `slots()`: the LLM summary + highlights for this render (None without an
+# LLM), fetched with one batched write the first time a section asks. "@slots" makes a section's
+# key follow the slot inputs (persona/country/range/target) whenever the LLM writes slots.
+_SECTIONS: Tuple[Tuple[str, Tuple[str, ...], Callable[[Dict[str, Any], list, Callable[[], Any]], None]], ...] = (
+    ("header",     ("country", "persona", "@date"),                 _sec_header),
+    ("market",     ("salary_low", "salary_high"),                   _sec_market),
+    ("highlights", ("priorities", "impact", "persona", "country", "salary_low", "salary_high", "@slots"), _sec_highlights),
+    ("summary",    ("salary_low", "salary_high", "salary_target", "persona", "country", "@slots"),   _sec_summary),
+    ("debug",      ("*",),                                          _sec_debug),
+)
+
+def _dep_value(answers: Dict[str, Any], d: str) -> Any:
+    if d == "*":
+        return answers
+    if d == "@date":
+        return _today()
+    if d == "@slots":
+        return None if SLOTS is None else slot_key(answers.get("persona"), answers.get("country"),
+                                                    answers.get("salary_low"), answers.get("salary_high"),
+                                                    answers.get("salary_target"))
+    return answers.get(d)
+
+def _section_key(answers: Dict[str, Any], deps: Tuple[str, ...]) -> str:
+    return dumps([_dep_value(answers, d) for d in deps])
+
+def render_report_sections(answers: Dict[str, Any], prev: Dict[str, Any] | None = None,
+                           debug: bool | None = None) -> Tuple[str, Dict[str, Any], list]:
     """
+    Render the premium report body section by section.
+    `prev` is the section state of an earlier report; sections whose inputs are unchanged are reused.
+    Returns (inner_html, section_state, reused_section_names).
+    """
+    show_debug = REPORT_DEBUG_SNAPSHOT if debug is None else debug
+    prev_keys = (prev or {}).get("keys") or {}
+    prev_html = (prev or {}).get("html") or {}
+    keys: Dict[str, str] = {}
+    parts: Dict[str, str] = {}
+    reused = []
+    fetched: list = []
+
+    def slots() -> Any:
+        if not fetched:
+            fetched.append(_slots_for(answers))
+        return fetched[0]
+
+    for name, deps, render in _SECTIONS:
+        if name == "debug" and not show_debug:
+            continue
+        key = _section_key(answers, deps)
+        if prev_keys.get(name) == key and name in prev_html:
+            parts[name] = prev_html[name]
+            reused.append(name)
+        else:
+            buf: list = []
+            render(answers, buf, slots)
+            parts[name] = "".join(buf)
+        keys[name] = key
+    return "".join(parts.values()), {"keys": keys, "html": parts}, reused
 
-    # Final block (two-column)
-    inner = f"""
-      <h1>Strategic Negotiation Report</h1>
-      <div class="meta">{country or '—'} • {datetime.utcnow().strftime('%m/%d/%Y')} • Persona: {persona}</div>
+def _render_premium_report(data: Dict[str, Any], debug: bool | None = None) -> str:
+    # Extract inputs (both mini-form flat and SPA {answers})
+    answers = data.get("answers") or data
+    return render_report_sections(answers, debug=debug)[0]
 
-      <div class="grid">
-        <div>
-          {market_block}
-        </div>
-        <div>
-          <section class="section">
-            <h3>Highlights</h3>
-            <ul>{highlights}</ul>
-            <div class="chips">{chips}</div>
-          </section>
-        </div>
-      </div>
+def _load_sections(rid: str) -> Dict[str, Any] | None:
+    state = REPORT_SECTIONS.get(rid)
+    if state is None:
+        path = REPORTS_DIR / f"{rid}.sections.json"
+        if path.exists():
+            try:
+                state = loads(path.read_bytes())
+            except Exception:
+                return None
+            REPORT_SECTIONS[rid] = state
+    return state
 
-      <section class="section">
-        <h3>Summary</h3>
-        <p>{summary}</p>
-      </section>
+class ReportError(Exception):
+    """Report pipeline failure; the message is returned to the client as `reason`."""
 
-      {debug}
+def _build_report(answers: Dict[str, Any], previous_report_id: str | None = None,
+                  progress: Callable[[str], None] | None = None) -> Dict[str, Any]:
+    """
+    Full report pipeline: engine/fallback render -> optional LLM polish -> shell + persist.
+    `previous_report_id` lets the section renderer reuse unchanged sections of that report.
+    `progress(stage)` is called as each stage starts (used by the async job API).
+    Returns { report_id, report_url } (+ reused_sections when a previous report was given).
     """
-    return inner
+    timing = {"stage": None, "t": 0.0}
+
+    def step(stage: str | None) -> None:
+        now = time.perf_counter()
+        if timing["stage"]:
+            REPORT_STAGE.observe(now - timing["t"], (timing["stage"],))
+        timing.update(stage=stage, t=now)
+        if stage and progress:
+            progress(stage)
+
+    sections = None
+    reused: list = []
+    prev = _load_sections(previous_report_id) if previous_report_id else None
+
+    # 1) Prefer real engine; else render premium fallback from answers
+    step("render")
+    if ENGINE:
+        try:
+            out = ENGINE.run(answers)  # expected {"status":"ok","html":"..."} or {"status":"ok","sections":[...]}
+        except Exception as e:
+            raise ReportError(f"engine failed: {e}") from e
+        if out.get("status") != "ok":
+            raise ReportError(out.get("reason", "engine error"))
+        if out.get("html"):
+            content_html = out["html"]
+        elif out.get("sections"):
+            # minimal renderer (sections -> HTML)
+            blocks=[]
+            for sec in out["sections"]:
+                heading = sec.get("heading","Section")
+                pts = sec.get("points",[])
+                blocks.append(f"<section class='section'><h3>{heading}</h3><ul>{''.join(f'<li>{p}</li>' for p in pts)}</ul></section>")
+            content_html = "\n".join(blocks)
+        else:
+            content_html, sections, reused = render_report_sections(answers, prev)
+    else:
+        content_html, sections, reused = render_report_sections(answers, prev)
+
+    # 2) Enhance with OpenAI (optional; in slots mode the LLM text is already in place)
+    step("enhance")
+    if LLM_MODE == "document":
+        content_html = enhance_with_openai(content_html)
+
+    # 3) Shell + actions, cache, return id & URL
+    step("persist")
+    full_html = _html_shell(content_html)
+    rid = uuid.uuid4().hex[:12]
+    REPORTS[rid] = full_html
+    body = full_html.encode("utf-8")
+    (REPORTS_DIR / f"{rid}.html").write_bytes(body)
+    REPORT_BYTES.inc(("html",), len(body))
+    if sections is not None:
+        REPORT_SECTIONS[rid] = sections
+        blob = dumps_bytes(sections)
+        (REPORTS_DIR / f"{rid}.sections.json").write_bytes(blob)
+        REPORT_BYTES.inc(("sections",), len(blob))
+    step(None)
+
+    out = {"report_id": rid, "report_url": f"/report/{rid}"}
+    if previous_report_id:
+        out["reused_sections"] = reused
+    return out
+
+# ----- Scrape-time metrics: read from the components that already track them -----
+def _cache_ratios() -> Dict[Tuple[str, ...], float | None]:
+    out: Dict[Tuple[str, ...], float | None] = {("pdf",): hit_ratio(PDF.stats["hits"], PDF.stats["misses"])}
+    if LLM is not None:
+        snap = LLM.snapshot()
+        out[("llm",)] = hit_ratio(snap["hits"], snap["misses"])
+    if SLOTS is not None:
+        snap = SLOTS.snapshot()
+        out[("slots",)] = hit_ratio(snap["cache_hits"] + snap["coalesced"],
+                                    snap["requests"] - snap["cache_hits"] - snap["coalesced"])
+    return out
+
+METRICS.callback("negpro_cache_hit_ratio", "Cache hit ratio per cache (since start).", _cache_ratios, ("cache",))
+METRICS.callback("negpro_pdf_queue_depth", "PDF renders queued or running.", lambda: {(): PDF.pending()})
+METRICS.callback("negpro_report_jobs_active", "Async report jobs queued or running.",
+                 lambda: {(): JOBS.stats()["active"]})
+METRICS.callback("negpro_admission_queue_depth", "Requests waiting for admission per endpoint class.",
+                 lambda: {(k,): v["queue_depth"] for k, v in (ADMISSION.snapshot() if ADMISSION else {}).items()},
+                 ("class",))
+METRICS.callback("negpro_admission_rejected_total", "Requests rejected by admission control.",
+                 lambda: {(k, r): v[f"rejected_{r}"] for k, v in (ADMISSION.snapshot() if ADMISSION else {}).items()
+                          for r in ("full", "timeout")},
+                 ("class", "reason"), type="counter")
+METRICS.callback("negpro_process_resident_memory_bytes", "Resident memory of this worker.",
+                 lambda: {(): rss_bytes()})
+METRICS.callback("negpro_reports_bytes_reclaimed_total", "Bytes of expired report files removed by the sweeper.",
+                 lambda: {(): SWEEPER.snapshot()["bytes_reclaimed"]}, type="counter")
+METRICS.callback("negpro_reports_files_removed_total", "Expired report files removed by the sweeper.",
+                 lambda: {(): SWEEPER.snapshot()["files_removed"]}, type="counter")
+METRICS.callback("negpro_reports_evicted_total", "Reports whose files were all removed by the sweeper.",
+                 lambda: {(): SWEEPER.snapshot()["reports_evicted"]}, type="counter")
 
 def create_app() -> Flask:
     app = Flask(__name__, static_folder=None)
@@ -302,9 +569,36 @@ def create_app() -> Flask:
     app.config["JSON_AS_ASCII"] = False
     app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 0
 
+    # Background sweeper is opt-in (REPORT_SWEEP_INTERVAL seconds; 0 = off, use the CLI instead)
+    sweep_every = float(os.getenv("REPORT_SWEEP_INTERVAL", "0") or 0)
+    if sweep_every > 0:
+        SWEEPER.start(sweep_every)
+
+    # request metrics first, so admission rejections are counted and timed too
+    @app.before_request
+    def _metrics_start():
+        g._t_start = time.perf_counter()
+
+    @app.after_request
+    def _metrics_observe(resp):
+        t0 = g.pop("_t_start", None)
+        if t0 is not None:
+            route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+            HTTP_LATENCY.observe(time.perf_counter() - t0, (route, request.method))
+            HTTP_REQUESTS.inc((route, request.method, str(resp.status_code)))
+        return resp
+
+    if ADMISSION is not None:
+        ADMISSION.init_app(app)
+    if PROFILER is not None:
+        PROFILER.init_app(app)
+
     # ---------- Static ----------
     @app.get("/")
     def index():
+        # built index references hashed assets; the page itself must stay fresh
+        if (DIST_DIR / "index.html").exists():
+            return _nocache(send_from_directory(str(DIST_DIR), "index.html"))
         idx = FRONTEND_DIR / "index.html"
         if not idx.exists():
             return _json({"error": f"{idx} not found"}, 404)
@@ -315,6 +609,8 @@ def create_app() -> Flask:
         file_path = FRONTEND_DIR / filename
         if not file_path.exists():
             return _json({"error": f"frontend file not found: {filename}"}, 404)
+        if _HASHED_ASSET.match(filename):
+            return _send_hashed_asset(filename)
         return _nocache(send_from_directory(str(FRONTEND_DIR), filename))
 
     # Legacy fallbacks
@@ -337,9 +633,21 @@ def create_app() -> Flask:
     def health():
         return _json({"ok": True, "build": BUILD, "ts": datetime.utcnow().isoformat() + "Z"})
 
-    # ---------- Demo data for dashboard / analytics ----------
+    @app.get("/admission/stats")
+    def admission_stats():
+        # per class: active, queue_depth, admitted, rejected_full / rejected_timeout
+        return _json({"enabled": ADMISSION is not None,
+                      "classes": ADMISSION.snapshot() if ADMISSION is not None else {}})
+
     @app.get("/metrics")
     def metrics():
+        resp = make_response(METRICS.render(), 200)
+        resp.headers["Content-Type"] = METRICS_CONTENT_TYPE
+        return _nocache(resp)
+
+    # ---------- Demo data for dashboard / analytics ----------
+    @app.get("/metrics/demo")
+    def metrics_demo():
         return _json({
             "total": 47,
             "success_rate": 0.78,
@@ -380,7 +688,7 @@ def create_app() -> Flask:
         if not path:
             return _json({"error": "questionnaire.json not found in project root/backend/frontend"}, 404)
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
+            data = loads(path.read_bytes())
             return _json(data)
         except Exception as e:
             return _json({"error": f"failed reading questionnaire.json: {e}"}, 500)
@@ -391,48 +699,45 @@ def create_app() -> Flask:
         Accepts either:
           { "answers": {...} }   <-- from SPA stepper
         or direct flat payload from mini-form (both supported).
+        Optional "previous_report_id" re-renders only sections whose answers changed.
         Returns:
           201 { ok, report_id, report_url }
+        With ?mode=async:
+          202 { ok, job_id, status_url }  (503 + Retry-After when the job queue is full)
         """
         payload = request.get_json(force=True) or {}
         # keep both shapes working
         answers = payload.get("answers") or payload.get("questionnaire") or payload or {}
         if not isinstance(answers, dict):
             return _json({"ok": False, "reason": "answers must be an object"}, 400)
+        # resubmission: re-render only the sections whose answers changed
+        previous = payload.get("previous_report_id")
+        if answers is payload:
+            answers = {k: v for k, v in answers.items() if k != "previous_report_id"}
+        if previous is not None and not (isinstance(previous, str) and _RID_RE.match(previous)):
+            return _json({"ok": False, "reason": "previous_report_id is not a valid report id"}, 400)
+
+        # Job mode: enqueue and return immediately; poll GET /jobs/<id> for progress + report_url
+        if request.args.get("mode") == "async":
+            job = JOBS.submit(_build_report, answers, previous)
+            if job is None:
+                resp = _json({"ok": False, "reason": "report queue is full, retry shortly"}, 503)
+                resp.headers["Retry-After"] = "5"
+                return resp
+            return _json({"ok": True, "job_id": job.id, "status_url": f"/jobs/{job.id}"}, 202)
 
-        # 1) Prefer real engine; else render premium fallback from answers
-        if ENGINE:
-            try:
-                out = ENGINE.run(answers)  # expected {"status":"ok","html":"..."} or {"status":"ok","sections":[...]}
-                if out.get("status") != "ok":
-                    return _json({"ok": False, "reason": out.get("reason", "engine error")}, 500)
-                if out.get("html"):
-                    content_html = out["html"]
-                elif out.get("sections"):
-                    # minimal renderer (sections -> HTML)
-                    blocks=[]
-                    for sec in out["sections"]:
-                        heading = sec.get("heading","Section")
-                        pts = sec.get("points",[])
-                        blocks.append(f"<section class='section'><h3>{heading}</h3><ul>{''.join(f'<li>{p}</li>' for p in pts)}</ul></section>")
-                    content_html = "\n".join(blocks)
-                else:
-                    content_html = _render_premium_report({"answers": answers})
-            except Exception as e:
-                return _json({"ok": False, "reason": f"engine failed: {e}"}, 500)
-        else:
-            content_html = _render_premium_report({"answers": answers})
-
-        # 2) Enhance with OpenAI (optional)
-        content_html = enhance_with_openai(content_html)
-
-        # 3) Shell + actions, cache, return id & URL
-        full_html = _html_shell(content_html)
-        rid = uuid.uuid4().hex[:12]
-        REPORTS[rid] = full_html
-        (REPORTS_DIR / f"{rid}.html").write_text(full_html, encoding="utf-8")
-
-        return _json({"ok": True, "report_id": rid, "report_url": f"/report/{rid}"}, 201)
+        try:
+            out = _build_report(answers, previous)
+        except ReportError as e:
+            return _json({"ok": False, "reason": str(e)}, 500)
+        return _json({"ok": True, **out}, 201)
+
+    @app.get("/jobs/<job_id>")
+    def job_status(job_id: str):
+        job = JOBS.get(job_id)
+        if job is None:
+            return _json({"ok": False, "error": "job not found"}, 404)
+        return _json({"ok": job.status != "error", **job.to_dict()})
 
     @app.get("/report/<rid>")
     def report_page(rid: str):
@@ -467,7 +772,7 @@ def create_app() -> Flask:
         index = []
         if meta_path.exists():
             try:
-                index = json.loads(meta_path.read_text(encoding="utf-8"))
+                index = loads(meta_path.read_bytes())
             except Exception:
                 index = []
         entry = {
@@ -478,7 +783,7 @@ def create_app() -> Flask:
             "saved_at": datetime.utcnow().isoformat() + "Z",
         }
         index = [e for e in index if e.get("report_id") != rid] + [entry]
-        meta_path.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+        meta_path.write_bytes(dumps_bytes(index))
 
         return _json({"ok": True, "saved_path": f"/backend/saved_reports/{rid}.html"})
 
@@ -501,12 +806,18 @@ def create_app() -> Flask:
             }, 501)
 
         try:
-            pdf_bytes = HTML(string=html, base_url=str(ROOT_DIR)).write_pdf()
-            resp = make_response(pdf_bytes, 200)
-            resp.mimetype = "application/pdf"
-            resp.headers["Content-Disposition"] = f'attachment; filename="negotiation_report_{rid}.pdf"'
-            return _nocache(resp)
+            status, pdf_path = PDF.render(rid, html, wait=PDF_WAIT_SECONDS)
         except Exception as e:
             return _json({"ok": False, "error": f"PDF generation failed: {e}"}, 500)
 
+        if status != "ready":
+            # queue saturated or still rendering: client polls the same URL
+            resp = _json({"ok": True, "status": status, "poll_url": f"/report/{rid}.pdf"}, 202)
+            resp.headers["Retry-After"] = "2"
+            return resp
+
+        resp = send_from_directory(str(REPORTS_DIR), pdf_path.name, mimetype="application/pdf",
+                                   as_attachment=True, download_name=f"negotiation_report_{rid}.pdf")
+        return _nocache(resp)
+
     return app
@@ -0,0 +1,170 @@
+# backend/feedback_analytics.py
+# Columnar feedback table for slice-and-dice analytics (success rate / usefulness by
+# persona x country x scenario over any time window).
+# Needs NumPy (pip install numpy); NUMPY_AVAILABLE is False without it and the API answers 501.
+# - ts / usefulness are plain columns; persona, country, scenario_id and outcome are categorical
+#   (int32 codes + one dictionary per column), so filters and group-bys are integer array ops.
+# - Columns grow by doubling: append() is amortized O(1); refresh() pulls only new log lines.
+
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np  # optional
+except Exception:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+CATEGORICAL = ("persona", "country", "scenario_id", "outcome")
+OUTCOMES = ("win", "partial", "loss")  # codes 0..2; other outcome values get later codes
+_DENSE_GROUPS = 1 << 22  # above this many possible groups, fall back to np.unique
+
+
+class _Categories:
+    def __init__(self, seed: Sequence[Any] = ()):
+        self.values: List[Any] = []
+        self.codes: Dict[Any, int] = {}
+        for v in seed:
+            self.code(v)
+
+    def code(self, value: Any) -> int:
+        c = self.codes.get(value)
+        if c is None:
+            c = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return c
+
+
+class FeedbackTable:
+    def __init__(self, capacity: int = 1024):
+        if np is None:
+            raise RuntimeError("FeedbackTable needs numpy (pip install numpy)")
+        self.n = 0
+        self.cats = {name: _Categories(OUTCOMES if name == "outcome" else ()) for name in CATEGORICAL}
+        self.cols: Dict[str, Any] = {}
+        self._alloc(capacity)
+        self._pos = (1, 0)  # feedback log position covered by refresh()
+
+    def _alloc(self, capacity: int) -> None:
+        new = {"ts": np.zeros(capacity, np.int64), "usefulness": np.zeros(capacity, np.float32)}
+        new.update({name: np.zeros(capacity, np.int32) for name in CATEGORICAL})
+        for k, arr in self.cols.items():
+            new[k][:self.n] = arr[:self.n]
+        self.cols = new
+        self.capacity = capacity
+
+    # ---------- Load ----------
+    def append(self, e: Dict[str, Any]) -> None:
+        if self.n == self.capacity:
+            self._alloc(self.capacity * 2)
+        i = self.n
+        try:
+            self.cols["ts"][i] = int(e.get("ts") or 0)
+        except (TypeError, ValueError):
+            self.cols["ts"][i] = 0
+        try:
+            self.cols["usefulness"][i] = float(e.get("usefulness") or 0)
+        except (TypeError, ValueError):
+            self.cols["usefulness"][i] = 0.0
+        for name in CATEGORICAL:
+            self.cols[name][i] = self.cats[name].code(e.get(name))
+        self.n += 1
+
+    def extend(self, entries: Iterable[Dict[str, Any]]) -> None:
+        for e in entries:
+            self.append(e)
+
+    def refresh(self, store) -> int:
+        """Append entries written to `store` (a FeedbackStore) since the last refresh."""
+        n = 0
+        for e, segment, offset in store.read_since(*self._pos):
+            if e is not None:
+                self.append(e)
+                n += 1
+            self._pos = (segment, offset)
+        return n
+
+    # ---------- Query ----------
+    def _mask(self, since: Optional[int], until: Optional[int], filters: Dict[str, Any]):
+        """Boolean row mask, or None when nothing is filtered."""
+        n = self.n
+        mask = None
+        ts = self.cols["ts"][:n]
+        conds = []
+        if since is not None:
+            conds.append(ts >= since)
+        if until is not None:
+            conds.append(ts < until)
+        for name, value in filters.items():
+            if value is None:
+                continue
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            codes = [self.cats[name].codes[v] for v in values if v in self.cats[name].codes]
+            if not codes:
+                return np.zeros(n, dtype=bool)
+            col = self.cols[name][:n]
+            conds.append((col == codes[0]) if len(codes) == 1 else np.isin(col, codes))
+        for c in conds:
+            mask = c if mask is None else (mask & c)
+        return mask
+
+    def query(self, group_by: Sequence[str] = ("persona", "country", "scenario_id"),
+              since: Optional[int] = None, until: Optional[int] = None,
+              **filters: Any) -> Dict[str, Any]:
+        """
+        Filter (time window + categorical equality / membership) and group.
+        Returns {"total": n, "groups": [{<group cols>, count, wins, partials, success_rate, avg_usefulness}]}
+        with groups sorted by count, largest first.
+        """
+        for name in list(group_by) + list(filters):
+            if name not in CATEGORICAL:
+                raise ValueError(f"unknown column: {name} (use {', '.join(CATEGORICAL)})")
+        mask = self._mask(since, until, filters)
+        n = self.n
+        col = (lambda name: self.cols[name][:n]) if mask is None else (lambda name: self.cols[name][:n][mask])
+        outcome = col("outcome")
+        n_out = len(self.cats["outcome"].values)
+
+        # one integer key per row from the group columns' codes (mixed radix)
+        sizes = [max(1, len(self.cats[g].values)) for g in group_by]
+        space = int(np.prod(sizes, dtype=np.int64)) if sizes else 1
+        dtype = np.int32 if space * n_out < 2 ** 31 else np.int64
+        key = np.zeros(len(outcome), dtype=dtype)
+        for g, size in zip(group_by, sizes):
+            key *= size
+            key += col(g)
+
+        if space * n_out <= _DENSE_GROUPS:
+            keys = np.arange(space)
+            inv = key
+        else:
+            keys, inv = np.unique(key, return_inverse=True)
+        # counts per (group, outcome) in one pass; wins/partials are outcome codes 0/1
+        inv_out = inv * n_out
+        inv_out += outcome
+        by_outcome = np.bincount(inv_out, minlength=len(keys) * n_out).reshape(len(keys), n_out)
+        count = by_outcome.sum(axis=1)
+        wins, partials = by_outcome[:, 0], by_outcome[:, 1]
+        useful_sum = np.bincount(inv, weights=col("usefulness"), minlength=len(keys))
+
+        present = np.flatnonzero(count)
+        present = present[np.argsort(-count[present], kind="stable")]
+        groups = []
+        for j in present.tolist():
+            labels: Dict[str, Any] = {}
+            k = int(keys[j])
+            for g, size in zip(reversed(group_by), reversed(sizes)):
+                k, code = divmod(k, size)
+                labels[g] = self.cats[g].values[code] if self.cats[g].values else None
+            row = {g: labels[g] for g in group_by}
+            c = int(count[j])
+            row.update(
+                count=c,
+                wins=int(wins[j]),
+                partials=int(partials[j]),
+                success_rate=round((int(wins[j]) + 0.5 * int(partials[j])) / c * 100, 1),
+                avg_usefulness=round(float(useful_sum[j]) / c, 2),
+            )
+            groups.append(row)
+        return {"total": int(len(outcome)), "groups": groups}
@@ -1,47 +1,91 @@
 # backend/feedback_loop.py
 # Summarize recent feedback to enrich Stage A (English-only).
+# Entries are rolled up into one bucket per UTC day (entry count, issue counters, sentiment sum)
+# when they arrive, so a 7/30/90-day summary sums a handful of buckets instead of rescanning
+# every entry. Windows cover whole UTC days, oldest day included.
 
 from __future__ import annotations
-from datetime import datetime, timedelta, timezone
+import time
 from collections import Counter
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Optional
+
+DAY_SECONDS = 86400
+
+
+class _DayBucket:
+    __slots__ = ("entries", "issues", "sentiment_sum")
+
+    def __init__(self):
+        self.entries = 0
+        self.issues: Counter = Counter()
+        self.sentiment_sum = 0.0
+
 
 class FeedbackLoop:
     def __init__(self, feedback_data: Dict[str, Any] | None):
         self.feedback_data = feedback_data or {}
-        self.entries: List[Dict[str, Any]] = list(self.feedback_data.get("entries", []))
+        self.total_entries = 0
+        self._days: Dict[int, _DayBucket] = {}
+        self._last_day: Optional[int] = None
+        self.extend(self.feedback_data.get("entries", []))
 
-    def analyze(self) -> Dict[str, Any]:
-        """Return a compact summary over the last 30 days.
+    def add(self, e: Dict[str, Any]) -> None:
+        """Fold one entry into its day bucket. O(number of issues on the entry)."""
+        self.total_entries += 1
+        try:
+            day = int(float(e["ts"]) // DAY_SECONDS)
+        except Exception:
+            return
+        b = self._days.get(day)
+        if b is None:
+            b = self._days[day] = _DayBucket()
+            if self._last_day is None or day > self._last_day:
+                self._last_day = day
+        b.entries += 1
+        b.issues.update(e.get("issues", []))
+        try:
+            b.sentiment_sum += float(e.get("sentiment_score", 0))
+        except Exception:
+            pass
+
+    def extend(self, entries: Iterable[Dict[str, Any]]) -> None:
+        for e in entries:
+            self.add(e)
+
+    def analyze(self, window_days: int = 30, now: Optional[float] = None) -> Dict[str, Any]:
+        """Return a compact summary over the last `window_days` days.
         Expects each entry like: { "ts": <unix seconds>, "issues": [..], "sentiment_score": float }
         """
-        if not self.entries:
+        if not self.total_entries:
             return {}
 
-        recent_threshold = datetime.now(timezone.utc) - timedelta(days=30)
-        recent: List[Dict[str, Any]] = []
-        for e in self.entries:
-            try:
-                t = datetime.fromtimestamp(float(e["ts"]), tz=timezone.utc)
-            except Exception:
-                continue
-            if t >= recent_threshold:
-                recent.append(e)
+        today = int((time.time() if now is None else now) // DAY_SECONDS)
+        first = today - window_days
+        last = max(today, self._last_day if self._last_day is not None else today)
 
-        issue_counter = Counter()
+        issue_counter: Counter = Counter()
+        recent = 0
         sentiment_sum = 0.0
-        for e in recent:
-            issue_counter.update(e.get("issues", []))
-            try:
-                sentiment_sum += float(e.get("sentiment_score", 0))
-            except Exception:
-                pass
+        if last - first < len(self._days):
+            buckets = (self._days.get(d) for d in range(first, last + 1))
+        else:  # sparse history or far-future timestamps: walk the buckets instead
+            buckets = (b for d, b in self._days.items() if d >= first)
+        for b in buckets:
+            if b is None:
+                continue
+            recent += b.entries
+            sentiment_sum += b.sentiment_sum
+            issue_counter.update(b.issues)
 
-        avg_sent = round(sentiment_sum / len(recent), 2) if recent else 0.0
+        avg_sent = round(sentiment_sum / recent, 2) if recent else 0.0
 
         return {
-            "total_entries": len(self.entries),
-            "recent_entries": len(recent),
+            "total_entries": self.total_entries,
+            "recent_entries": recent,
             "common_issues": issue_counter.most_common(5),
             "avg_sentiment": avg_sent,
         }
+
+    def windows(self, days: Iterable[int] = (7, 30, 90), now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Summaries for several windows at once, e.g. {"7d": {...}, "30d": {...}, "90d": {...}}."""
+        return {f"{d}d": self.analyze(d, now) for d in days}
@@ -1,27 +1,389 @@
 # backend/feedback_store.py
-import os, json, time
-from typing import Dict, Any, List
+# Append-only feedback log: data/feedback/feedback-000001.jsonl, feedback-000002.jsonl, ...
+# - add() appends one JSON line to the newest segment: O(1) regardless of history size.
+# - fsync is batched (every FEEDBACK_FSYNC_EVERY appends or FEEDBACK_FSYNC_SECONDS, whichever first);
+#   lines are flushed to the OS on every append, so readers see them immediately.
+# - a segment that reaches FEEDBACK_SEGMENT_BYTES is closed and a new one started.
+# - appends from several processes are serialized with an flock on feedback/.lock (POSIX).
+# - the legacy feedback_user.json document is copied into the log once (the file is left as-is);
+#   an interrupted copy is rolled back and redone on the next start.
+# - aggregate() is O(1): running totals live in feedback/aggregate.json together with the log
+#   position they cover, are folded forward on every append, and caught up from that position on
+#   startup. An append reads the log only when another process wrote since (the sidecar changed);
+#   the current segment number is kept, so the directory is listed only at rotation. `python -m backend.feedback_store --rebuild` recomputes them from the whole log.
+# - FEEDBACK_INGEST=spool (for several gunicorn workers): add() only appends the line to
+#   feedback/spool.jsonl under a short flock; one process elected through an flock on
+#   feedback/writer.lock moves the spool aside and appends it to the log as one batch
+#   (one write, one fsync, one sidecar update) every FEEDBACK_FLUSH_SECONDS. If the writer dies
+#   its lock is released and another worker takes over.
+# - Crash recovery: a torn line at the end of the log is truncated (on startup, and by a worker
+#   taking over from a dead writer), and spool batches left behind (*.inflight) are appended
+#   minus any leading lines the log already ends with.
+import os, re, sys, glob, time, atexit, logging, argparse, threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from backend.serialization import dumps_bytes, loads
+
+logger = logging.getLogger("FeedbackStore")
+
+try:
+    import fcntl  # POSIX only; single-process locking elsewhere
+except ImportError:
+    fcntl = None
+
+LEGACY_FILE = "feedback_user.json"
+LOG_DIRNAME = "feedback"
+MIGRATED_MARKER = ".migrated"
+AGGREGATE_FILE = "aggregate.json"
+SPOOL_FILE = "spool.jsonl"
+_SEGMENT_RE = re.compile(r"^feedback-(\d{6})\.jsonl$")
+
+
+def _env_num(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+@contextmanager
+def _flock(fd: int):
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def segment_name(n: int) -> str:
+    return f"feedback-{n:06d}.jsonl"
+
+
+def _empty_totals(segment: int = 1) -> Dict[str, Any]:
+    # log position covered: byte `offset` into segment number `segment`
+    return {"count": 0, "wins": 0, "partials": 0, "usefulness_sum": 0, "segment": segment, "offset": 0}
+
+
+def _fold(totals: Dict[str, Any], e: Dict[str, Any]) -> None:
+    totals["count"] += 1
+    outcome = e.get("outcome")
+    totals["wins"] += outcome == "win"
+    totals["partials"] += outcome == "partial"
+    try:
+        totals["usefulness_sum"] += int(e.get("usefulness", 0))
+    except (TypeError, ValueError):
+        pass
+
 
 class FeedbackStore:
     """
-    Tiny JSON store for user feedback. Appends entries and can aggregate simple stats.
+    Append-only JSON Lines store for user feedback. Appends entries and can aggregate simple stats.
     """
-    def __init__(self, data_dir: str):
-        self.path = os.path.join(data_dir, "feedback_user.json")
-        if not os.path.exists(self.path):
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump({"entries": []}, f)
+    def __init__(self, data_dir: str, segment_bytes: Optional[int] = None,
+                 fsync_every: Optional[int] = None, fsync_interval: Optional[float] = None,
+                 ingest: Optional[str] = None, flush_interval: Optional[float] = None):
+        self.data_dir = data_dir
+        self.legacy_path = os.path.join(data_dir, LEGACY_FILE)
+        self.log_dir = os.path.join(data_dir, LOG_DIRNAME)
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.segment_bytes = int(segment_bytes or _env_num("FEEDBACK_SEGMENT_BYTES", 8 * 1024 * 1024))
+        self.fsync_every = max(1, int(fsync_every or _env_num("FEEDBACK_FSYNC_EVERY", 32)))
+        self.fsync_interval = _env_num("FEEDBACK_FSYNC_SECONDS", 1.0) if fsync_interval is None else fsync_interval
+
+        self._lock = threading.Lock()
+        self._lock_fd = os.open(os.path.join(self.log_dir, ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        self._fh = None
+        self._seg = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.agg_path = os.path.join(self.log_dir, AGGREGATE_FILE)
+        self._totals = _empty_totals()
+        self._agg_stamp = None
+
+        with _flock(self._lock_fd):
+            self._migrate_legacy()
+            self._repair_tail()
+            self._sync_totals()
+            if self._catch_up():
+                self._write_totals()
+
+        # spool ingestion (single writer)
+        self.ingest = (ingest or os.getenv("FEEDBACK_INGEST") or "direct").lower()
+        self.flush_interval = _env_num("FEEDBACK_FLUSH_SECONDS", 0.2) if flush_interval is None else flush_interval
+        self.spool_path = os.path.join(self.log_dir, SPOOL_FILE)
+        self._spool_lock_fd = os.open(os.path.join(self.log_dir, ".spool.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        self._spool_fd: Optional[int] = None
+        self._writer_fd: Optional[int] = None
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if self.ingest == "spool" and fcntl is None:
+            logger.warning("FEEDBACK_INGEST=spool needs flock (POSIX); appending directly")
+            self.ingest = "direct"
+        if self.ingest == "spool":
+            self._try_become_writer()
+            self._flusher = threading.Thread(target=self._flush_loop, name="feedback-writer", daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    # ---------- Segments ----------
+    def segments(self) -> List[str]:
+        """Segment paths, oldest first."""
+        names = sorted(n for n in os.listdir(self.log_dir) if _SEGMENT_RE.match(n))
+        return [os.path.join(self.log_dir, n) for n in names]
+
+    def _segment_numbers(self) -> List[int]:
+        return [int(_SEGMENT_RE.match(os.path.basename(p)).group(1)) for p in self.segments()]
+
+    def _latest_segment_no(self) -> int:
+        nums = self._segment_numbers()
+        return nums[-1] if nums else 1
+
+    def _open_segment(self, n: int) -> None:
+        self._close_segment()
+        self._seg = n
+        self._fh = open(os.path.join(self.log_dir, segment_name(n)), "ab")
+
+    def _close_segment(self) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+            self._fh = None
+            self._unsynced = 0
 
-    def _load(self) -> Dict[str, Any]:
-        with open(self.path, "r", encoding="utf-8") as f:
-            return json.load(f)
+    def _writable_segment(self):
+        """Open (or move to) the newest segment; rotate if it is full. Caller holds both locks."""
+        if self._fh is None:
+            self._open_segment(self._latest_segment_no())
+        if os.fstat(self._fh.fileno()).st_size >= self.segment_bytes:
+            latest = self._latest_segment_no()
+            # another process may already have rotated; otherwise start the next segment
+            self._open_segment(latest if latest > self._seg else self._seg + 1)
+            if os.fstat(self._fh.fileno()).st_size >= self.segment_bytes:
+                self._open_segment(self._seg + 1)
+        return self._fh
 
-    def _save(self, doc: Dict[str, Any]) -> None:
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(doc, f, ensure_ascii=False, indent=2)
+    # ---------- Migration ----------
+    def _write_marker(self, info: Dict[str, Any]) -> None:
+        marker = os.path.join(self.log_dir, MIGRATED_MARKER)
+        tmp = f"{marker}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(dumps_bytes(info))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, marker)
+
+    def _migrate_legacy(self) -> None:
+        """
+        Copy the legacy entries into the log once. Caller holds the file lock.
+        A "pending" marker recording where the copy starts is written first, so a crash between
+        the copy and the final marker is undone (truncated back) and redone on the next start
+        instead of copying the entries twice.
+        """
+        marker = os.path.join(self.log_dir, MIGRATED_MARKER)
+        if os.path.exists(marker):
+            with open(marker, "rb") as f:
+                try:
+                    info = loads(f.read()) or {}
+                except ValueError:
+                    info = {}
+            if info.get("state", "done") != "pending":
+                return
+            path = os.path.join(self.log_dir, segment_name(info["segment"]))
+            if os.path.exists(path) and os.path.getsize(path) > info["offset"]:
+                logger.warning("undoing interrupted legacy migration in %s", path)
+                with open(path, "rb+") as f:
+                    f.truncate(info["offset"])
+                    os.fsync(f.fileno())
+        entries: List[Dict[str, Any]] = []
+        if os.path.exists(self.legacy_path):
+            with open(self.legacy_path, "rb") as f:
+                entries = (loads(f.read()) or {}).get("entries", [])
+        info = {"source": LEGACY_FILE, "entries": len(entries), "ts": int(time.time())}
+        if entries:
+            seg = self._latest_segment_no()
+            path = os.path.join(self.log_dir, segment_name(seg))
+            start = os.path.getsize(path) if os.path.exists(path) else 0
+            self._write_marker(dict(info, state="pending", segment=seg, offset=start))
+            with open(path, "ab") as fh:
+                fh.write(b"".join(dumps_bytes(e) + b"\n" for e in entries))
+                fh.flush()
+                os.fsync(fh.fileno())
+        self._write_marker(dict(info, state="done"))
+
+    # ---------- Aggregate sidecar ----------
+    def _stamp(self):
+        try:
+            st = os.stat(self.agg_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _sync_totals(self) -> bool:
+        """Reload the sidecar if another process (or a rebuild) replaced it. True if reloaded."""
+        stamp = self._stamp()
+        if stamp is None or stamp == self._agg_stamp:
+            return False
+        try:
+            with open(self.agg_path, "rb") as f:
+                totals = loads(f.read())
+            self._totals = {**_empty_totals(), **totals}
+            self._agg_stamp = stamp
+            return True
+        except (OSError, ValueError):
+            return False  # torn or missing: keep what we have; _catch_up() fills any gap
+
+    def _write_totals(self) -> None:
+        tmp = f"{self.agg_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(dumps_bytes(self._totals))
+        os.replace(tmp, self.agg_path)
+        self._agg_stamp = self._stamp()
+
+    def read_since(self, segment: int, offset: int) -> Iterator[Tuple[Optional[Dict[str, Any]], int, int]]:
+        """
+        Stream complete lines after log position (segment, offset): yields (entry, segment, offset)
+        with the position just past each line (entry is None for an unparseable line).
+        Segments are numbered without gaps, so they are opened in turn until the next one is missing;
+        the directory is listed only when `segment` itself does not exist.
+        """
+        if not os.path.exists(os.path.join(self.log_dir, segment_name(segment))):
+            segment = next((n for n in self._segment_numbers() if n > segment), None)
+            if segment is None:
+                return
+            offset = 0
+        while True:
+            try:
+                f = open(os.path.join(self.log_dir, segment_name(segment)), "rb")
+            except FileNotFoundError:
+                return
+            with f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # torn tail: wait for the line to complete
+                    offset += len(raw)
+                    try:
+                        entry = loads(raw)
+                    except ValueError:
+                        entry = None
+                    yield entry, segment, offset
+            segment, offset = segment + 1, 0
+
+    def _catch_up(self) -> bool:
+        """Fold in complete lines past the sidecar's log position. Caller holds the file lock."""
+        t = self._totals
+        moved = False
+        for e, segment, offset in self.read_since(t["segment"], t["offset"]):
+            if e is not None:
+                _fold(t, e)
+            t["segment"], t["offset"] = segment, offset
+            moved = True
+        return moved
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Recompute the sidecar from the full log."""
+        with self._lock, _flock(self._lock_fd):
+            nums = self._segment_numbers()
+            self._totals = _empty_totals(nums[0] if nums else 1)
+            self._catch_up()
+            self._write_totals()
+        return self.aggregate()
+
+    # ---------- Crash recovery ----------
+    def _repair_tail(self) -> None:
+        """Truncate a torn last line (writer died mid-append) so later appends start clean."""
+        segs = self.segments()
+        if not segs:
+            return
+        with open(segs[-1], "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            # scan back to the last complete line
+            pos = size
+            while pos > 0:
+                step = min(4096, pos)
+                f.seek(pos - step)
+                chunk = f.read(step)
+                nl = chunk.rfind(b"\n")
+                if nl >= 0:
+                    pos = pos - step + nl + 1
+                    break
+                pos -= step
+            logger.warning("truncating %d torn bytes at end of %s", size - pos, segs[-1])
+            f.truncate(pos)
+            os.fsync(f.fileno())
+
+    def _committed_prefix(self, data: bytes) -> int:
+        """
+        Length of the longest run of `data`'s leading lines that the log already ends with, i.e.
+        how much of a spool batch a dead writer managed to append before it died.
+        """
+        segs = self.segments()
+        if not segs or not data:
+            return 0
+        with open(segs[-1], "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - len(data)))
+            tail = f.read()
+        end = len(data)
+        while end > 0:
+            if tail.endswith(data[:end]):
+                return end
+            end = data.rfind(b"\n", 0, end - 1) + 1
+        return 0
+
+    # ---------- Write ----------
+    def _append(self, lines: List[bytes], entries: List[Dict[str, Any]], sync: bool = False) -> None:
+        """Append complete lines to the log and fold them into the totals. Caller holds self._lock."""
+        with _flock(self._lock_fd):
+            self._append_locked(lines, entries, sync)
+
+    def _append_locked(self, lines: List[bytes], entries: List[Dict[str, Any]], sync: bool = False) -> None:
+        """_append() for callers that already hold the file lock."""
+        fh = self._writable_segment()
+        # Only lines this process has not seen need folding in: other writers replace the sidecar
+        # (new stamp), and a writer that died before doing so leaves the log past our position.
+        reloaded = self._sync_totals()
+        t = self._totals
+        if reloaded or (t["segment"], t["offset"]) != (self._seg, os.fstat(fh.fileno()).st_size):
+            self._catch_up()
+        fh.write(b"".join(lines))
+        fh.flush()
+        for e in entries:
+            _fold(self._totals, e)
+        self._totals.update(segment=self._seg, offset=fh.tell())
+        self._write_totals()
+        self._unsynced += len(lines)
+        now = time.monotonic()
+        if sync or self._unsynced >= self.fsync_every or now - self._last_sync >= self.fsync_interval:
+            os.fsync(fh.fileno())
+            self._unsynced = 0
+            self._last_sync = now
+
+    def _spool(self, line: bytes) -> None:
+        """Worker side: one short locked write to the shared spool."""
+        with _flock(self._spool_lock_fd):
+            try:
+                current = os.stat(self.spool_path).st_ino
+            except FileNotFoundError:
+                current = None
+            # the writer renames the spool away; follow it to the new file
+            if self._spool_fd is None or os.fstat(self._spool_fd).st_ino != current:
+                if self._spool_fd is not None:
+                    os.close(self._spool_fd)
+                self._spool_fd = os.open(self.spool_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.write(self._spool_fd, line)
 
     def add(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        doc = self._load()
         entry = {
             "ts": int(time.time()),
             "scenario_id": payload.get("scenario_id"),
@@ -31,22 +393,143 @@ class FeedbackStore:
             "persona": payload.get("persona"),
             "country": payload.get("country")
         }
-        doc["entries"].append(entry)
-        self._save(doc)
+        line = dumps_bytes(entry) + b"\n"
+        with self._lock:
+            if self.ingest == "spool":
+                self._spool(line)
+            else:
+                self._append([line], [entry])
         return entry
 
+    # ---------- Single writer (spool mode) ----------
+    def _try_become_writer(self) -> bool:
+        if self._writer_fd is not None:
+            return True
+        if fcntl is None:
+            return False
+        fd = os.open(os.path.join(self.log_dir, "writer.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._writer_fd = fd
+        with self._lock:
+            self._recover_inflight()
+        return True
+
+    def _recover_inflight(self) -> None:
+        """Replay spool batches left by a dead writer. Caller holds self._lock."""
+        paths = sorted(glob.glob(os.path.join(self.log_dir, "spool.*.inflight")))
+        if not paths:
+            return
+        with _flock(self._lock_fd):
+            self._repair_tail()  # the dead writer may have left half a line behind
+            for path in paths:
+                with open(path, "rb") as f:
+                    data = f.read()
+                complete = data[:data.rfind(b"\n") + 1]
+                done = self._committed_prefix(complete)
+                if done:
+                    logger.info("spool batch %s: %d of %d bytes already in the log",
+                                os.path.basename(path), done, len(complete))
+                self._commit_batch(complete[done:], locked=True)
+                os.unlink(path)
+
+    def _commit_batch(self, data: bytes, locked: bool = False) -> int:
+        lines: List[bytes] = []
+        entries: List[Dict[str, Any]] = []
+        for raw in data.splitlines(keepends=True):
+            try:
+                entries.append(loads(raw))
+                lines.append(raw)
+            except ValueError:
+                logger.warning("dropping malformed spool line (%d bytes)", len(raw))
+        if lines:
+            (self._append_locked if locked else self._append)(lines, entries, sync=True)
+        return len(lines)
+
+    def flush_spool(self) -> int:
+        """Writer side: move the spool aside and append it to the log in one batch."""
+        if self._writer_fd is None:
+            return 0
+        with self._lock:
+            inflight = os.path.join(self.log_dir, f"spool.{time.time_ns()}.inflight")
+            with _flock(self._spool_lock_fd):
+                try:
+                    if os.path.getsize(self.spool_path) == 0:
+                        return 0
+                    os.rename(self.spool_path, inflight)
+                except FileNotFoundError:
+                    return 0
+            with open(inflight, "rb") as f:
+                data = f.read()
+            n = self._commit_batch(data[:data.rfind(b"\n") + 1])
+            os.unlink(inflight)
+            return n
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                if self._try_become_writer():
+                    self.flush_spool()
+            except Exception as e:
+                logger.warning("feedback spool flush failed: %s", e)
+
+    def flush(self) -> None:
+        """Force pending appends to disk."""
+        with self._lock:
+            if self._fh is not None and self._unsynced:
+                os.fsync(self._fh.fileno())
+                self._unsynced = 0
+                self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self.ingest == "spool" and self._try_become_writer():
+            self.flush_spool()
+        with self._lock:
+            self._close_segment()
+
+    # ---------- Read ----------
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """All entries, oldest first. A torn trailing line (crash mid-append) is skipped."""
+        for path in self.segments():
+            with open(path, "rb") as f:
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    try:
+                        yield loads(raw)
+                    except ValueError:
+                        continue
+
     def aggregate(self) -> Dict[str, Any]:
-        doc = self._load()
-        entries: List[Dict[str, Any]] = doc.get("entries", [])
-        if not entries:
+        with self._lock:
+            self._sync_totals()
+            t = dict(self._totals)
+        count = t["count"]
+        if not count:
             return {"count": 0, "success_rate": 0.0, "avg_usefulness": 0.0}
-        wins = sum(1 for e in entries if e.get("outcome") == "win")
-        partial = sum(1 for e in entries if e.get("outcome") == "partial")
-        success_rate = (wins + 0.5 * partial) / len(entries)
-        avg_usefulness = sum(int(e.get("usefulness", 0)) for e in entries) / len(entries)
+        success_rate = (t["wins"] + 0.5 * t["partials"]) / count
         return {
-            "count": len(entries),
+            "count": count,
             "success_rate": round(success_rate * 100, 1),
-            "avg_usefulness": round(avg_usefulness, 2),
+            "avg_usefulness": round(t["usefulness_sum"] / count, 2),
         }
 
+
+def main(argv: Optional[List[str]] = None) -> int:
+    default_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+    ap = argparse.ArgumentParser(description="Feedback log maintenance.")
+    ap.add_argument("--data-dir", default=default_dir, help="directory holding feedback/ (default: data/)")
+    ap.add_argument("--rebuild", action="store_true", help="recompute aggregate.json from the full log")
+    args = ap.parse_args(argv)
+    store = FeedbackStore(args.data_dir)
+    out = store.rebuild() if args.rebuild else store.aggregate()
+    print(dumps_bytes(out).decode("utf-8"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
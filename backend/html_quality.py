@@ -0,0 +1,175 @@
+# backend/html_quality.py
+# Single-pass HTML post-processor for the V2 quality gates.
+# Every check contributes one regex alternative; one finditer() over the document routes each
+# hit to its check, then warnings are decided and all rewrites are applied in one assembly pass.
+# New checks subclass QualityCheck and are appended to DEFAULT_CHECKS (no extra document scans).
+
+from __future__ import annotations
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+ALERT_HTML = (
+    "<div style=\"background-color:#fffbe5;border:1px solid #fde047;"
+    "padding:12px;border-radius:8px;margin:16px 0;\">"
+    "<strong>AI Quality Alert:</strong> {}"
+    "</div>"
+)
+
+
+class QualityCheck:
+    """
+    One gate. `pattern` is a regex fragment (inner group names must be globally unique);
+    `first_chars` lists every character a hit can start with and lets the scanner skip ahead.
+    Lifecycle per document: on_match() for each hit -> finalize() -> rewrite() for each hit.
+    """
+    name = "check"
+    pattern = ""
+    first_chars = ""  # empty = unknown, disables the skip-ahead prefilter
+
+    def start(self, ctx: Dict[str, Any]) -> Dict[str, Any]:
+        return {}
+
+    def on_match(self, m: re.Match, state: Dict[str, Any], ctx: Dict[str, Any]) -> None:
+        pass
+
+    def finalize(self, state: Dict[str, Any], ctx: Dict[str, Any]) -> Optional[str]:
+        """Return a warning to surface in the alert box, or None."""
+        return None
+
+    def rewrite(self, m: re.Match, state: Dict[str, Any], ctx: Dict[str, Any]) -> Optional[str]:
+        """Return replacement text for this hit, or None to keep it."""
+        return None
+
+
+class PersonaPhrasingCheck(QualityCheck):
+    name = "persona_phrasing"
+    pattern = r"negotiate\s+as\s+(?P<pp_q>['\"]?)the\s+friend(?P=pp_q)"
+    first_chars = "n"
+    head_chars = 2000
+
+    def start(self, ctx):
+        return {"in_head": False}
+
+    def on_match(self, m, state, ctx):
+        # warn on the plain phrase near the top; once warned, rewrite every variant
+        if m.end() <= self.head_chars and m.group(0).lower() == "negotiate as the friend":
+            state["in_head"] = True
+
+    def finalize(self, state, ctx):
+        if state["in_head"]:
+            return "Persona phrasing: use counterpart style; avoid 'negotiate as The Friend'."
+        return None
+
+    def rewrite(self, m, state, ctx):
+        return "align with a Friend-style counterpart" if state["in_head"] else None
+
+
+class CurrencyCheck(QualityCheck):
+    name = "currency"
+    pattern = r"(?P<cur_gbp>£)|(?P<cur_usd>\$)"
+    first_chars = "£$"
+
+    def start(self, ctx):
+        return {"gbp": False, "usd": False, "convert": False}
+
+    def on_match(self, m, state, ctx):
+        state["gbp" if m.group("cur_gbp") else "usd"] = True
+
+    def finalize(self, state, ctx):
+        uk = str(ctx.get("region") or "").lower().startswith("uk")
+        state["convert"] = uk and state["usd"] and not state["gbp"]
+        if state["convert"]:
+            return "Currency mismatch: UK region should use GBP (£). Converted."
+        return None
+
+    def rewrite(self, m, state, ctx):
+        return "£" if state["convert"] and m.group("cur_usd") else None
+
+
+class SourceLinksCheck(QualityCheck):
+    name = "source_links"
+    pattern = r"<a "
+    first_chars = "<"
+    min_links = 2
+
+    def start(self, ctx):
+        return {"count": 0}
+
+    def on_match(self, m, state, ctx):
+        state["count"] += 1
+
+    def finalize(self, state, ctx):
+        if state["count"] < self.min_links:
+            return "Too few sources with links (need ≥ 2)."
+        return None
+
+
+class AlertAnchor(QualityCheck):
+    """Places the alert box after the first </header>, or at the top when there is none."""
+    name = "alert_anchor"
+    pattern = r"</header>"
+    first_chars = "<"
+
+    def start(self, ctx):
+        return {"first": None}
+
+    def on_match(self, m, state, ctx):
+        if state["first"] is None:
+            state["first"] = m.start()
+
+    def rewrite(self, m, state, ctx):
+        alert = ctx.get("_alert")
+        if alert and m.start() == state["first"]:
+            return m.group(0) + alert
+        return None
+
+
+DEFAULT_CHECKS: Tuple[QualityCheck, ...] = (
+    PersonaPhrasingCheck(),
+    CurrencyCheck(),
+    SourceLinksCheck(),
+    AlertAnchor(),
+)
+
+
+class HtmlQualityGate:
+    def __init__(self, checks: Sequence[QualityCheck] = DEFAULT_CHECKS):
+        self.checks = list(checks)
+        alts = "|".join(f"(?P<g{i}>{c.pattern})" for i, c in enumerate(self.checks) if c.pattern)
+        active = [c for c in self.checks if c.pattern]
+        if active and all(c.first_chars for c in active):
+            chars = sorted({ch for c in active for ch in c.first_chars.lower() + c.first_chars.upper()})
+            alts = "(?=[%s])(?:%s)" % ("".join(re.escape(ch) for ch in chars), alts)
+        self._re = re.compile(alts, re.IGNORECASE)
+        self._group_to_check = {f"g{i}": c for i, c in enumerate(self.checks)}
+        self._anchor = next((c for c in self.checks if isinstance(c, AlertAnchor)), None)
+
+    def run(self, html: str, persona: str | None = None, region: str | None = None) -> Tuple[str, List[str]]:
+        ctx: Dict[str, Any] = {"persona": persona, "region": region}
+        states = {id(c): c.start(ctx) for c in self.checks}
+
+        # 1) single scan: route each hit to its check
+        hits: List[Tuple[re.Match, QualityCheck]] = []
+        for m in self._re.finditer(html):
+            chk = self._group_to_check[m.lastgroup]  # outer group closes last
+            chk.on_match(m, states[id(chk)], ctx)
+            hits.append((m, chk))
+
+        # 2) decide
+        warnings = [w for c in self.checks if (w := c.finalize(states[id(c)], ctx))]
+        if warnings:
+            ctx["_alert"] = ALERT_HTML.format(" ".join(warnings))
+
+        # 3) one assembly pass applying every rewrite
+        out: List[str] = []
+        if warnings and (self._anchor is None or states[id(self._anchor)]["first"] is None):
+            out.append(ctx["_alert"])
+        pos = 0
+        for m, chk in hits:
+            rep = chk.rewrite(m, states[id(chk)], ctx)
+            if rep is not None:
+                out.append(html[pos:m.start()])
+                out.append(rep)
+                pos = m.end()
+        out.append(html[pos:])
+        return "".join(out), warnings
@@ -0,0 +1,158 @@
+# backend/keyword_matcher.py
+# Multi-keyword matcher shared by the keyword-driven modules (tagger, response classifier,
+# questionnaire mapper). Built once from a keyword list; reports every (overlapping) occurrence
+# with positions. Matching is plain substring matching (same as `kw in text`), case-insensitive
+# by default. Every keyword carries payloads (e.g. ("persona", "aggressive")) so one matcher can
+# serve several label sets; feed() continues a scan across chunks for streaming input.
+# Two engines, picked by dictionary size (same results):
+#   - small dictionaries: one C-level str.find() sweep per keyword. Each sweep runs at memchr
+#     speed, which beats any per-character Python loop until there are ~100 keywords.
+#   - AC_MIN_KEYWORDS and up: an Aho-Corasick automaton compiled to a full transition table,
+#     one pass over the text regardless of keyword count.
+
+from __future__ import annotations
+from collections import Counter, deque
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+Match = Tuple[int, int, str]  # (start, end, keyword); text[start:end] == keyword
+
+AC_MIN_KEYWORDS = 96  # measured break-even on ~1k-char texts
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[Tuple[str, Hashable]] = (), lowercase: bool = True):
+        self.lowercase = lowercase
+        self._keywords: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._payloads: List[List[Hashable]] = []
+        self._delta: Optional[List[Dict[str, int]]] = None
+        self._out: List[Tuple[int, ...]] = []
+        for kw, payload in keywords:
+            self.add(kw, payload)
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    # ---------- Build ----------
+    def add(self, keyword: str, payload: Hashable = None) -> None:
+        kw = keyword.lower() if self.lowercase else keyword
+        if not kw:
+            return
+        kid = self._ids.get(kw)
+        if kid is None:
+            kid = self._ids[kw] = len(self._keywords)
+            self._keywords.append(kw)
+            self._payloads.append([])
+        if payload is not None and payload not in self._payloads[kid]:
+            self._payloads[kid].append(payload)
+        self._delta = None  # rebuilt lazily on next scan
+
+    def _build(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for kid, kw in enumerate(self._keywords):
+            s = 0
+            for ch in kw:
+                nxt = goto[s].get(ch)
+                if nxt is None:
+                    nxt = goto[s][ch] = len(goto)
+                    goto.append({})
+                    out.append([])
+                s = nxt
+            out[s].append(kid)
+
+        # BFS: failure links, inherited outputs, and a complete transition table (a DFA),
+        # so scanning never walks failure chains.
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in range(len(goto) - 1)]
+        queue = deque(goto[0].values())
+        while queue:
+            s = queue.popleft()
+            f = fail[s]
+            out[s] = out[s] + out[f]
+            delta[s] = dict(delta[f])
+            delta[s].update(goto[s])
+            for ch, t in goto[s].items():
+                fail[t] = delta[f].get(ch, 0)
+                queue.append(t)
+        self._delta = delta
+        self._out = [tuple(o) for o in out]
+
+    # ---------- Scan ----------
+    def _prepare(self, text: str) -> str:
+        return text.lower() if self.lowercase else text
+
+    def _find_all(self, text: str) -> List[Match]:
+        """All matches in already-normalized text, ordered by (end, start)."""
+        kws = self._keywords
+        if len(kws) < AC_MIN_KEYWORDS:
+            matches: List[Match] = []
+            find = text.find
+            for kw in kws:
+                i = find(kw)
+                while i >= 0:
+                    matches.append((i, i + len(kw), kw))
+                    i = find(kw, i + 1)
+            matches.sort(key=lambda m: (m[1], m[0]))
+            return matches
+        if self._delta is None:
+            self._build()
+        delta, out = self._delta, self._out
+        matches = []
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                matches.extend((i + 1 - len(kws[k]), i + 1, kws[k]) for k in out[state])
+        return matches
+
+    def find_all(self, text: str) -> List[Match]:
+        """Every occurrence of every keyword, ordered by end position."""
+        return self._find_all(self._prepare(text or ""))
+
+    def feed(self, chunk: str, carry: str = "", offset: int = 0) -> Tuple[List[Match], str]:
+        """
+        Streaming scan. `carry` is the value returned by the previous feed() ("" to start) and
+        `offset` the chunk's position in the whole stream. Keywords spanning chunk boundaries are
+        found; nothing is reported twice. Returns (matches with stream positions, carry).
+        """
+        text = carry + self._prepare(chunk)
+        base = offset - len(carry)
+        matches = [(base + s, base + e, kw) for s, e, kw in self._find_all(text) if e > len(carry)]
+        keep = max((len(k) for k in self._keywords), default=1) - 1
+        return matches, (text[-keep:] if keep else "")
+
+    def counts(self, text: str) -> Counter:
+        """keyword -> number of occurrences."""
+        return Counter(kw for _s, _e, kw in self.find_all(text))
+
+    def payloads(self, keyword: str) -> Tuple[Hashable, ...]:
+        kid = self._ids.get(keyword.lower() if self.lowercase else keyword)
+        return tuple(self._payloads[kid]) if kid is not None else ()
+
+    def hits(self, text: str) -> Dict[Hashable, Set[str]]:
+        """payload -> set of distinct keywords found (i.e. which `kw in text` tests would pass)."""
+        text = self._prepare(text or "")
+        if len(self._keywords) < AC_MIN_KEYWORDS:
+            out: Dict[Hashable, Set[str]] = {}
+            for kid, kw in enumerate(self._keywords):
+                if kw in text:
+                    for p in self._payloads[kid]:
+                        out.setdefault(p, set()).add(kw)
+            return out
+        return self.hits_from(self._find_all(text))
+
+    def hits_from(self, matches: Iterable[Match]) -> Dict[Hashable, Set[str]]:
+        out: Dict[Hashable, Set[str]] = {}
+        for _s, _e, kw in matches:
+            for p in self._payloads[self._ids[kw]]:
+                out.setdefault(p, set()).add(kw)
+        return out
+
+    def summary(self, text: str) -> Dict[str, Any]:
+        """Matches with positions plus per-keyword counts."""
+        matches = self.find_all(text)
+        return {
+            "matches": [{"keyword": kw, "start": s, "end": e} for s, e, kw in matches],
+            "counts": dict(Counter(kw for _s, _e, kw in matches)),
+        }
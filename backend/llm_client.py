@@ -0,0 +1,194 @@
+# backend/llm_client.py
+# LLM access for report polishing: pluggable backend, response cache, bounded concurrency, deadlines.
+# Backends:
+#   openai – openai==0.28 ChatCompletion (needs OPENAI_API_KEY)
+#   fake   – local stand-in for tests/benchmarks (echoes the content, optional latency)
+# Env: LLM_BACKEND, LLM_MODEL, LLM_MAX_CONCURRENCY, LLM_DEADLINE_SECONDS, LLM_CACHE_SIZE
+
+from __future__ import annotations
+import os, time, hashlib, logging, threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("LLMClient")
+
+Messages = List[Dict[str, str]]
+
+ENHANCE_SYSTEM = "You improve and humanize HTML negotiation reports."
+ENHANCE_INSTRUCTIONS = (
+    "You are a professional negotiation strategist and copywriter.\n"
+    "Take the following HTML report content and rewrite it in smooth, premium, human-friendly language.\n"
+    "Preserve the facts and intent. Keep valid HTML structure (<h3>, <ul>, <p>, etc.)."
+)
+
+
+class LLMBackend:
+    name = "base"
+
+    def complete(self, messages: Messages, model: str, temperature: float, timeout: float,
+                 json_mode: bool = False) -> str:
+        raise NotImplementedError
+
+
+class OpenAIBackend(LLMBackend):
+    name = "openai"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+
+    def complete(self, messages, model, temperature, timeout, json_mode=False):
+        import openai
+        openai.api_key = self.api_key
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        resp = openai.ChatCompletion.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            request_timeout=timeout,
+            **extra,
+        )
+        return resp.choices[0].message["content"]
+
+
+class FakeBackend(LLMBackend):
+    """Deterministic stand-in: sleeps `latency` seconds, then returns responder(messages) or the last message."""
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, responder: Optional[Callable[[Messages], str]] = None):
+        self.latency = latency
+        self.responder = responder
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, messages, model, temperature, timeout, json_mode=False):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.responder:
+            return self.responder(messages)
+        return messages[-1]["content"]
+
+
+class EnhancementClient:
+    """
+    enhance(html) never raises and never blocks past its deadline: on timeout, overload or
+    backend error it returns the original HTML. Successful rewrites are cached by (model, content).
+    """
+    def __init__(
+        self,
+        backend: LLMBackend,
+        model: str = "gpt-4o-mini",
+        max_concurrency: int = 4,
+        deadline: float = 8.0,
+        cache_size: int = 256,
+        temperature: float = 0.6,
+    ):
+        self.backend = backend
+        self.model = model
+        self.deadline = deadline
+        self.temperature = temperature
+        self.cache_size = cache_size
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "timeouts": 0, "errors": 0, "rejected": 0}
+
+    def cache_key(self, content: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{content}".encode("utf-8")).hexdigest()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            val = self._cache.get(key)
+            if val is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+            return val
+
+    def _cache_put(self, key: str, val: str) -> None:
+        with self._lock:
+            self._cache[key] = val
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def complete(self, messages: Messages, cache_key: str, deadline: Optional[float] = None,
+                 json_mode: bool = False) -> Optional[str]:
+        """Cached, slot-limited completion. Returns None on timeout/overload/error."""
+        hit = self._cache_get(cache_key)
+        if hit is not None:
+            return hit
+
+        budget = self.deadline if deadline is None else deadline
+        t_end = time.monotonic() + budget
+        if not self._slots.acquire(timeout=budget):
+            self._count("rejected")
+            return None
+        try:
+            fut = self._pool.submit(self.backend.complete, messages, self.model, self.temperature, budget, json_mode)
+        except Exception:
+            self._slots.release()
+            self._count("errors")
+            return None
+        # the slot is held until the backend call really finishes, even if we stop waiting
+        fut.add_done_callback(lambda _f: self._slots.release())
+        try:
+            out = fut.result(timeout=max(0.0, t_end - time.monotonic()))
+        except FutureTimeout:
+            self._count("timeouts")
+            return None
+        except Exception as e:
+            logger.warning("LLM call failed: %s", e)
+            self._count("errors")
+            return None
+        if not out:
+            return None
+        self._cache_put(cache_key, out)
+        return out
+
+    def enhance(self, html: str, deadline: Optional[float] = None) -> str:
+        messages = [
+            {"role": "system", "content": ENHANCE_SYSTEM},
+            {"role": "user", "content": ENHANCE_INSTRUCTIONS},
+            {"role": "user", "content": html},
+        ]
+        out = self.complete(messages, self.cache_key(html), deadline)
+        return html if out is None else out
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, cached=len(self._cache), backend=self.backend.name)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def client_from_env() -> Optional[EnhancementClient]:
+    """Build the process-wide client, or None when no backend is configured."""
+    api_key = os.getenv("OPENAI_API_KEY")
+    kind = (os.getenv("LLM_BACKEND") or ("openai" if api_key else "none")).lower()
+    if kind == "fake":
+        backend: LLMBackend = FakeBackend(latency=_env_float("LLM_FAKE_LATENCY", 0.0))
+    elif kind == "openai" and api_key:
+        backend = OpenAIBackend(api_key)
+    else:
+        return None
+    return EnhancementClient(
+        backend,
+        model=os.getenv("LLM_MODEL", "gpt-4o-mini"),
+        max_concurrency=int(_env_float("LLM_MAX_CONCURRENCY", 4)),
+        deadline=_env_float("LLM_DEADLINE_SECONDS", 8.0),
+        cache_size=int(_env_float("LLM_CACHE_SIZE", 256)),
+    )
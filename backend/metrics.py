@@ -0,0 +1,219 @@
+# backend/metrics.py
+# Minimal Prometheus-style metrics registry (text exposition format 0.0.4).
+# Hot-path observations take no lock: every thread writes into its own shard (a plain dict
+# reached through threading.local), and shards are only summed when /metrics is scraped.
+# Shards of finished threads (the threaded dev server runs one thread per request) are folded
+# into a base shard, so the shard list stays proportional to live threads.
+# Values that already live elsewhere (queue depth, cache stats, RSS) are read at scrape time
+# through callback metrics instead of being pushed.
+
+from __future__ import annotations
+import os, threading, weakref
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+# seconds; covers static hits (~1ms) through slow report builds / LLM calls
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+class _Sharded:
+    """Per-thread dict shards; only shard registration (once per thread) takes the lock."""
+    _PRUNE_MIN = 64
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Tuple[Callable[[], Optional[threading.Thread]], Dict[Labels, Any]]] = []
+        self._base: Dict[Labels, Any] = {}  # totals of finished threads
+        self._prune_at = self._PRUNE_MIN
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[Labels, Any]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Dict[Labels, Any] = {}
+            with self._lock:
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+                if len(self._shards) >= self._prune_at:
+                    self._prune()
+                    self._prune_at = max(self._PRUNE_MIN, 2 * len(self._shards))
+            self._local.shard = shard
+            return shard
+
+    def _merge(self, into: Dict[Labels, Any], shard: Dict[Labels, Any]) -> None:
+        raise NotImplementedError
+
+    def _prune(self) -> None:
+        """Fold shards of finished threads into the base shard (caller holds the lock)."""
+        live = []
+        for ref, shard in self._shards:
+            t = ref()
+            if t is not None and t.is_alive():
+                live.append((ref, shard))
+            else:
+                self._merge(self._base, shard)  # the thread is gone; nothing writes here any more
+        self._shards = live
+
+    def _snapshot_shards(self) -> List[Dict[Labels, Any]]:
+        with self._lock:
+            self._prune()
+            return [dict(self._base)] + [dict(s) for _ref, s in self._shards]
+
+
+class Counter(_Sharded):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__()
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+
+    def inc(self, labels: Labels = (), value: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + value
+
+    def _merge(self, into: Dict[Labels, float], shard: Dict[Labels, float]) -> None:
+        for k, v in shard.items():
+            into[k] = into.get(k, 0) + v
+
+    def collect(self) -> Dict[Labels, float]:
+        out: Dict[Labels, float] = {}
+        for shard in self._snapshot_shards():
+            self._merge(out, shard)
+        return out
+
+    def render(self) -> Iterable[str]:
+        for labels, v in sorted(self.collect().items()):
+            yield f"{self.name}{_fmt_labels(self.labelnames, labels)} {_fmt_value(v)}"
+
+
+class Histogram(_Sharded):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__()
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        shard = self._shard()
+        row = shard.get(labels)
+        if row is None:
+            # [bucket counts..., +Inf count, sum]
+            row = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def _merge(self, into: Dict[Labels, List[float]], shard: Dict[Labels, List[float]]) -> None:
+        for k, row in shard.items():
+            acc = into.setdefault(k, [0] * len(row))
+            for i, v in enumerate(row):
+                acc[i] += v
+
+    def collect(self) -> Dict[Labels, List[float]]:
+        out: Dict[Labels, List[float]] = {}
+        for shard in self._snapshot_shards():
+            self._merge(out, shard)
+        return out
+
+    def render(self) -> Iterable[str]:
+        for labels, row in sorted(self.collect().items()):
+            cum = 0
+            for bound, n in zip(self.buckets + (float("inf"),), row[:-1]):
+                cum += n
+                le = 'le="%s"' % _fmt_value(bound)
+                yield f"{self.name}_bucket{_fmt_labels(self.labelnames, labels, le)} {cum}"
+            yield f"{self.name}_sum{_fmt_labels(self.labelnames, labels)} {_fmt_value(row[-1])}"
+            yield f"{self.name}_count{_fmt_labels(self.labelnames, labels)} {cum}"
+
+
+class CallbackMetric:
+    """Read at scrape time: fn() -> {label values tuple: value}."""
+    def __init__(self, name: str, help: str, fn: Callable[[], Dict[Labels, float]],
+                 labelnames: Sequence[str] = (), type: str = "gauge"):
+        self.name, self.help, self.labelnames, self.type = name, help, tuple(labelnames), type
+        self.fn = fn
+
+    def render(self) -> Iterable[str]:
+        try:
+            values = self.fn() or {}
+        except Exception:
+            return
+        for labels, v in sorted(values.items()):
+            if v is not None:
+                yield f"{self.name}{_fmt_labels(self.labelnames, labels)} {_fmt_value(v)}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def callback(self, name: str, help: str, fn: Callable[[], Dict[Labels, float]],
+                 labelnames: Sequence[str] = (), type: str = "gauge") -> CallbackMetric:
+        return self._add(CallbackMetric(name, help, fn, labelnames, type))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for m in metrics:
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.type}")
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this worker process (Linux /proc; ru_maxrss peak elsewhere)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource, sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+
+def hit_ratio(hits: float, misses: float) -> Optional[float]:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
@@ -0,0 +1,117 @@
+# backend/pdf_renderer.py
+# Off-request PDF rendering: bounded process pool + on-disk cache keyed by report content hash.
+# Cached files live next to the HTML: backend/reports/<rid>.<hash>.pdf (swept with the report).
+
+from __future__ import annotations
+import os, hashlib, logging, threading, importlib.util
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("PdfRenderer")
+
+# WeasyPrint is optional and heavy; only the worker processes import it.
+PDF_AVAILABLE = importlib.util.find_spec("weasyprint") is not None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _render_pdf(html: str, base_url: str, out_path: str) -> str:
+    """Worker entry point: render `html` and atomically publish it at `out_path`."""
+    from weasyprint import HTML  # pip install weasyprint
+    tmp = f"{out_path}.{os.getpid()}.tmp"
+    HTML(string=html, base_url=base_url).write_pdf(tmp)
+    os.replace(tmp, out_path)
+    return out_path
+
+
+def content_key(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()[:16]
+
+
+class PdfRenderer:
+    """
+    render(rid, html) returns one of:
+      ("ready", path)      – cached or rendered within the wait budget
+      ("pending", None)    – rendering in the background; poll again
+      ("saturated", None)  – queue full; nothing was enqueued, retry later
+    Concurrent calls for the same report content share one render.
+    """
+    def __init__(
+        self,
+        reports_dir: Path | str,
+        base_url: str,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        render_fn: Callable[[str, str, str], str] = _render_pdf,
+    ):
+        self.reports_dir = Path(reports_dir)
+        self.base_url = base_url
+        self.max_workers = max(1, max_workers or _env_int("PDF_WORKERS", 2))
+        self.max_pending = max(1, max_pending or _env_int("PDF_MAX_PENDING", 4 * self.max_workers))
+        self.render_fn = render_fn
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def cache_path(self, rid: str, html: str) -> Path:
+        return self.reports_dir / f"{rid}.{content_key(html)}.pdf"
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _submit(self, out: Path, html: str) -> Optional[Future]:
+        key = str(out)
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                return fut
+            if len(self._inflight) >= self.max_pending:
+                return None
+            try:
+                fut = self._executor().submit(self.render_fn, html, self.base_url, key)
+            except BrokenProcessPool:
+                logger.warning("PDF pool broken; restarting")
+                self._pool = None
+                fut = self._executor().submit(self.render_fn, html, self.base_url, key)
+            self._inflight[key] = fut
+        fut.add_done_callback(lambda _f, k=key: self._done(k))
+        return fut
+
+    def _done(self, key: str) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def render(self, rid: str, html: str, wait: float = 10.0) -> Tuple[str, Optional[Path]]:
+        out = self.cache_path(rid, html)
+        if out.exists():
+            self.stats["hits"] += 1
+            return "ready", out
+        self.stats["misses"] += 1
+        fut = self._submit(out, html)
+        if fut is None:
+            return "saturated", None
+        try:
+            fut.result(timeout=wait)  # re-raises render errors to the caller
+        except FutureTimeout:
+            return "pending", None
+        return "ready", out
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
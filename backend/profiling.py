@@ -0,0 +1,151 @@
+# backend/profiling.py
+# Opt-in per-request profiling for admins.
+# Enable with PROFILING_ENABLED=1 and ADMIN_TOKEN=<secret>; then send a request with
+#   X-Admin-Token: <secret>   and   X-Profile: 1   (or ?__profile=1)
+# The handler runs under cProfile; stats are saved as profiles/<request_id>.pstats and the id is
+# returned in the X-Profile-Id response header. GET /admin/profiles aggregates the hottest
+# functions across all saved profiles; GET /admin/profiles/<id> downloads one (snakeviz, pstats).
+
+from __future__ import annotations
+import os, re, hmac, uuid, pstats, cProfile, logging, threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from flask import Flask, g, request, send_from_directory
+
+from backend.serialization import json_response
+
+logger = logging.getLogger("Profiling")
+
+_ID_RE = re.compile(r"^[0-9A-Za-z_-]{1,64}$")
+SORT_KEYS = ("tottime", "cumtime", "calls")
+
+
+def _truthy(v: Optional[str]) -> bool:
+    return (v or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class RequestProfiler:
+    def __init__(self, out_dir: Path, admin_token: Optional[str], keep: int = 200):
+        self.out_dir = Path(out_dir)
+        self.admin_token = admin_token or ""
+        self.keep = keep
+        # one profiler at a time: cProfile cannot nest across concurrently profiled requests
+        self._busy = threading.Lock()
+
+    # ---------- Access ----------
+    def is_admin(self) -> bool:
+        sent = request.headers.get("X-Admin-Token", "")
+        return bool(self.admin_token) and hmac.compare_digest(sent, self.admin_token)
+
+    def _wants_profile(self) -> bool:
+        return _truthy(request.headers.get("X-Profile")) or _truthy(request.args.get("__profile"))
+
+    # ---------- Storage ----------
+    def _prune(self) -> None:
+        files = sorted(self.out_dir.glob("*.pstats"), key=lambda p: p.stat().st_mtime)
+        for p in files[:max(0, len(files) - self.keep)]:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+
+    def aggregate(self, top: int = 20, sort: str = "tottime") -> Dict[str, Any]:
+        """Merge every saved profile and return the top-N functions by `sort`."""
+        files = [str(p) for p in self.out_dir.glob("*.pstats")]
+        if not files:
+            return {"profiles": 0, "sort": sort, "top": []}
+        stats = pstats.Stats(files[0])
+        for f in files[1:]:
+            try:
+                stats.add(f)
+            except Exception as e:
+                logger.warning("skipping unreadable profile %s: %s", f, e)
+        col = {"calls": 1, "tottime": 2, "cumtime": 3}[sort]
+        rows = sorted(stats.stats.items(), key=lambda kv: kv[1][col], reverse=True)[:top]
+        return {
+            "profiles": len(files),
+            "sort": sort,
+            "top": [
+                {
+                    "function": f"{fn}:{line}({name})",
+                    "calls": nc,
+                    "tottime": round(tt, 6),
+                    "cumtime": round(ct, 6),
+                }
+                for (fn, line, name), (_cc, nc, tt, ct, _callers) in rows
+            ],
+        }
+
+    # ---------- Flask wiring ----------
+    def init_app(self, app: Flask) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+        @app.before_request
+        def _start_profile():
+            if not self._wants_profile() or not self.is_admin():
+                return None
+            if not self._busy.acquire(blocking=False):
+                g._profile_busy = True
+                return None
+            rid = request.headers.get("X-Request-Id", "")
+            g._profile_id = rid if _ID_RE.match(rid) else uuid.uuid4().hex[:12]
+            g._profiler = cProfile.Profile()
+            g._profiler.enable()
+            return None
+
+        @app.after_request
+        def _stop_profile(resp):
+            prof = g.pop("_profiler", None)
+            if prof is None:
+                if g.pop("_profile_busy", False):
+                    resp.headers["X-Profile-Id"] = "busy"
+                return resp
+            prof.disable()
+            self._busy.release()
+            rid = g.pop("_profile_id")
+            try:
+                prof.dump_stats(str(self.out_dir / f"{rid}.pstats"))
+                self._prune()
+                resp.headers["X-Profile-Id"] = rid
+            except OSError as e:
+                logger.warning("could not save profile %s: %s", rid, e)
+            return resp
+
+        @app.teardown_request
+        def _abort_profile(_exc):
+            # handler raised before after_request could run
+            prof = g.pop("_profiler", None)
+            if prof is not None:
+                prof.disable()
+                self._busy.release()
+
+        @app.get("/admin/profiles")
+        def admin_profiles():
+            if not self.is_admin():
+                return json_response({"ok": False, "error": "forbidden"}, 403)
+            sort = request.args.get("sort", "tottime")
+            if sort not in SORT_KEYS:
+                return json_response({"ok": False, "error": f"sort must be one of {', '.join(SORT_KEYS)}"}, 400)
+            try:
+                top = max(1, min(200, int(request.args.get("top", 20))))
+            except ValueError:
+                top = 20
+            return json_response({"ok": True, **self.aggregate(top, sort)})
+
+        @app.get("/admin/profiles/<profile_id>")
+        def admin_profile_file(profile_id: str):
+            if not self.is_admin():
+                return json_response({"ok": False, "error": "forbidden"}, 403)
+            if not _ID_RE.match(profile_id) or not (self.out_dir / f"{profile_id}.pstats").exists():
+                return json_response({"ok": False, "error": "profile not found"}, 404)
+            return send_from_directory(str(self.out_dir), f"{profile_id}.pstats",
+                                       mimetype="application/octet-stream", as_attachment=True)
+
+
+def profiler_from_env(out_dir: Path) -> Optional[RequestProfiler]:
+    """None unless PROFILING_ENABLED is set and an ADMIN_TOKEN exists."""
+    token = os.getenv("ADMIN_TOKEN")
+    if not _truthy(os.getenv("PROFILING_ENABLED")) or not token:
+        return None
+    return RequestProfiler(out_dir, token, keep=int(os.getenv("PROFILE_KEEP", "200") or 200))
@@ -1,8 +1,14 @@
 # backend/questionnaire_mapper.py
+# Keyword tables are compiled once into one matcher per table; the first rule (in table order)
+# with any keyword present wins. Inference results are cached per normalized text, so bulk
+# mapping (map_many) of answer sets that share descriptions pays for each text once.
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.keyword_matcher import KeywordMatcher
 
 HIGH_CONTEXT_COUNTRIES = {
     "japan",
@@ -25,13 +31,45 @@ HIGH_CONTEXT_COUNTRIES = {
 }
 DEFAULT_MARKET_SOURCES = ["Glassdoor", "Levels.fyi"]
 
+# (label, keywords) in priority order
+PERSONA_RULES = (
+    ("budget_guard", ("budget", "tight budget", "budget constraint")),
+    ("assertive", ("aggressive", "hardball", "pushy", "dominating")),
+    ("skeptical", ("skeptic", "need proof", "doubt", "prove")),
+    ("time_pressed", ("urgent", "deadline", "time pressure", "asap")),
+    ("collaborative", ("collaborative", "relationship", "win-win")),
+)
+USER_STYLE_RULES = (
+    ("data_driven", ("data", "numbers", "benchmarks", "analysis")),
+    ("relationship_builder", ("relationship", "rapport", "empathy", "diplomatic")),
+    ("assertive", ("assertive", "direct", "firm")),
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_LIST_SEP = re.compile(r"[;,]|\n")
+_RANGE_SEP = re.compile(r"\-|–")
+
+
+def _compile_rules(rules) -> KeywordMatcher:
+    # text is normalized (lowercased) before matching
+    return KeywordMatcher(((kw, rank) for rank, (_label, kws) in enumerate(rules) for kw in kws), lowercase=False)
+
+
+_PERSONA_MATCHER = _compile_rules(PERSONA_RULES)
+_USER_STYLE_MATCHER = _compile_rules(USER_STYLE_RULES)
+
+
+def _first_rule(matcher: KeywordMatcher, rules, text: str, default: str) -> str:
+    hits = matcher.hits(text)
+    return rules[min(hits)][0] if hits else default
+
 
 def _normalize(s: Optional[str]) -> str:
     if s is None:
         return ""
     if not isinstance(s, str):
         s = str(s)
-    return re.sub(r"\s+", " ", s.strip().lower())
+    return _WHITESPACE.sub(" ", s.strip().lower())
 
 
 def _split_list(value: Any) -> List[str]:
@@ -40,7 +78,7 @@ def _split_list(value: Any) -> List[str]:
     if isinstance(value, list):
         return [str(v).strip() for v in value if str(v).strip()]
     txt = str(value)
-    return [v.strip() for v in re.split(r"[;,]|\n", txt) if v.strip()]
+    return [v.strip() for v in _LIST_SEP.split(txt) if v.strip()]
 
 
 def _parse_salary_value(s: Any) -> Optional[str]:
@@ -50,30 +88,22 @@ def _parse_salary_value(s: Any) -> Optional[str]:
     return txt if txt else None
 
 
+@lru_cache(maxsize=4096)
+def _persona_for(t: str) -> str:
+    return _first_rule(_PERSONA_MATCHER, PERSONA_RULES, t, "neutral")
+
+
+@lru_cache(maxsize=4096)
+def _user_style_for(t: str) -> str:
+    return _first_rule(_USER_STYLE_MATCHER, USER_STYLE_RULES, t, "diplomatic")
+
+
 def _infer_persona(text: str) -> str:
-    t = _normalize(text)
-    if any(k in t for k in ["budget", "tight budget", "budget constraint"]):
-        return "budget_guard"
-    if any(k in t for k in ["aggressive", "hardball", "pushy", "dominating"]):
-        return "assertive"
-    if any(k in t for k in ["skeptic", "need proof", "doubt", "prove"]):
-        return "skeptical"
-    if any(k in t for k in ["urgent", "deadline", "time pressure", "asap"]):
-        return "time_pressed"
-    if any(k in t for k in ["collaborative", "relationship", "win-win"]):
-        return "collaborative"
-    return "neutral"
+    return _persona_for(_normalize(text))
 
 
 def _infer_user_style(text: str) -> str:
-    t = _normalize(text)
-    if any(k in t for k in ["data", "numbers", "benchmarks", "analysis"]):
-        return "data_driven"
-    if any(k in t for k in ["relationship", "rapport", "empathy", "diplomatic"]):
-        return "relationship_builder"
-    if any(k in t for k in ["assertive", "direct", "firm"]):
-        return "assertive"
-    return "diplomatic"
+    return _user_style_for(_normalize(text))
 
 
 def _infer_context_level(country: Optional[str]) -> str:
@@ -109,7 +139,7 @@ def map_questionnaire_to_inputs(answers: Dict[str, Any], schema_map: Dict[str, s
         range_low = _parse_salary_value(salary_range[0])
         range_high = _parse_salary_value(salary_range[1])
     elif isinstance(salary_range, str) and ("-" in salary_range or "–" in salary_range):
-        parts = re.split(r"\-|–", salary_range)
+        parts = _RANGE_SEP.split(salary_range)
         if len(parts) >= 2:
             range_low = _parse_salary_value(parts[0])
             range_high = _parse_salary_value(parts[1])
@@ -217,3 +247,8 @@ def map_questionnaire_to_inputs(answers: Dict[str, Any], schema_map: Dict[str, s
         "market_sources": market_sources,
         "context_keywords": sorted(ctx),
     }
+
+
+def map_many(answer_sets: Iterable[Dict[str, Any]], schema_map: Dict[str, str] | None = None) -> List[Dict[str, Any]]:
+    """map_questionnaire_to_inputs() for many answer sets, in order."""
+    return [map_questionnaire_to_inputs(answers, schema_map) for answers in answer_sets]
@@ -3,9 +3,11 @@
 # LLM writes only two small slots: executive_summary + strategic_highlights.
 
 from __future__ import annotations
-import os, re, json
+import os, re, time, threading
 from datetime import date, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+
+from backend.serialization import dumps
 
 # ---- optional LLM (slots only) ----
 try:
@@ -14,6 +16,13 @@ try:
 except Exception:
     _OPENAI_OK = False
 
+# Set by the app when LLM_MODE=slots (see backend/slot_writer.py); None = playbook text only.
+_SLOT_WRITER = None
+
+def set_slot_writer(writer) -> None:
+    global _SLOT_WRITER
+    _SLOT_WRITER = writer
+
 def _biz_days_from_today(n: int) -> date:
     # simple approx: skip weekends
     d = date.today()
@@ -71,24 +80,61 @@ def _numbers_from_engine(engine_out: Dict[str,Any]) -> Dict[str,Any]:
     median=(low+high)/2.0 if (low is not None and high is not None) else (anchor or low or high)
     return {"country": country, "p25":low, "median":median, "p75":high, "anchor":anchor}
 
-def _load_template_html() -> str:
-    for p in [
+def _template_candidates() -> List[str]:
+    return [
         os.path.join(os.getcwd(),"report.html"),
         os.path.join(os.path.dirname(__file__),"report.html"),
         os.path.join(os.path.dirname(__file__),"templates","report.html"),
-    ]:
+    ]
+
+def _load_template_html() -> str:
+    for p in _template_candidates():
         try:
             with open(p,"r",encoding="utf-8") as f: return f.read()
         except Exception:
             continue
     raise FileNotFoundError("report.html template not found (backend/templates/).")
 
+# ---- Template cache: loaded once, pre-split around `const reportData = {...};` ----
+# Re-stat at most every TEMPLATE_CHECK_SECONDS; reload only when path or mtime changes.
+TEMPLATE_CHECK_SECONDS = 2.0
+_REPORT_DATA_RE = re.compile(r"const\s+reportData\s*=\s*\{.*?\};", re.S)
+_TPL_LOCK = threading.Lock()
+_TPL: Dict[str,Any] = {"key": None, "parts": None, "checked": 0.0}
+
+def _split_template(tpl: str) -> Tuple[str, str]:
+    m = _REPORT_DATA_RE.search(tpl)
+    if m:
+        return tpl[:m.start()] + "const reportData = ", ";" + tpl[m.end():]
+    return tpl + "\n<script>\nconst reportData = ", ";\n</script>\n"
+
+def _template_key() -> Optional[Tuple[str, float]]:
+    for p in _template_candidates():
+        try:
+            return p, os.stat(p).st_mtime
+        except OSError:
+            continue
+    return None
+
+def _template_parts() -> Tuple[str, str]:
+    now = time.monotonic()
+    parts = _TPL["parts"]
+    if parts is not None and now - _TPL["checked"] < TEMPLATE_CHECK_SECONDS:
+        return parts
+    with _TPL_LOCK:
+        key = _template_key()
+        if key is None:
+            raise FileNotFoundError("report.html template not found (backend/templates/).")
+        if key != _TPL["key"] or _TPL["parts"] is None:
+            with open(key[0],"r",encoding="utf-8") as f:
+                _TPL["parts"] = _split_template(f.read())
+            _TPL["key"] = key
+        _TPL["checked"] = now
+        return _TPL["parts"]
+
 def _inject_report_data(tpl: str, data: Dict[str,Any]) -> str:
-    blob=json.dumps(data, ensure_ascii=False)
-    pat=re.compile(r"const\s+reportData\s*=\s*\{.*?\};", re.S)
-    rep=f"const reportData = {blob};"
-    if pat.search(tpl): return pat.sub(rep, tpl, count=1)
-    return tpl + f"\n<script>\n{rep}\n</script>\n"
+    head, tail = _split_template(tpl)
+    return head + dumps(data) + tail
 
 def make_chart_data(engine_out: Dict[str,Any], extras: Optional[Dict[str,Any]]=None)->Dict[str,Any]:
     m=(engine_out.get("metrics") or {})
@@ -155,6 +201,11 @@ def _build_report_data(engine_out: Dict[str,Any], extras: Optional[Dict[str,Any]
     A_fmt = _fmt_market_block(A_merged)
     B_fmt = _fmt_market_block(B_raw) if B_raw else {"label":"Scenario B","p25":"—","median":"—","p75":"—","anchor":"—","floor":"—","fallback":"—"}
 
+    slots = {"executive_summary": playbook.get("summary",""), "strategic_highlights": playbook.get("highlights", [])}
+    if _SLOT_WRITER is not None:
+        slots = _SLOT_WRITER.write(profile.get("persona"), profile.get("country"),
+                                   A_fmt.get("p25"), A_fmt.get("p75"), slots, target=A_fmt.get("anchor"))
+
     by = _format_by(_biz_days_from_today(5))
     data = {
         "meta": {
@@ -167,8 +218,8 @@ def _build_report_data(engine_out: Dict[str,Any], extras: Optional[Dict[str,Any]
         "marketA": A_fmt,
         "marketB": B_fmt,
         "useScenarioB": False,
-        "summary": playbook.get("summary",""),
-        "highlights": playbook.get("highlights", []),
+        "summary": slots["executive_summary"],
+        "highlights": slots["strategic_highlights"],
         "kpis": [
             {"label":"Decision window","value":"5 days","sub":"deadline shown below"},
             {"label":"Currency","value":"GBP (£)","sub":"keep consistent"},
@@ -191,6 +242,6 @@ def _build_report_data(engine_out: Dict[str,Any], extras: Optional[Dict[str,Any]
 def build_report_html(engine_out: Dict[str,Any], extras: Optional[Dict[str,Any]] = None) -> Dict[str,Any]:
 
     data = _build_report_data(engine_out, extras)
-    tpl = _load_template_html()
-    html = _inject_report_data(tpl, data)
+    head, tail = _template_parts()
+    html = "".join((head, dumps(data), tail))
     return {"html": html, "chart_data": make_chart_data(engine_out, extras), "engine": "template+playbook+slots"}
@@ -0,0 +1,114 @@
+# backend/report_jobs.py
+# In-process job queue for heavy report builds (POST returns a job id, GET /jobs/<id> polls).
+# Bounded: when running + queued jobs reach capacity, submit() refuses so the caller can shed load.
+
+from __future__ import annotations
+import os, time, uuid, logging, threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("ReportJobs")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class Job:
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.status = "queued"          # queued | running | done | error
+        self.stages: List[Dict[str, Any]] = []
+        self.result: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self._t_stage = 0.0
+
+    def stage(self, name: str) -> None:
+        """Progress callback: close the current stage and open `name`."""
+        now = time.perf_counter()
+        if self.stages and self.stages[-1]["status"] == "running":
+            self.stages[-1].update(status="done", ms=round((now - self._t_stage) * 1000.0, 1))
+        self.stages.append({"name": name, "status": "running", "ms": None})
+        self._t_stage = now
+
+    def _close(self, ok: bool) -> None:
+        if self.stages and self.stages[-1]["status"] == "running":
+            self.stages[-1].update(status="done" if ok else "error",
+                                   ms=round((time.perf_counter() - self._t_stage) * 1000.0, 1))
+        self.finished = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "job_id": self.id,
+            "status": self.status,
+            "stages": [dict(s) for s in self.stages],
+            "created_at": int(self.created),
+        }
+        if self.status == "done":
+            out.update(self.result)
+        if self.error:
+            out["reason"] = self.error
+        return out
+
+
+class JobQueue:
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None,
+                 keep_seconds: float = 3600.0):
+        self.max_workers = max(1, max_workers or _env_int("REPORT_JOB_WORKERS", 4))
+        self.max_queue = max(0, max_queue if max_queue is not None else _env_int("REPORT_JOB_QUEUE", 32))
+        self.keep_seconds = keep_seconds
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="report-job")
+        self._jobs: Dict[str, Job] = {}
+        self._active = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Dict[str, Any]], *args: Any) -> Optional[Job]:
+        """Run fn(*args, progress=job.stage) in the pool. Returns None when the queue is full."""
+        with self._lock:
+            if self._active >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                return None
+            self._active += 1
+            self._prune()
+            job = Job(uuid.uuid4().hex[:12])
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Dict[str, Any]], args: tuple) -> None:
+        job.status = "running"
+        try:
+            job.result = fn(*args, progress=job.stage) or {}
+            job._close(True)
+            job.status = "done"
+        except Exception as e:
+            logger.warning("report job %s failed: %s", job.id, e)
+            job.error = str(e)
+            job._close(False)
+            job.status = "error"
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.keep_seconds
+        for jid in [j.id for j in self._jobs.values() if j.finished and j.finished < cutoff]:
+            del self._jobs[jid]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "active": self._active,
+                "capacity": self.max_workers + self.max_queue,
+                "rejected": self._rejected,
+            }
@@ -0,0 +1,194 @@
+# backend/report_sweeper.py
+# TTL eviction for generated report previews in backend/reports/.
+# Saved reports (backend/saved_reports/<rid>.html) are exempt.
+# Usage (cron / one-off):
+#   python -m backend.report_sweeper --ttl-hours 72 --dry-run
+
+from __future__ import annotations
+import os, json, time, argparse, logging, threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("ReportSweeper")
+
+DEFAULT_TTL_HOURS = 72.0
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_BATCH_PAUSE = 0.05  # seconds between batches, keeps disk I/O polite
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def report_id_of(filename: str) -> str:
+    """All files of one report share the id prefix: <rid>.html, <rid>.<hash>.pdf, ..."""
+    return filename.split(".", 1)[0]
+
+
+class ReportSweeper:
+    """
+    Deletes report files older than `ttl_seconds` unless the report was saved to a profile.
+    Files are removed in batches with a short pause between them, so a large backlog never
+    monopolises the disk while requests are being served.
+    """
+    def __init__(
+        self,
+        reports_dir: Path | str,
+        saved_dir: Path | str,
+        ttl_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        batch_pause: float = DEFAULT_BATCH_PAUSE,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self.reports_dir = Path(reports_dir)
+        self.saved_dir = Path(saved_dir)
+        if ttl_seconds is None:
+            ttl_seconds = _env_float("REPORT_TTL_HOURS", DEFAULT_TTL_HOURS) * 3600.0
+        self.ttl_seconds = float(ttl_seconds)
+        self.batch_size = max(1, int(batch_size or _env_float("REPORT_SWEEP_BATCH", DEFAULT_BATCH_SIZE)))
+        self.batch_pause = float(batch_pause)
+        self.on_evict = on_evict
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.totals: Dict[str, Any] = {
+            "runs": 0,
+            "files_removed": 0,
+            "reports_evicted": 0,
+            "bytes_reclaimed": 0,
+            "last_run_ts": None,
+            "last_run_ms": 0.0,
+        }
+
+    # ---------- Scan ----------
+    def _is_saved(self, rid: str) -> bool:
+        return (self.saved_dir / f"{rid}.html").exists()
+
+    def _expired(self, now: float) -> List[Tuple[str, str, int]]:
+        """Return (rid, path, size) for every expired, unsaved file."""
+        cutoff = now - self.ttl_seconds
+        saved: Dict[str, bool] = {}
+        out: List[Tuple[str, str, int]] = []
+        try:
+            it = os.scandir(self.reports_dir)
+        except FileNotFoundError:
+            return out
+        with it:
+            for entry in it:
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if st.st_mtime >= cutoff:
+                    continue
+                rid = report_id_of(entry.name)
+                if rid not in saved:
+                    saved[rid] = self._is_saved(rid)
+                if saved[rid]:
+                    continue
+                out.append((rid, entry.path, st.st_size))
+        return out
+
+    # ---------- Sweep ----------
+    def sweep_once(self, now: Optional[float] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """Run a single sweep. Returns per-run stats (also folded into `self.totals`)."""
+        t0 = time.perf_counter()
+        now = time.time() if now is None else now
+        expired = self._expired(now)
+
+        removed = 0
+        reclaimed = 0
+        evicted: set = set()
+        for i in range(0, len(expired), self.batch_size):
+            if self._stop.is_set():
+                break
+            for rid, path, size in expired[i:i + self.batch_size]:
+                if not dry_run:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                removed += 1
+                reclaimed += size
+                evicted.add(rid)
+            if self.batch_pause and i + self.batch_size < len(expired):
+                time.sleep(self.batch_pause)
+
+        if not dry_run and self.on_evict:
+            for rid in evicted:
+                try:
+                    self.on_evict(rid)
+                except Exception:
+                    logger.exception("on_evict failed for %s", rid)
+
+        run = {
+            "dry_run": dry_run,
+            "candidates": len(expired),
+            "files_removed": removed,
+            "reports_evicted": len(evicted),
+            "bytes_reclaimed": reclaimed,
+            "duration_ms": round((time.perf_counter() - t0) * 1000.0, 2),
+        }
+        if not dry_run:
+            with self._lock:
+                self.totals["runs"] += 1
+                self.totals["files_removed"] += removed
+                self.totals["reports_evicted"] += len(evicted)
+                self.totals["bytes_reclaimed"] += reclaimed
+                self.totals["last_run_ts"] = int(now)
+                self.totals["last_run_ms"] = run["duration_ms"]
+        if removed:
+            logger.info("report sweep: removed %d files (%d reports), reclaimed %d bytes in %.1f ms",
+                        removed, len(evicted), reclaimed, run["duration_ms"])
+        return run
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.totals, ttl_seconds=self.ttl_seconds)
+
+    # ---------- Background thread ----------
+    def start(self, interval_seconds: float) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _loop():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.sweep_once()
+                except Exception:
+                    logger.exception("report sweep failed")
+
+        self._thread = threading.Thread(target=_loop, name="report-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from backend.app import REPORTS_DIR, SAVED_DIR
+
+    ap = argparse.ArgumentParser(description="Evict expired, unsaved report previews.")
+    ap.add_argument("--ttl-hours", type=float, default=None, help="retention (default: $REPORT_TTL_HOURS or 72)")
+    ap.add_argument("--batch-size", type=int, default=None)
+    ap.add_argument("--dry-run", action="store_true", help="report what would be removed")
+    args = ap.parse_args(argv)
+
+    ttl = args.ttl_hours * 3600.0 if args.ttl_hours is not None else None
+    sweeper = ReportSweeper(REPORTS_DIR, SAVED_DIR, ttl_seconds=ttl, batch_size=args.batch_size)
+    print(json.dumps(sweeper.sweep_once(dry_run=args.dry_run), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+# backend/response_classifier.py
+# Classifies counterpart utterances into response types (LOWBALL, STALL, ...) for live coaching.
+# data/response_predictor.json: {"response_types": [{"id", "label", "trigger_words",
+#   "recommended_counter_ids", "confidence", "severity_level", "guidance"}]}
+# data/tactic_library.json:     {"tactics": {<category>: [{"id", "name", "text", ...}]}}
+# Every trigger word is compiled once into one KeywordMatcher (payload = response type index),
+# so an utterance is classified in a single scan; counters are resolved once at load time.
+# Score = confidence x distinct triggers found; ties go to the earlier type in the file.
+# A type with no trigger words (UNKNOWN) is the fallback when nothing matches.
+
+from __future__ import annotations
+import os
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from backend.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger("ResponseClassifier")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def _tactics_by_id(tactic_library: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for category in ((tactic_library or {}).get("tactics") or {}).values():
+        if isinstance(category, list):
+            for t in category:
+                if isinstance(t, dict) and t.get("id"):
+                    out.setdefault(t["id"], t)
+    return out
+
+
+class ResponseClassifier:
+    def __init__(self, predictor: Optional[Dict[str, Any]] = None,
+                 tactic_library: Optional[Dict[str, Any]] = None):
+        types = (predictor or {}).get("response_types", [])
+        tactics = _tactics_by_id(tactic_library)
+        self.types: List[Dict[str, Any]] = []
+        self.fallback: Optional[Dict[str, Any]] = None
+        self.matcher = KeywordMatcher()
+        for rt in types:
+            counters = []
+            for cid in rt.get("recommended_counter_ids", []):
+                t = tactics.get(cid)
+                if t is None:
+                    logger.warning("response type %s: unknown counter id %s", rt.get("id"), cid)
+                    continue
+                counters.append({"id": cid, "name": t.get("name", ""), "text": t.get("text", "")})
+            info = {
+                "id": rt.get("id"),
+                "label": rt.get("label", ""),
+                "confidence": float(rt.get("confidence", 0) or 0),
+                "severity_level": rt.get("severity_level", ""),
+                "guidance": rt.get("guidance", ""),
+                "recommended_counter_ids": list(rt.get("recommended_counter_ids", [])),
+                "counters": counters,
+            }
+            triggers = [w for w in rt.get("trigger_words", []) if w]
+            if not triggers:
+                if self.fallback is None:
+                    self.fallback = info
+                continue
+            for w in triggers:
+                self.matcher.add(w, len(self.types))
+            self.types.append(info)
+        logger.info("ResponseClassifier initialized (%d types, %d triggers)", len(self.types), len(self.matcher))
+
+    @classmethod
+    def from_files(cls, data_dir: str = DATA_DIR) -> "ResponseClassifier":
+        """Build from data/response_predictor.json and data/tactic_library.json."""
+        def load(name):
+            path = os.path.join(data_dir, name)
+            if not os.path.exists(path):
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return cls(load("response_predictor.json"), load("tactic_library.json"))
+
+    # ---------- Scoring ----------
+    def _rank(self, hits: Dict[Any, set], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        ranked = []
+        for i in sorted(hits, key=lambda i: (-self.types[i]["confidence"] * len(hits[i]), i)):
+            info = self.types[i]
+            ranked.append(dict(info, matched=sorted(hits[i]),
+                               score=round(info["confidence"] * len(hits[i]), 4)))
+        if not ranked and self.fallback is not None:
+            ranked.append(dict(self.fallback, matched=[], score=0.0))
+        return ranked[:limit] if limit else ranked
+
+    # ---------- Public ----------
+    def classify(self, utterance: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Response types for one utterance, best first (the fallback type alone if nothing matched)."""
+        return self._rank(self.matcher.hits(utterance or ""), limit)
+
+    def classify_stream(self, utterances: Iterable[str], limit: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Lazily classify utterances as they arrive (e.g. from a live transcript)."""
+        for u in utterances:
+            yield self.classify(u, limit)
+
+    def stream(self) -> "ResponseStream":
+        """An incremental classifier for one utterance arriving in chunks."""
+        return ResponseStream(self)
+
+
+class ResponseStream:
+    """
+    Feed partial text of the current utterance (e.g. transcription chunks); each feed() scans only
+    the new chunk (plus a short carry for triggers spanning chunks) and returns the provisional
+    ranking. end() returns the final ranking and resets for the next utterance.
+    """
+
+    def __init__(self, classifier: ResponseClassifier):
+        self.classifier = classifier
+        self._reset()
+
+    def _reset(self) -> None:
+        self._hits: Dict[Any, set] = {}
+        self._carry = ""
+        self._pos = 0
+
+    def feed(self, chunk: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        matcher = self.classifier.matcher
+        matches, self._carry = matcher.feed(chunk or "", self._carry, self._pos)
+        self._pos += len(chunk or "")
+        for p, kws in matcher.hits_from(matches).items():
+            self._hits.setdefault(p, set()).update(kws)
+        return self.classifier._rank(self._hits, limit)
+
+    def end(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        ranked = self.classifier._rank(self._hits, limit)
+        self._reset()
+        return ranked
@@ -0,0 +1,76 @@
+# backend/serialization.py
+# One JSON layer for responses, report payloads and on-disk stores.
+# Uses orjson when installed (pip install orjson), stdlib json otherwise.
+# Compact by default; pass pretty=True only for files humans read.
+
+from __future__ import annotations
+import json
+import dataclasses
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+try:
+    import orjson  # optional fast path
+except Exception:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(o: Any) -> Any:
+    # same coverage as Flask's jsonify (Decimal, UUID, dataclasses, __html__) plus sets/paths
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    if isinstance(o, (Decimal, UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    if isinstance(o, (set, frozenset, tuple)):
+        return list(o)
+    if isinstance(o, Path):
+        return str(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+_COMPACT = (",", ":")
+
+
+def _json_dumps(obj: Any, pretty: bool = False) -> str:
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=_default)
+    return json.dumps(obj, ensure_ascii=False, separators=_COMPACT, default=_default)
+
+
+if orjson is not None:
+    _OPTS = orjson.OPT_NON_STR_KEYS
+    _PRETTY = _OPTS | orjson.OPT_INDENT_2
+
+    def dumps_bytes(obj: Any, pretty: bool = False) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_default, option=_PRETTY if pretty else _OPTS)
+        except TypeError:
+            # orjson rejects what stdlib json accepts (ints beyond 64 bits, ...): use json for these
+            return _json_dumps(obj, pretty).encode("utf-8")
+
+    def dumps(obj: Any, pretty: bool = False) -> str:
+        return dumps_bytes(obj, pretty).decode("utf-8")
+
+    loads = orjson.loads
+else:
+    dumps = _json_dumps
+
+    def dumps_bytes(obj: Any, pretty: bool = False) -> bytes:
+        return dumps(obj, pretty).encode("utf-8")
+
+    loads = json.loads
+
+
+def json_response(data: Any, code: int = 200):
+    """Flask response with the body encoded straight to bytes (no jsonify round-trip)."""
+    from flask import Response
+    return Response(dumps_bytes(data), status=code, mimetype="application/json")
@@ -0,0 +1,165 @@
+# backend/slot_writer.py
+# LLM writes only two small slots per report: executive_summary + strategic_highlights.
+# Requests from concurrent reports are coalesced: identical persona/country/range/target
+# combinations share one result, and distinct ones are batched into a single structured (JSON)
+# LLM call. close() stops the collector thread and the dispatch pool.
+
+from __future__ import annotations
+import time, logging, threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.llm_client import EnhancementClient
+from backend.serialization import dumps, loads
+
+logger = logging.getLogger("SlotWriter")
+
+SLOTS_SYSTEM = (
+    "You are a negotiation strategist writing short report slots. "
+    "Reply with JSON only: {\"slots\": [{\"id\": <id>, \"executive_summary\": <2 sentences>, "
+    "\"strategic_highlights\": [<3 short bullet strings>]}]} — one entry per request id. "
+    "Frame the anchor around `target` (the candidate's salary target) when it is given."
+)
+
+SlotKey = Tuple[str, str, str, str, str]
+
+
+def slot_key(persona: Any, country: Any, low: Any, high: Any, target: Any = None) -> SlotKey:
+    norm = lambda v: "" if v is None else str(v).strip().lower()
+    return (norm(persona), norm(country), norm(low), norm(high), norm(target))
+
+
+class SlotWriter:
+    def __init__(
+        self,
+        client: EnhancementClient,
+        batch_size: int = 8,
+        max_wait: float = 0.05,
+        deadline: Optional[float] = None,
+        cache_size: int = 512,
+        dispatchers: int = 2,
+    ):
+        self.client = client
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+        self.deadline = client.deadline if deadline is None else deadline
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[SlotKey, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[SlotKey, Future] = {}
+        self._queue: List[SlotKey] = []
+        self._cv = threading.Condition()
+        self._closed = False
+        self._dispatch = ThreadPoolExecutor(max_workers=max(1, dispatchers), thread_name_prefix="slot-batch")
+        self.stats: Dict[str, int] = {
+            "requests": 0, "cache_hits": 0, "coalesced": 0, "batches": 0,
+            "slots_sent": 0, "failed": 0, "prompt_chars": 0,
+        }
+        self._collector = threading.Thread(target=self._collect, name="slot-writer", daemon=True)
+        self._collector.start()
+
+    # ---------- Public ----------
+    def write(self, persona: Any, country: Any, low: Any, high: Any,
+              fallback: Optional[Dict[str, Any]] = None, target: Any = None) -> Optional[Dict[str, Any]]:
+        """Return {"executive_summary", "strategic_highlights"}; `fallback` on timeout, failure or after close()."""
+        key = slot_key(persona, country, low, high, target)
+        with self._cv:
+            if self._closed:
+                return fallback
+            self.stats["requests"] += 1
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return hit
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.stats["coalesced"] += 1
+            else:
+                fut = Future()
+                self._inflight[key] = fut
+                self._queue.append(key)
+                self._cv.notify()
+        try:
+            res = fut.result(timeout=self.deadline + self.max_wait)
+        except FutureTimeout:
+            res = None
+        return res or fallback
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cv:
+            out: Dict[str, Any] = dict(self.stats)
+        out["avg_batch"] = round(out["slots_sent"] / out["batches"], 2) if out["batches"] else 0.0
+        return out
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Stop batching: queued writes get their fallback, running batches finish."""
+        with self._cv:
+            if self._closed:
+                return
+            self._closed = True
+            queued = [self._inflight.pop(k, None) for k in self._queue]
+            self._queue = []
+            self._cv.notify_all()
+        for fut in queued:
+            if fut is not None:
+                fut.set_result(None)
+        self._collector.join(timeout)
+        self._dispatch.shutdown(wait=True)
+
+    # ---------- Batching ----------
+    def _collect(self) -> None:
+        while True:
+            with self._cv:
+                while not self._queue and not self._closed:
+                    self._cv.wait()
+                if self._closed:
+                    return
+                # give concurrent reports a moment to join this batch
+                t_end = time.monotonic() + self.max_wait
+                while len(self._queue) < self.batch_size and not self._closed:
+                    left = t_end - time.monotonic()
+                    if left <= 0:
+                        break
+                    self._cv.wait(left)
+                if self._closed:
+                    return
+                batch, self._queue = self._queue[:self.batch_size], self._queue[self.batch_size:]
+            self._dispatch.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: List[SlotKey]) -> None:
+        items = [
+            {"id": i, "persona": k[0], "country": k[1], "range_low": k[2], "range_high": k[3], "target": k[4]}
+            for i, k in enumerate(batch)
+        ]
+        prompt = dumps({"requests": items})
+        messages = [{"role": "system", "content": SLOTS_SYSTEM}, {"role": "user", "content": prompt}]
+        cache_key = self.client.cache_key(SLOTS_SYSTEM + prompt)
+        raw = self.client.complete(messages, cache_key, deadline=self.deadline, json_mode=True)
+
+        parsed: Dict[int, Dict[str, Any]] = {}
+        if raw:
+            try:
+                for s in (loads(raw).get("slots") or []):
+                    summary = str(s.get("executive_summary") or "").strip()
+                    hl = [str(h).strip() for h in (s.get("strategic_highlights") or []) if str(h).strip()]
+                    if summary and hl:
+                        parsed[int(s["id"])] = {"executive_summary": summary, "strategic_highlights": hl[:5]}
+            except Exception as e:
+                logger.warning("slot batch returned invalid JSON: %s", e)
+
+        with self._cv:
+            self.stats["batches"] += 1
+            self.stats["slots_sent"] += len(batch)
+            self.stats["prompt_chars"] += len(SLOTS_SYSTEM) + len(prompt)
+            self.stats["failed"] += len(batch) - len(parsed)
+            futures = [(k, self._inflight.pop(k, None), parsed.get(i)) for i, k in enumerate(batch)]
+            for k, _fut, res in futures:
+                if res is not None:
+                    self._cache[k] = res
+                    self._cache.move_to_end(k)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        for _k, fut, res in futures:
+            if fut is not None:
+                fut.set_result(res)
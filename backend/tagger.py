@@ -1,31 +1,248 @@
 # backend/tagger.py
 # Simple persona & emotion detector (keyword-based, fast, deterministic).
+# All persona keywords and emotion indicators are compiled once into one KeywordMatcher
+# (keyword_matcher.py). Below AC_MIN_KEYWORDS keywords (the shipped data has ~18) it runs one
+# C-level substring test per keyword; larger tables switch to a single Aho-Corasick pass.
+# Emotions score like the original Counter: every listed indicator present counts (rules sharing
+# a name add up), and ties go to the emotion that was hit first in rule order.
+# Accepts both data shapes:
+#   personas: [{"type", "keywords"}]  or  data/persona-types.json {"personas": {<type>: {"keywords"}}}
+#   emotions: {"triggers": [{"name", "detection_indicators"}]}
+#             or data/emotion-rules.json {"rules": [{"emotion", "triggers"}]}
+# Persona speechPatterns (regexes) are compiled into one alternation of lookaheads, a named group
+# per pattern, and evaluated with a single finditer() per utterance. Lookaheads are zero-width, so
+# overlapping or nested matches are all visited; where the alternation stops at one pattern, the
+# later ones are re-tried at that position, so each pattern counts exactly when re.search() would
+# find it. Leading/trailing `.*` are stripped (same matches for a search, no backtracking); patterns
+# with their own groups (or inline flags) would break once combined and are searched separately.
+# A persona's score is its distinct keywords plus distinct patterns found; detect() picks the top
+# score, earlier persona on ties.
+# tag_many() labels a whole transcript: identical lines are tagged once, and large corpora are
+# split across a process pool (each worker builds its own detector once).
 
+import os
+import re
+import json
 import logging
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger("PersonaDetector")
 
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+PARALLEL_MIN_LINES = 20000  # distinct lines below which a process pool costs more than it saves
+
+
+def _persona_table(persona_data):
+    """[(type, keywords, speechPatterns)] in priority order."""
+    personas = (persona_data or {}).get("personas", [])
+    if isinstance(personas, dict):
+        personas = [dict(p, type=key) for key, p in personas.items()]
+    return [(p["type"], p.get("keywords", []), p.get("speechPatterns", [])) for p in personas]
+
+
+_WILDCARD_EDGES = re.compile(r"^(?:\.\*)+|(?<!\\)(?:\.\*)+$")
+
+
+_PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+
+
+class _SpeechPatterns:
+    """All personas' speechPatterns; hits(text) -> {persona index: set of pattern groups}."""
+
+    def __init__(self, table):
+        self.persona = {}     # group -> persona index
+        self.single = {}      # group -> pattern compiled on its own
+        self.separate = []    # groups that cannot join the alternation
+        combined = []
+        for i, (name, _kw, patterns) in enumerate(table):
+            for j, pat in enumerate(patterns):
+                core = _WILDCARD_EDGES.sub("", pat).replace("’", "['’]")
+                if not core:
+                    continue  # pure wildcard: matches everything, carries no signal
+                g = f"p{i}_{j}"
+                try:
+                    single = re.compile(core, _PATTERN_FLAGS)
+                except re.error as e:
+                    logger.warning("skipping speechPattern %r of %s: %s", pat, name, e)
+                    continue
+                self.persona[g], self.single[g] = i, single
+                try:
+                    joinable = single.groups == 0 and re.compile(f"(?=(?P<{g}>{core}))", _PATTERN_FLAGS)
+                except re.error:
+                    joinable = False
+                if joinable:
+                    combined.append(g)
+                else:
+                    self.separate.append(g)
+        self.regex = None
+        if combined:
+            self.regex = re.compile("|".join(f"(?=(?P<{g}>{self.single[g].pattern}))" for g in combined),
+                                    _PATTERN_FLAGS)
+        # alternatives tried after g at the same position (only these can be shadowed by g)
+        self.after = {g: combined[k + 1:] for k, g in enumerate(combined)}
+        self.n_combined = len(combined)
+
+    def hits(self, text):
+        found = set()
+        if self.regex is not None:
+            single, after = self.single, self.after
+            for m in self.regex.finditer(text):
+                g = m.lastgroup
+                found.add(g)
+                pos = m.start()
+                for other in after[g]:
+                    if other not in found and single[other].match(text, pos):
+                        found.add(other)
+                if len(found) == self.n_combined:
+                    break
+        for g in self.separate:
+            if self.single[g].search(text):
+                found.add(g)
+        out = {}
+        for g in found:
+            out.setdefault(self.persona[g], set()).add(g)
+        return out
+
+
+def _emotion_table(emotion_rules):
+    """[(emotion, indicators)] per rule, in rule order."""
+    rules = emotion_rules or {}
+    if rules.get("triggers"):
+        return [(t["name"], t.get("detection_indicators", [])) for t in rules["triggers"]]
+    return [(r["emotion"], r.get("triggers", [])) for r in rules.get("rules", [])]
+
+
 class PersonaDetector:
     def __init__(self, persona_data=None, emotion_rules=None):
         self.persona_data = persona_data or {"personas":[]}
         self.emotion_rules = emotion_rules or {"triggers":[]}
+        personas = _persona_table(self.persona_data)
+        self.personas = [name for name, _kw, _pat in personas]
+        emotion_rules = _emotion_table(self.emotion_rules)
+        self.emotions = list(dict.fromkeys(name for name, _ in emotion_rules))
+        # per rule: (emotion, {indicator: times listed}); payload ("emotion", rule index)
+        self._emotion_rules = [(name, Counter(i.lower() for i in indicators)) for name, indicators in emotion_rules]
+        self.matcher = KeywordMatcher()
+        for i, (_name, keywords, _pat) in enumerate(personas):
+            for kw in keywords:
+                self.matcher.add(kw, ("persona", i))
+        self.speech = _SpeechPatterns(personas)
+        for i, (_name, indicators) in enumerate(emotion_rules):
+            for ind in indicators:
+                self.matcher.add(ind, ("emotion", i))
         logger.info("PersonaDetector initialized")
 
+    @classmethod
+    def from_files(cls, data_dir=DATA_DIR):
+        """Build from data/persona-types.json and data/emotion-rules.json."""
+        def load(name):
+            path = os.path.join(data_dir, name)
+            if not os.path.exists(path):
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return cls(load("persona-types.json"), load("emotion-rules.json"))
+
+    # ---------- Scoring ----------
+    def _pattern_hits(self, text):
+        """persona index -> set of speechPattern groups matched."""
+        return self.speech.hits(text)
+
+    def _scores(self, hits, pattern_hits):
+        scores = [0] * len(self.personas)
+        for (kind, i), kws in hits.items():
+            if kind == "persona":
+                scores[i] += len(kws)
+        for i, groups in pattern_hits.items():
+            scores[i] += len(groups)
+        return scores
+
+    def _pick_persona(self, scores):
+        best = max(range(len(scores)), key=lambda i: (scores[i], -i), default=None)
+        return self.personas[best] if best is not None and scores[best] > 0 else "default"
+
+    def _emotion_scores(self, hits):
+        """{emotion: indicators present}, in the order emotions were first hit (rule order)."""
+        scores = {}
+        for r in sorted(i for kind, i in hits if kind == "emotion"):
+            name, listed = self._emotion_rules[r]
+            scores[name] = scores.get(name, 0) + sum(listed[kw] for kw in hits[("emotion", r)])
+        return scores
+
+    def _pick_emotion(self, scores):
+        return max(scores, key=scores.get) if scores else "neutral"  # first hit wins ties
+
+    # ---------- Public ----------
+    def scan(self, text):
+        """All keyword matches with positions, plus per-keyword counts."""
+        return self.matcher.summary(text or "")
+
+    def scores(self, text):
+        """
+        (persona scores, emotion scores) from a single scan. Persona scores are a list aligned
+        with self.personas; emotion scores are {emotion: indicators present} in first-hit order,
+        the order detect_emotion() breaks ties by.
+        """
+        text = text or ""
+        hits = self.matcher.hits(text)
+        return self._scores(hits, self._pattern_hits(text)), self._emotion_scores(hits)
+
+    def persona_scores(self, text):
+        """{persona: keyword hits + speechPattern hits}"""
+        return dict(zip(self.personas, self.scores(text)[0]))
+
     def detect(self, text):
-        lowered = (text or "").lower()
-        for persona in self.persona_data.get("personas", []):
-            for keyword in persona.get("keywords", []):
-                if keyword in lowered:
-                    return persona["type"]
-        return "default"
+        return self._pick_persona(self.scores(text)[0])
 
     def detect_emotion(self, text):
-        lowered = (text or "").lower()
-        emotion_counter = Counter()
-        for trig in self.emotion_rules.get("triggers", []):
-            for ind in trig.get("detection_indicators", []):
-                if ind.lower() in lowered:
-                    emotion_counter[trig["name"]] += 1
-        return emotion_counter.most_common(1)[0][0] if emotion_counter else "neutral"
-
+        # emotions only: skip the speechPattern scan scores() would run
+        return self._pick_emotion(self._emotion_scores(self.matcher.hits(text or "")))
+
+    def tag(self, text):
+        """(persona, emotion) from a single scan."""
+        personas, emotions = self.scores(text)
+        return self._pick_persona(personas), self._pick_emotion(emotions)
+
+    def tag_many(self, utterances, workers=None, chunk_size=2000):
+        """
+        Tag many utterances (list or iterator). Identical lines are tagged once.
+        workers: process count for large corpora (default: CPU count; 1 = in-process).
+        Returns {"labels": [(persona, emotion)] in input order, "personas": {persona: n},
+                 "emotions": {emotion: n}, "lines": n, "unique": n}.
+        """
+        lines = [u or "" for u in utterances]
+        unique = list(dict.fromkeys(lines))
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(unique) >= PARALLEL_MIN_LINES:
+            chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker,
+                                     initargs=(self.persona_data, self.emotion_rules)) as pool:
+                tags = [t for part in pool.map(_tag_chunk, chunks) for t in part]
+        else:
+            tags = [self.tag(u) for u in unique]
+        by_text = dict(zip(unique, tags))
+        labels = [by_text[u] for u in lines]
+        return {
+            "labels": labels,
+            "personas": dict(Counter(p for p, _e in labels)),
+            "emotions": dict(Counter(e for _p, e in labels)),
+            "lines": len(lines),
+            "unique": len(unique),
+        }
+
+
+# ---------- Process-pool workers ----------
+_WORKER = None
+
+
+def _init_worker(persona_data, emotion_rules):
+    global _WORKER
+    _WORKER = PersonaDetector(persona_data, emotion_rules)
+
+
+def _tag_chunk(texts):
+    return [_WORKER.tag(t) for t in texts]
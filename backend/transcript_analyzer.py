@@ -0,0 +1,121 @@
+# backend/transcript_analyzer.py
+# Live-session analysis over a sliding window of recent turns, built on tagger.PersonaDetector.scores().
+# Each message is scanned once; its per-persona scores, per-emotion indicator counts and
+# intensity are added to running totals and subtracted again when the turn leaves the window,
+# so a message costs O(message length) however long the transcript gets.
+# Intensity: indicators present per emotion x that emotion's "intensity" weight from
+# emotion-rules.json (1.0 when a rule has none), averaged over the turns in the window.
+# Dominant persona / emotion use the tagger's rules (top total, earlier entry on ties); a shift
+# in either is reported as an event.
+
+from __future__ import annotations
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.tagger import DATA_DIR, PersonaDetector
+
+
+def _emotion_intensity(emotion_rules: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """emotion -> intensity weight; the highest wins when several rules share an emotion."""
+    rules = emotion_rules or {}
+    if rules.get("triggers"):
+        pairs = [(t.get("name"), t.get("intensity")) for t in rules["triggers"]]
+    else:
+        pairs = [(r.get("emotion"), r.get("intensity")) for r in rules.get("rules", [])]
+    out: Dict[str, float] = {}
+    for name, w in pairs:
+        try:
+            w = float(w) if w is not None else 1.0
+        except (TypeError, ValueError):
+            w = 1.0
+        out[name] = max(w, out.get(name, w))
+    return out
+
+
+class TranscriptAnalyzer:
+    def __init__(self, detector: PersonaDetector, window: int = 20,
+                 on_event: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.detector = detector
+        self.window = max(1, int(window))
+        self.on_event = on_event
+        weights = _emotion_intensity(detector.emotion_rules)
+        self._weights = [weights.get(e, 1.0) for e in detector.emotions]
+        self._emotion_index = {e: i for i, e in enumerate(detector.emotions)}
+        self._turns: deque = deque()
+        self._persona_totals = [0] * len(detector.personas)
+        self._emotion_totals = [0] * len(detector.emotions)
+        self._intensity_sum = 0.0
+        self.turn = 0
+        self.persona = "default"
+        self.emotion = "neutral"
+
+    @classmethod
+    def from_files(cls, data_dir: str = DATA_DIR, window: int = 20, **kwargs) -> "TranscriptAnalyzer":
+        return cls(PersonaDetector.from_files(data_dir), window, **kwargs)
+
+    # ---------- Internals ----------
+    @staticmethod
+    def _argmax(totals: List[float], labels: List[str], default: str) -> str:
+        best = max(range(len(totals)), key=lambda i: (totals[i], -i), default=None)
+        return labels[best] if best is not None and totals[best] > 0 else default
+
+    def _score(self, text: str):
+        personas, emotion_scores = self.detector.scores(text)
+        emotions = [0] * len(self.detector.emotions)
+        for name, n in emotion_scores.items():
+            emotions[self._emotion_index[name]] = n
+        intensity = sum(n * w for n, w in zip(emotions, self._weights))
+        return personas, emotions, intensity
+
+    def _apply(self, turn, sign: int) -> None:
+        personas, emotions, intensity = turn
+        for i, n in enumerate(personas):
+            self._persona_totals[i] += sign * n
+        for i, n in enumerate(emotions):
+            self._emotion_totals[i] += sign * n
+        self._intensity_sum += sign * intensity
+
+    # ---------- Public ----------
+    def add(self, message: str) -> Dict[str, Any]:
+        """Fold one message into the window; returns the current state plus any shift events."""
+        det = self.detector
+        text = message or ""
+        turn = self._score(text)
+        self._turns.append(turn)
+        self._apply(turn, +1)
+        if len(self._turns) > self.window:
+            self._apply(self._turns.popleft(), -1)
+        self.turn += 1
+
+        events = []
+        persona = self._argmax(self._persona_totals, det.personas, "default")
+        emotion = self._argmax(self._emotion_totals, det.emotions, "neutral")
+        for kind, old, new in (("persona_shift", self.persona, persona), ("emotion_shift", self.emotion, emotion)):
+            if old != new:
+                events.append({"type": kind, "from": old, "to": new, "turn": self.turn})
+        self.persona, self.emotion = persona, emotion
+        if self.on_event:
+            for e in events:
+                self.on_event(e)
+
+        state = self.state()
+        state["message"] = {
+            "persona": self._argmax(turn[0], det.personas, "default"),
+            "emotion": self._argmax(turn[1], det.emotions, "neutral"),
+            "intensity": round(turn[2], 3),
+        }
+        state["events"] = events
+        return state
+
+    def state(self) -> Dict[str, Any]:
+        det = self.detector
+        n = len(self._turns)
+        return {
+            "turn": self.turn,
+            "window_turns": n,
+            "persona": self.persona,
+            "emotion": self.emotion,
+            "intensity": round(max(0.0, self._intensity_sum) / n, 3) if n else 0.0,
+            "persona_scores": dict(zip(det.personas, self._persona_totals)),
+            "emotion_counts": dict(zip(det.emotions, self._emotion_totals)),
+        }
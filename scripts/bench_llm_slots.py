@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Compare LLM cost of the two report modes (LLM_MODE=document vs LLM_MODE=slots) on a simulated model.
+
+document: every report's HTML body is rewritten by the LLM (EnhancementClient.enhance).
+slots:    the LLM writes only summary + highlights; concurrent reports are batched (SlotWriter).
+
+The model is simulated (no network): each call takes --ttft seconds plus --per-token seconds per
+completion token; tokens are estimated as characters / 4. Reports arrive concurrently, drawn
+from --distinct answer sets.
+
+  python scripts/bench_llm_slots.py --reports 32 --distinct 8
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.app import render_report_sections  # noqa: E402
+from backend.llm_client import EnhancementClient, LLMBackend  # noqa: E402
+from backend.slot_writer import SlotWriter  # noqa: E402
+
+
+def tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class SimulatedModel(LLMBackend):
+    name = "simulated"
+
+    def __init__(self, ttft: float, per_token: float):
+        self.ttft, self.per_token = ttft, per_token
+        self.calls = self.prompt_tokens = self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def _reply(self, messages, json_mode):
+        if not json_mode:
+            return messages[-1]["content"]  # a rewrite is about as long as its input
+        reqs = json.loads(messages[-1]["content"])["requests"]
+        return json.dumps({"slots": [{
+            "id": r["id"],
+            "executive_summary": "Anchor near the 75th percentile with two quantified proof points. "
+                                 "Expect a decision within five business days.",
+            "strategic_highlights": ["Lead with quantified impact", "Anchor high within reason",
+                                     "Invite alignment on a shared goal"],
+        } for r in reqs]})
+
+    def complete(self, messages, model, temperature, timeout, json_mode=False):
+        out = self._reply(messages, json_mode)
+        n_in, n_out = sum(tokens(m["content"]) for m in messages), tokens(out)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += n_in
+            self.completion_tokens += n_out
+        time.sleep(self.ttft + n_out * self.per_token)
+        return out
+
+
+def answer_sets(n: int):
+    personas, countries = ["fox", "owl", "bear", "dove"], ["UK", "US", "DE", "FR"]
+    return [{"persona": personas[i % 4], "country": countries[(i // 4) % 4], "salary_low": 50000 + 1000 * i,
+             "salary_high": 70000 + 1000 * i, "salary_target": 65000 + 1000 * i, "priorities": "Salary, Title"}
+            for i in range(n)]
+
+
+def run(mode: str, reports, args):
+    model = SimulatedModel(args.ttft, args.per_token)
+    client = EnhancementClient(model, deadline=600.0, max_concurrency=args.concurrency)
+    writer = SlotWriter(client, deadline=600.0) if mode == "slots" else None
+    latencies = [0.0] * len(reports)
+
+    def one(i, answers):
+        t = time.perf_counter()
+        if writer is None:
+            client.enhance(render_report_sections(answers, debug=False)[0])
+        else:
+            writer.write(answers["persona"], answers["country"], answers["salary_low"],
+                         answers["salary_high"], target=answers["salary_target"])
+        latencies[i] = time.perf_counter() - t
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=one, args=(i, a)) for i, a in enumerate(reports)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.perf_counter() - t0
+    if writer is not None:
+        writer.close()
+    lat = sorted(latencies)
+    return {
+        "mode": mode, "llm_calls": model.calls,
+        "prompt_tokens": model.prompt_tokens, "completion_tokens": model.completion_tokens,
+        "p50_s": round(statistics.median(lat), 3), "p95_s": round(lat[int(0.95 * (len(lat) - 1))], 3),
+        "wall_s": round(wall, 3),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--reports", type=int, default=32, help="concurrent report requests")
+    ap.add_argument("--distinct", type=int, default=8, help="distinct answer sets among them")
+    ap.add_argument("--ttft", type=float, default=0.3, help="simulated seconds before the first token")
+    ap.add_argument("--per-token", type=float, default=0.002, help="simulated seconds per completion token")
+    ap.add_argument("--concurrency", type=int, default=4, help="EnhancementClient max_concurrency")
+    args = ap.parse_args()
+
+    sets = answer_sets(args.distinct)
+    reports = [sets[i % len(sets)] for i in range(args.reports)]
+    rows = [run(mode, reports, args) for mode in ("document", "slots")]
+    cols = list(rows[0])
+    print("  ".join(f"{c:>17}" for c in cols))
+    for r in rows:
+        print("  ".join(f"{r[c]!s:>17}" for c in cols))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
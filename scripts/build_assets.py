@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# scripts/build_assets.py
+# Fingerprint + precompress frontend assets.
+# Usage:
+#   python scripts/build_assets.py            # writes frontend/dist/
+#   python scripts/build_assets.py --clean    # remove frontend/dist/ first
+# Outputs (frontend/dist/):
+#   <name>.<hash>.<ext>, plus .gz (and .br when the `brotli` package is installed)
+#   manifest.json  {"app.js": "app.3f9c2a1b7d.js", ...}
+#   index.html     rewritten to reference the hashed names
+# The backend serves hashed files with immutable caching; see backend/app.py.
+
+from __future__ import annotations
+import os, re, json, gzip, shutil, hashlib, argparse
+from typing import Dict
+
+try:
+    import brotli  # optional
+except Exception:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONTEND = os.path.join(ROOT, "frontend")
+DIST = os.path.join(FRONTEND, "dist")
+
+ASSET_EXTS = (".js", ".css")
+HASH_LEN = 10
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LEN]
+
+
+def _write(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _precompress(path: str, data: bytes) -> None:
+    # mtime=0 keeps .gz output byte-identical across builds
+    with open(path + ".gz", "wb") as raw:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0) as gz:
+            gz.write(data)
+    if brotli is not None:
+        _write(path + ".br", brotli.compress(data, quality=11))
+
+
+def build(frontend_dir: str = FRONTEND, dist_dir: str = DIST) -> Dict[str, str]:
+    os.makedirs(dist_dir, exist_ok=True)
+    manifest: Dict[str, str] = {}
+    for fn in sorted(os.listdir(frontend_dir)):
+        src = os.path.join(frontend_dir, fn)
+        if not os.path.isfile(src) or not fn.endswith(ASSET_EXTS):
+            continue
+        with open(src, "rb") as f:
+            data = f.read()
+        stem, ext = os.path.splitext(fn)
+        hashed = f"{stem}.{fingerprint(data)}{ext}"
+        out = os.path.join(dist_dir, hashed)
+        if not os.path.exists(out):
+            _write(out, data)
+            _precompress(out, data)
+        manifest[fn] = hashed
+
+    index_src = os.path.join(frontend_dir, "index.html")
+    if os.path.exists(index_src):
+        with open(index_src, "r", encoding="utf-8") as f:
+            html = f.read()
+        pat = re.compile(r"""(["'])/frontend/([^"'?#]+)\1""")
+        html = pat.sub(
+            lambda m: f"{m.group(1)}/frontend/dist/{manifest[m.group(2)]}{m.group(1)}"
+            if m.group(2) in manifest else m.group(0),
+            html,
+        )
+        with open(os.path.join(dist_dir, "index.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+
+    with open(os.path.join(dist_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Fingerprint and precompress frontend assets.")
+    ap.add_argument("--clean", action="store_true", help="remove frontend/dist/ before building")
+    args = ap.parse_args()
+    if args.clean and os.path.isdir(DIST):
+        shutil.rmtree(DIST)
+    manifest = build()
+    for src, hashed in manifest.items():
+        print(f"[OK] {src} -> dist/{hashed}")
+    print(f"[INFO] brotli: {'yes' if brotli is not None else 'not installed (gzip only)'}")
+
+
+if __name__ == "__main__":
+    main()
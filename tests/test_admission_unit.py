@@ -0,0 +1,49 @@
+# tests/test_admission_unit.py
+
+import threading
+
+from flask import Flask
+
+from backend.admission import AdmissionClass, AdmissionController
+
+
+def test_queue_full_and_timeout_rejections():
+    cls = AdmissionClass("pdf", limit=1, max_queue=1, max_wait=0.05)
+    assert cls.acquire() is None          # takes the only slot
+    assert cls.acquire() == "timeout"     # waits, then gives up
+
+    cls.waiting = 1                       # simulate a queued request
+    assert cls.acquire() == "queue_full"
+    cls.waiting = 0
+
+    cls.release()
+    assert cls.acquire() is None
+    snap = cls.snapshot()
+    assert snap["rejected_timeout"] == 1 and snap["rejected_full"] == 1 and snap["active"] == 1
+
+
+def test_middleware_returns_503_with_retry_after():
+    gate, entered = threading.Event(), threading.Event()
+    app = Flask(__name__)
+
+    @app.get("/slow")
+    def slow():
+        entered.set()
+        gate.wait(2)
+        return "ok"
+
+    ctl = AdmissionController(limits={"report": (1, 0, 0.05)}, endpoints={"slow": "report"})
+    ctl.init_app(app)
+
+    results = []
+    t = threading.Thread(target=lambda: results.append(app.test_client().get("/slow").status_code))
+    t.start()
+    entered.wait(2)
+    busy = app.test_client().get("/slow")
+    gate.set()
+    t.join()
+
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "1"
+    assert results == [200]
+    assert ctl.snapshot()["report"]["active"] == 0
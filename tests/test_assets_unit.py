@@ -0,0 +1,80 @@
+# tests/test_assets_unit.py
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import build_assets  # noqa: E402
+from backend import app as app_module  # noqa: E402
+
+
+@pytest.fixture()
+def frontend(tmp_path):
+    fe = tmp_path / "frontend"
+    fe.mkdir()
+    (fe / "app.js").write_text("console.log('hi');" * 50)
+    (fe / "style.css").write_text("body{margin:0}")
+    (fe / "notes.txt").write_text("not an asset")
+    (fe / "index.html").write_text('<script src="/frontend/app.js"></script><link href="/frontend/style.css">'
+                                    '<img src="/frontend/logo.png">')
+    return fe
+
+
+def test_build_writes_manifest_hashed_files_and_index(frontend):
+    dist = frontend / "dist"
+    manifest = build_assets.build(str(frontend), str(dist))
+    digest = build_assets.fingerprint((frontend / "app.js").read_bytes())
+    assert manifest == {"app.js": f"app.{digest}.js",
+                        "style.css": f"style.{build_assets.fingerprint(b'body{margin:0}')}.css"}
+    assert json.loads((dist / "manifest.json").read_text()) == manifest
+    assert gzip.decompress((dist / (manifest["app.js"] + ".gz")).read_bytes()) == (frontend / "app.js").read_bytes()
+    html = (dist / "index.html").read_text()
+    assert f'/frontend/dist/{manifest["app.js"]}' in html and f'/frontend/dist/{manifest["style.css"]}' in html
+    assert "/frontend/logo.png" in html  # not built: left alone
+    # rebuilding is byte-identical (content hashes, gzip mtime=0)
+    before = {p.name: p.read_bytes() for p in dist.iterdir()}
+    assert build_assets.build(str(frontend), str(dist)) == manifest
+    assert {p.name: p.read_bytes() for p in dist.iterdir()} == before
+
+
+@pytest.fixture()
+def client(frontend, monkeypatch):
+    monkeypatch.setattr(app_module, "FRONTEND_DIR", frontend)
+    monkeypatch.setattr(app_module, "DIST_DIR", frontend / "dist")
+    manifest = build_assets.build(str(frontend), str(frontend / "dist"))
+    return app_module.create_app().test_client(), manifest
+
+
+def test_hashed_asset_is_immutable_and_precompressed(client):
+    c, manifest = client
+    url = f"/frontend/dist/{manifest['app.js']}"
+    r = c.get(url, headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert r.headers["Content-Encoding"] == "gzip" and r.headers["Vary"] == "Accept-Encoding"
+    assert r.mimetype in ("application/javascript", "text/javascript")
+    assert gzip.decompress(r.data).startswith(b"console.log")
+
+    r = c.get(url, headers={"Accept-Encoding": "identity"})  # no acceptable variant: raw file
+    assert "Content-Encoding" not in r.headers and r.data.startswith(b"console.log")
+    assert "immutable" in r.headers["Cache-Control"]
+
+
+def test_unknown_hash_404_and_unhashed_fallback(client):
+    c, manifest = client
+    r = c.get("/frontend/dist/app.0123456789.js")
+    assert r.status_code == 404 and "not found" in r.get_json()["error"]
+
+    for path in ("/frontend/app.js", "/frontend/dist/manifest.json"):  # not fingerprinted: revalidate
+        r = c.get(path)
+        assert r.status_code == 200 and "immutable" not in r.headers.get("Cache-Control", "")
+
+    r = c.get("/")
+    assert f"/frontend/dist/{manifest['app.js']}".encode() in r.data
+    assert "immutable" not in r.headers.get("Cache-Control", "")
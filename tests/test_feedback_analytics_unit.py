@@ -0,0 +1,42 @@
+# tests/test_feedback_analytics_unit.py
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from backend.feedback_analytics import FeedbackTable
+from backend.feedback_store import FeedbackStore
+
+ROWS = [
+    {"ts": 100, "persona": "Friend", "country": "UK", "scenario_id": "lowball", "outcome": "win", "usefulness": 8},
+    {"ts": 200, "persona": "Friend", "country": "UK", "scenario_id": "lowball", "outcome": "partial", "usefulness": 6},
+    {"ts": 300, "persona": "Shark", "country": "US", "scenario_id": "stall", "outcome": "loss", "usefulness": 2},
+    {"ts": 400, "persona": "Shark", "country": "UK", "scenario_id": "lowball", "outcome": "win", "usefulness": 9},
+]
+
+
+def test_group_by_and_filters():
+    t = FeedbackTable(capacity=2)  # forces growth
+    t.extend(ROWS)
+
+    out = t.query()
+    assert out["total"] == 4
+    top = out["groups"][0]
+    assert top == {"persona": "Friend", "country": "UK", "scenario_id": "lowball",
+                   "count": 2, "wins": 1, "partials": 1, "success_rate": 75.0, "avg_usefulness": 7.0}
+
+    uk = t.query(group_by=["persona"], country="UK", since=150)
+    assert [(g["persona"], g["count"]) for g in uk["groups"]] == [("Friend", 1), ("Shark", 1)]
+    assert t.query(persona="Nobody")["total"] == 0
+    with pytest.raises(ValueError):
+        t.query(group_by=["notes"])
+
+
+def test_refresh_reads_only_new_log_lines(tmp_path):
+    store = FeedbackStore(str(tmp_path))
+    t = FeedbackTable()
+    store.add({"persona": "Friend", "outcome": "win", "usefulness": 5})
+    assert t.refresh(store) == 1
+    store.add({"persona": "Friend", "outcome": "loss", "usefulness": 1})
+    assert t.refresh(store) == 1
+    assert t.query(group_by=["persona"])["groups"][0]["success_rate"] == 50.0
@@ -0,0 +1,33 @@
+# tests/test_feedback_loop_unit.py
+
+from backend.feedback_loop import DAY_SECONDS, FeedbackLoop
+
+NOW = 1_760_000_000
+
+
+def _entry(days_ago, issues=(), sentiment=0.0):
+    return {"ts": NOW - days_ago * DAY_SECONDS, "issues": list(issues), "sentiment_score": sentiment}
+
+
+def test_windows_sum_day_buckets():
+    loop = FeedbackLoop({"entries": [
+        _entry(1, ["anchoring"], 1.0),
+        _entry(5, ["anchoring", "tone"], 0.5),
+        _entry(20, ["tone"], -1.0),
+        _entry(60, ["silence"], 0.0),
+        {"ts": "bad"},
+    ]})
+    w = loop.windows(now=NOW)
+    assert w["7d"]["recent_entries"] == 2
+    assert w["7d"]["common_issues"][0] == ("anchoring", 2)
+    assert w["7d"]["avg_sentiment"] == 0.75
+    assert w["30d"]["recent_entries"] == 3
+    assert w["90d"]["recent_entries"] == 4
+    assert w["90d"]["total_entries"] == 5
+
+
+def test_add_updates_incrementally():
+    loop = FeedbackLoop(None)
+    assert loop.analyze(now=NOW) == {}
+    loop.add(_entry(0, ["stall"], 2.0))
+    assert loop.analyze(now=NOW)["common_issues"] == [("stall", 1)]
@@ -0,0 +1,177 @@
+# tests/test_feedback_store_unit.py
+
+import json
+import os
+
+import pytest
+
+from backend import feedback_store
+from backend.feedback_store import FeedbackStore
+
+
+def _legacy(tmp_path, entries):
+    (tmp_path / "feedback_user.json").write_text(json.dumps({"entries": entries, "stats": {}}))
+
+
+def test_legacy_document_is_migrated_once(tmp_path):
+    _legacy(tmp_path, [{"ts": 1, "outcome": "win", "usefulness": 8}, {"ts": 2, "outcome": "partial", "usefulness": 6}])
+    store = FeedbackStore(str(tmp_path))
+    store.add({"outcome": "loss", "usefulness": 1})
+    store.close()
+
+    again = FeedbackStore(str(tmp_path))  # marker present: no second copy
+    assert [e["outcome"] for e in again.iter_entries()] == ["win", "partial", "loss"]
+    assert again.aggregate() == {"count": 3, "success_rate": 50.0, "avg_usefulness": 5.0}
+    assert (tmp_path / "feedback_user.json").exists()
+
+
+def test_rotation_and_torn_tail(tmp_path):
+    store = FeedbackStore(str(tmp_path), segment_bytes=300, fsync_every=4)
+    for i in range(10):
+        store.add({"scenario_id": f"s{i}", "outcome": "win", "usefulness": 5})
+    segs = store.segments()
+    assert len(segs) > 1
+
+    with open(segs[-1], "ab") as f:
+        f.write(b'{"ts": 1, "outc')  # crash mid-append
+    assert [e["scenario_id"] for e in store.iter_entries()] == [f"s{i}" for i in range(10)]
+
+
+def test_aggregate_sidecar_tracks_appends_and_rebuilds(tmp_path):
+    a = FeedbackStore(str(tmp_path))
+    b = FeedbackStore(str(tmp_path))  # second worker on the same log
+    a.add({"outcome": "win", "usefulness": 10})
+    b.add({"outcome": "loss", "usefulness": 0})
+    assert a.aggregate() == {"count": 2, "success_rate": 50.0, "avg_usefulness": 5.0}
+
+    (tmp_path / "feedback" / "aggregate.json").write_text("{}")  # corrupted sidecar
+    assert FeedbackStore(str(tmp_path)).rebuild() == a.aggregate() == b.aggregate()
+
+
+def test_spool_single_writer_and_inflight_recovery(tmp_path):
+    writer = FeedbackStore(str(tmp_path), ingest="spool", flush_interval=60)
+    worker = FeedbackStore(str(tmp_path), ingest="spool", flush_interval=60)
+    assert writer._writer_fd is not None and worker._writer_fd is None
+
+    for i in range(50):
+        (writer if i % 2 else worker).add({"outcome": "win", "usefulness": 1})
+    assert writer.aggregate()["count"] == 0  # still spooled
+    assert writer.flush_spool() == 50
+    assert worker.aggregate()["count"] == 50
+
+    # a writer died after moving a batch aside: replayed on takeover...
+    log_dir = tmp_path / "feedback"
+    batch = b'{"outcome":"partial","usefulness":3}\n'
+    (log_dir / "spool.1.inflight").write_bytes(batch)
+    writer._recover_inflight()
+    # ...but not twice if it died after appending and before deleting the batch
+    (log_dir / "spool.2.inflight").write_bytes(batch)
+    writer._recover_inflight()
+    assert writer.aggregate()["count"] == 51
+    assert not list(log_dir.glob("*.inflight"))
+
+
+def test_interrupted_migration_is_not_duplicated(tmp_path, monkeypatch):
+    _legacy(tmp_path, [{"ts": 1, "outcome": "win", "usefulness": 8}, {"ts": 2, "outcome": "loss", "usefulness": 2}])
+    real = FeedbackStore._write_marker
+
+    def crash_before_done(self, info):
+        if info["state"] == "done":
+            raise KeyboardInterrupt("killed after copying, before the final marker")
+        real(self, info)
+
+    monkeypatch.setattr(FeedbackStore, "_write_marker", crash_before_done)
+    with pytest.raises(KeyboardInterrupt):
+        FeedbackStore(str(tmp_path))
+    monkeypatch.setattr(FeedbackStore, "_write_marker", real)
+
+    store = FeedbackStore(str(tmp_path))
+    assert [e["ts"] for e in store.iter_entries()] == [1, 2]
+    assert store.aggregate()["count"] == 2
+    assert FeedbackStore(str(tmp_path)).aggregate()["count"] == 2
+
+
+def _kill_writer(store):
+    # simulate the writer process dying: its writer.lock is released, nothing is flushed
+    store._stop.set()
+    os.close(store._writer_fd)
+    store._writer_fd = None
+
+
+def test_takeover_repairs_torn_tail_before_replaying(tmp_path):
+    dead = FeedbackStore(str(tmp_path), ingest="spool", flush_interval=60)
+    dead._append([b'{"outcome":"win","usefulness":1}\n'], [{"outcome": "win", "usefulness": 1}])
+    heir = FeedbackStore(str(tmp_path), ingest="spool", flush_interval=60)
+    _kill_writer(dead)
+
+    log_dir = tmp_path / "feedback"
+    with open(dead.segments()[-1], "ab") as f:
+        f.write(b'{"outcome":"par')  # died mid-append...
+    (log_dir / "spool.1.inflight").write_bytes(b'{"outcome":"partial","usefulness":3}\n')  # ...of this batch
+
+    assert heir._try_become_writer()
+    assert [e["outcome"] for e in heir.iter_entries()] == ["win", "partial"]
+    assert heir.rebuild()["count"] == 2
+
+
+def test_takeover_skips_partly_appended_batch(tmp_path):
+    dead = FeedbackStore(str(tmp_path), ingest="spool", flush_interval=60)
+    heir = FeedbackStore(str(tmp_path), ingest="spool", flush_interval=60)
+    lines = [b'{"n":%d,"outcome":"win","usefulness":1}\n' % i for i in range(4)]
+    dead._append(lines[:2], [{"outcome": "win", "usefulness": 1}] * 2)  # died after two of four lines
+    _kill_writer(dead)
+    (tmp_path / "feedback" / "spool.1.inflight").write_bytes(b"".join(lines))
+
+    assert heir._try_become_writer()
+    assert [e["n"] for e in heir.iter_entries()] == [0, 1, 2, 3]
+    assert heir.aggregate()["count"] == 4
+
+
+def test_spool_without_flock_appends_directly(tmp_path, monkeypatch):
+    monkeypatch.setattr(feedback_store, "fcntl", None)
+    store = FeedbackStore(str(tmp_path), ingest="spool")
+    assert store.ingest == "direct" and store._flusher is None
+    store.add({"outcome": "win", "usefulness": 4})
+    assert store.aggregate()["count"] == 1
+
+
+def test_read_since_streams_with_resumable_positions(tmp_path):
+    store = FeedbackStore(str(tmp_path), segment_bytes=200)
+    for i in range(6):
+        store.add({"scenario_id": f"s{i}", "outcome": "win"})
+    stream = store.read_since(1, 0)
+    first, seg, off = next(stream)  # lazy: nothing past the first line has been read yet
+    assert first["scenario_id"] == "s0"
+    rest = [e["scenario_id"] for e, _s, _o in store.read_since(seg, off)]
+    assert rest == [f"s{i}" for i in range(1, 6)]
+
+
+def test_append_reads_the_log_only_after_another_writer(tmp_path, monkeypatch):
+    a = FeedbackStore(str(tmp_path), segment_bytes=10_000)
+    b = FeedbackStore(str(tmp_path), segment_bytes=10_000)
+    a.add({"outcome": "win"})  # first append opens the newest segment
+    b.add({"outcome": "win"})
+    calls = {"listdir": 0, "read_since": 0}
+    real_segments, real_read_since = FeedbackStore.segments, FeedbackStore.read_since
+
+    def segments(self):
+        calls["listdir"] += 1
+        return real_segments(self)
+
+    def read_since(self, segment, offset):
+        calls["read_since"] += 1
+        return real_read_since(self, segment, offset)
+
+    monkeypatch.setattr(FeedbackStore, "segments", segments)
+    monkeypatch.setattr(FeedbackStore, "read_since", read_since)
+    a.add({"outcome": "win"})  # b wrote since: catch up once
+    assert calls == {"listdir": 0, "read_since": 1}
+    for _ in range(20):
+        a.add({"outcome": "loss"})
+    assert calls == {"listdir": 0, "read_since": 1}
+
+    with open(a.segments()[-1], "ab") as f:  # a writer that died before updating the sidecar
+        f.write(b'{"outcome": "win"}\n')
+    a.add({"outcome": "win"})
+    assert a.aggregate()["count"] == 25
+    assert FeedbackStore(str(tmp_path)).rebuild() == a.aggregate()
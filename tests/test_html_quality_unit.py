@@ -0,0 +1,43 @@
+# tests/test_html_quality_unit.py
+
+import re
+
+from backend.html_quality import HtmlQualityGate, QualityCheck, DEFAULT_CHECKS
+
+
+def test_uk_currency_persona_and_alert_in_one_pass():
+    html = "<header>h</header><p>Negotiate as The Friend for $5k</p>"
+    out, warnings = HtmlQualityGate().run(html, persona=None, region="UK")
+    assert "align with a Friend-style counterpart" in out
+    assert "£5k" in out and "$" not in out
+    assert len(warnings) == 3  # persona, currency, links
+    assert out.startswith("<header>h</header><div")
+
+
+def test_clean_document_is_untouched():
+    html = "<p>£50k</p><a href='1'>a</a><a href='2'>b</a>"
+    assert HtmlQualityGate().run(html, region="UK") == (html, [])
+
+
+def test_custom_check_rides_the_same_scan():
+    class TodoCheck(QualityCheck):
+        name = "todo"
+        pattern = r"TODO"
+        first_chars = "t"
+
+        def start(self, ctx):
+            return {"n": 0}
+
+        def on_match(self, m, state, ctx):
+            state["n"] += 1
+
+        def finalize(self, state, ctx):
+            return f"{state['n']} TODO markers left." if state["n"] else None
+
+        def rewrite(self, m, state, ctx):
+            return ""
+
+    gate = HtmlQualityGate(DEFAULT_CHECKS + (TodoCheck(),))
+    out, warnings = gate.run("<a 1><a 2><p>todo: x</p>", region="US")
+    assert warnings == ["1 TODO markers left."]
+    assert re.search(r"<p>: x</p>$", out)
@@ -0,0 +1,32 @@
+# tests/test_keyword_matcher_unit.py
+
+import pytest
+
+import backend.keyword_matcher as km
+from backend.keyword_matcher import KeywordMatcher
+
+KEYWORDS = [("he", "a"), ("she", "b"), ("his", "a"), ("hers", "b"), ("must", "c"), ("must not", "c")]
+
+
+@pytest.fixture(params=["find", "aho-corasick"])
+def engine(request, monkeypatch):
+    monkeypatch.setattr(km, "AC_MIN_KEYWORDS", 10_000 if request.param == "find" else 0)
+
+
+def test_overlapping_matches_with_positions(engine):
+    m = KeywordMatcher(KEYWORDS)
+    assert m.find_all("uSHERS must not") == [
+        (1, 4, "she"), (2, 4, "he"), (2, 6, "hers"), (7, 11, "must"), (7, 15, "must not"),
+    ]
+    assert m.counts("he said he") == {"he": 2}
+    assert m.hits("ushers") == {"a": {"he"}, "b": {"she", "hers"}}
+
+
+def test_feed_finds_keywords_across_chunks(engine):
+    m = KeywordMatcher(KEYWORDS)
+    found, carry, pos = [], "", 0
+    for chunk in ["you mu", "st n", "ot, she"]:
+        matches, carry = m.feed(chunk, carry, pos)
+        found += matches
+        pos += len(chunk)
+    assert found == m.find_all("you must not, she")
@@ -0,0 +1,35 @@
+# tests/test_llm_client_unit.py
+
+import threading
+
+from backend.llm_client import EnhancementClient, FakeBackend
+
+
+def test_enhance_caches_by_content():
+    fake = FakeBackend(responder=lambda msgs: msgs[-1]["content"].upper())
+    client = EnhancementClient(fake, deadline=2.0)
+
+    assert client.enhance("<p>hi</p>") == "<P>HI</P>"
+    assert client.enhance("<p>hi</p>") == "<P>HI</P>"
+    assert fake.calls == 1
+    assert client.snapshot()["hits"] == 1
+
+
+def test_deadline_falls_back_to_original():
+    client = EnhancementClient(FakeBackend(latency=0.5, responder=lambda m: "rewritten"), deadline=0.05)
+    assert client.enhance("<p>orig</p>") == "<p>orig</p>"
+    assert client.snapshot()["timeouts"] == 1
+
+
+def test_concurrency_limit_rejects_when_slots_busy():
+    gate = threading.Event()
+
+    def slow(msgs):
+        gate.wait(2)
+        return "done"
+
+    client = EnhancementClient(FakeBackend(responder=slow), max_concurrency=1, deadline=0.05)
+    assert client.enhance("a") == "a"          # times out, keeps its slot until the call ends
+    assert client.enhance("b") == "b"          # no free slot within the deadline
+    assert client.snapshot()["rejected"] == 1
+    gate.set()
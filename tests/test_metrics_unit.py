@@ -0,0 +1,60 @@
+# tests/test_metrics_unit.py
+
+import threading
+
+from backend.metrics import Registry
+
+
+def test_counter_sums_shards_from_all_threads():
+    reg = Registry()
+    c = reg.counter("jobs_total", "Jobs.", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            c.inc(("a",))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert c.collect() == {("a",): 4000}
+    assert 'jobs_total{kind="a"} 4000' in reg.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    reg = Registry()
+    h = reg.histogram("lat_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(v, ("/x",))
+    text = reg.render()
+    assert "# TYPE lat_seconds histogram" in text
+    assert 'lat_seconds_bucket{route="/x",le="0.1"} 1' in text
+    assert 'lat_seconds_bucket{route="/x",le="1"} 2' in text
+    assert 'lat_seconds_bucket{route="/x",le="+Inf"} 3' in text
+    assert 'lat_seconds_count{route="/x"} 3' in text
+
+
+def test_callback_metric_skips_missing_values():
+    reg = Registry()
+    reg.callback("ratio", "Ratio.", lambda: {("a",): 0.5, ("b",): None}, ("cache",))
+    text = reg.render()
+    assert 'ratio{cache="a"} 0.5' in text
+    assert 'cache="b"' not in text
+
+
+def test_finished_thread_shards_are_folded():
+    reg = Registry()
+    c = reg.counter("req_total", "Requests.")
+    h = reg.histogram("req_seconds", "Latency.", buckets=(0.1,))
+
+    def work():
+        c.inc()
+        h.observe(0.05)
+
+    for _ in range(2000):  # one short-lived thread per request, like the threaded dev server
+        t = threading.Thread(target=work)
+        t.start()
+        t.join()
+    assert len(c._shards) < 2 * c._PRUNE_MIN and len(h._shards) < 2 * h._PRUNE_MIN
+    assert c.collect() == {(): 2000}
+    assert h.collect()[()][:2] == [2000, 0]
+    assert c._shards == []  # a scrape folds every finished thread's shard
@@ -0,0 +1,37 @@
+# tests/test_pdf_renderer_unit.py
+
+from backend.pdf_renderer import PdfRenderer
+
+
+def _fake_render(html, base_url, out_path):
+    with open(out_path, "wb") as f:
+        f.write(b"%PDF-" + html.encode("utf-8"))
+    return out_path
+
+
+def test_render_caches_by_content_hash(tmp_path):
+    pdf = PdfRenderer(tmp_path, base_url=str(tmp_path), max_workers=1, render_fn=_fake_render)
+    try:
+        status, path = pdf.render("abc", "<p>one</p>", wait=30)
+        assert status == "ready"
+        assert path.name.startswith("abc.") and path.suffix == ".pdf"
+        assert path.read_bytes() == b"%PDF-<p>one</p>"
+
+        # same content -> cache hit, same file
+        assert pdf.render("abc", "<p>one</p>", wait=0) == ("ready", path)
+        # changed content -> new key
+        _, path2 = pdf.render("abc", "<p>two</p>", wait=30)
+        assert path2 != path
+    finally:
+        pdf.shutdown()
+
+
+def test_saturated_queue_is_not_enqueued(tmp_path):
+    pdf = PdfRenderer(tmp_path, base_url=str(tmp_path), max_workers=1, max_pending=1, render_fn=_fake_render)
+    try:
+        with pdf._lock:
+            pdf._inflight["busy"] = object()  # occupy the only slot
+        assert pdf.render("r1", "<p>x</p>", wait=0) == ("saturated", None)
+    finally:
+        pdf._inflight.clear()
+        pdf.shutdown()
@@ -0,0 +1,42 @@
+# tests/test_profiling_unit.py
+
+from flask import Flask
+
+from backend.profiling import RequestProfiler
+
+
+def _busy_work():
+    return sum(i * i for i in range(20000))
+
+
+def _app(tmp_path):
+    app = Flask(__name__)
+
+    @app.get("/work")
+    def work():
+        return str(_busy_work())
+
+    RequestProfiler(tmp_path, admin_token="s3cret").init_app(app)
+    return app.test_client()
+
+
+def test_profile_only_for_admin_flagged_requests(tmp_path):
+    client = _app(tmp_path)
+    assert "X-Profile-Id" not in client.get("/work?__profile=1").headers
+    assert "X-Profile-Id" not in client.get("/work", headers={"X-Admin-Token": "s3cret"}).headers
+
+    resp = client.get("/work", headers={"X-Admin-Token": "s3cret", "X-Profile": "1", "X-Request-Id": "req-1"})
+    assert resp.headers["X-Profile-Id"] == "req-1"
+    assert (tmp_path / "req-1.pstats").exists()
+
+
+def test_admin_endpoint_aggregates_hot_functions(tmp_path):
+    client = _app(tmp_path)
+    admin = {"X-Admin-Token": "s3cret"}
+    for _ in range(2):
+        client.get("/work?__profile=1", headers=admin)
+
+    assert client.get("/admin/profiles").status_code == 403
+    body = client.get("/admin/profiles?top=50&sort=cumtime", headers=admin).get_json()
+    assert body["profiles"] == 2
+    assert any("_busy_work" in row["function"] for row in body["top"])
@@ -0,0 +1,26 @@
+# tests/test_questionnaire_mapper_unit.py
+
+from backend.questionnaire_mapper import _infer_persona, _infer_user_style, map_many, map_questionnaire_to_inputs
+
+
+def test_rule_priority_is_table_order():
+    # budget_guard outranks assertive/collaborative whatever the keyword position
+    assert _infer_persona("Pushy, collaborative, but on a TIGHT   budget") == "budget_guard"
+    assert _infer_persona("urgent and a bit of a skeptic") == "skeptical"
+    assert _infer_persona("") == "neutral"
+    assert _infer_user_style("direct, builds rapport, loves numbers") == "data_driven"
+    assert _infer_user_style(None) == "diplomatic"
+
+
+def test_map_many_matches_single_calls():
+    answers = [
+        {"q_persona_desc": "hardball", "salary_range": "100k – 120k", "benefits": "gym; remote\nbonus"},
+        {"counterpart_persona": "custom", "q_user_style": "firm", "q_risk": "9", "country": "Japan"},
+    ]
+    mapped = map_many(answers)
+    assert mapped == [map_questionnaire_to_inputs(a) for a in answers]
+    assert mapped[0]["counterpart_persona"] == "assertive"
+    assert mapped[0]["goals"]["monetary"]["range_low"] == "100k"
+    assert mapped[0]["goals"]["benefits"] == ["gym", "remote", "bonus"]
+    assert (mapped[1]["counterpart_persona"], mapped[1]["user_style"]) == ("custom", "assertive")
+    assert mapped[1]["risk_tolerance"] == 3 and mapped[1]["culture"]["context_level"] == "high"
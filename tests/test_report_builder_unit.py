@@ -0,0 +1,29 @@
+# tests/test_report_builder_unit.py
+
+import os
+
+from backend import report_builder as rb
+
+
+def test_template_cached_and_reloaded_on_mtime(tmp_path, monkeypatch):
+    tpl = tmp_path / "report.html"
+    tpl.write_text("<script>const reportData = {a:1};</script>", encoding="utf-8")
+    monkeypatch.setattr(rb, "_template_candidates", lambda: [str(tpl)])
+    monkeypatch.setattr(rb, "TEMPLATE_CHECK_SECONDS", 0.0)
+    monkeypatch.setattr(rb, "_TPL", {"key": None, "parts": None, "checked": 0.0})
+
+    out = rb.build_report_html({})["html"]
+    assert out.startswith("<script>const reportData = {")
+    assert out.endswith("};</script>")
+    assert '"marketA"' in out
+
+    tpl.write_text("<p>v2</p>", encoding="utf-8")
+    st = os.stat(tpl)
+    os.utime(tpl, (st.st_atime, st.st_mtime + 5))
+    out2 = rb.build_report_html({})["html"]
+    assert out2.startswith("<p>v2</p>\n<script>\nconst reportData = {")
+
+
+def test_inject_matches_template_split():
+    html = rb._inject_report_data("x const reportData = {q:{}}; y", {"k": "£"})
+    assert html == 'x const reportData = {"k":"£"}; y'
@@ -0,0 +1,57 @@
+# tests/test_report_jobs_unit.py
+
+import threading
+import time
+
+from backend.report_jobs import JobQueue
+
+
+def _wait(job, timeout=5.0):
+    t0 = time.time()
+    while job.status in ("queued", "running") and time.time() - t0 < timeout:
+        time.sleep(0.01)
+    return job
+
+
+def test_job_reports_stages_and_result():
+    q = JobQueue(max_workers=1, max_queue=0)
+
+    def work(x, progress):
+        progress("render")
+        progress("persist")
+        return {"report_url": f"/report/{x}"}
+
+    job = _wait(q.submit(work, "abc"))
+    body = job.to_dict()
+    assert body["status"] == "done"
+    assert body["report_url"] == "/report/abc"
+    assert [s["name"] for s in body["stages"]] == ["render", "persist"]
+    assert all(s["status"] == "done" for s in body["stages"])
+
+
+def test_full_queue_sheds_load():
+    q = JobQueue(max_workers=1, max_queue=1)
+    gate = threading.Event()
+
+    def blocked(progress):
+        gate.wait(5)
+        return {}
+
+    assert q.submit(blocked) is not None
+    assert q.submit(blocked) is not None
+    assert q.submit(blocked) is None
+    assert q.stats()["rejected"] == 1
+    gate.set()
+
+
+def test_failed_job_carries_reason():
+    q = JobQueue(max_workers=1, max_queue=0)
+
+    def boom(progress):
+        progress("render")
+        raise RuntimeError("engine failed: nope")
+
+    job = _wait(q.submit(boom))
+    assert job.status == "error"
+    assert job.to_dict()["reason"] == "engine failed: nope"
+    assert job.stages[-1]["status"] == "error"
@@ -0,0 +1,27 @@
+# tests/test_report_sections_unit.py
+
+from backend.app import render_report_sections
+
+
+ANSWERS = {
+    "salary_low": 50000, "salary_high": 70000, "salary_target": 66000,
+    "persona": "fox", "country": "UK", "priorities": "Salary, Title",
+}
+
+
+def test_resubmission_rerenders_only_changed_sections():
+    html1, state1, reused1 = render_report_sections(ANSWERS)
+    assert reused1 == []
+
+    changed = dict(ANSWERS, salary_target=52000)
+    html2, state2, reused2 = render_report_sections(changed, prev=state1)
+    assert reused2 == ["header", "market", "highlights"]
+    assert state2["html"]["summary"] != state1["html"]["summary"]
+    assert html2 == render_report_sections(changed)[0]
+
+
+def test_debug_section_tracks_every_answer():
+    _, state, _ = render_report_sections(ANSWERS, debug=True)
+    _, _, reused = render_report_sections(dict(ANSWERS, tone="warm"), prev=state, debug=True)
+    assert "debug" not in reused
+    assert "summary" in reused
@@ -0,0 +1,67 @@
+# tests/test_report_sweeper_unit.py
+
+import os
+import time
+
+from backend.report_sweeper import ReportSweeper
+
+
+def _touch(path, content="x", age_s=0.0):
+    path.write_text(content, encoding="utf-8")
+    ts = time.time() - age_s
+    os.utime(path, (ts, ts))
+
+
+def test_sweep_evicts_expired_unsaved_only(tmp_path):
+    reports = tmp_path / "reports"
+    saved = tmp_path / "saved"
+    reports.mkdir()
+    saved.mkdir()
+
+    _touch(reports / "old1.html", "a" * 10, age_s=7200)
+    _touch(reports / "old1.abcd.pdf", "b" * 5, age_s=7200)
+    _touch(reports / "kept.html", "c" * 7, age_s=7200)
+    _touch(saved / "kept.html", "c" * 7)
+    _touch(reports / "fresh.html", "d", age_s=10)
+
+    evicted = []
+    sw = ReportSweeper(reports, saved, ttl_seconds=3600, batch_size=1, batch_pause=0,
+                       on_evict=evicted.append)
+    run = sw.sweep_once()
+
+    assert run["files_removed"] == 2
+    assert run["bytes_reclaimed"] == 15
+    assert evicted == ["old1"]
+    assert sorted(p.name for p in reports.iterdir()) == ["fresh.html", "kept.html"]
+    assert sw.snapshot()["bytes_reclaimed"] == 15
+
+
+def test_dry_run_keeps_files(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    _touch(reports / "old.html", "abc", age_s=7200)
+
+    sw = ReportSweeper(reports, tmp_path / "saved", ttl_seconds=60)
+    run = sw.sweep_once(dry_run=True)
+
+    assert run["candidates"] == 1
+    assert (reports / "old.html").exists()
+    assert sw.snapshot()["runs"] == 0
+
+
+def test_sweep_totals_are_exported_on_metrics(tmp_path, monkeypatch):
+    from backend import app as app_module
+
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    _touch(reports / "old.html", "a" * 10, age_s=7200)
+    _touch(reports / "old.abcd.pdf", "b" * 4, age_s=7200)
+    sw = ReportSweeper(reports, tmp_path / "saved", ttl_seconds=60, batch_pause=0)
+    sw.sweep_once()
+    monkeypatch.setattr(app_module, "SWEEPER", sw)
+
+    text = app_module.create_app().test_client().get("/metrics").get_data(as_text=True)
+    assert "# TYPE negpro_reports_bytes_reclaimed_total counter" in text
+    assert "negpro_reports_bytes_reclaimed_total 14" in text
+    assert "negpro_reports_files_removed_total 2" in text
+    assert "negpro_reports_evicted_total 1" in text
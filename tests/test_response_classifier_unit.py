@@ -0,0 +1,45 @@
+# tests/test_response_classifier_unit.py
+
+from backend.response_classifier import ResponseClassifier
+
+PREDICTOR = {"response_types": [
+    {"id": "LOWBALL", "label": "Lowball", "trigger_words": ["budget", "too high", "tight"],
+     "recommended_counter_ids": ["CTR-LOWBALL-01"], "confidence": 0.9, "severity_level": "medium"},
+    {"id": "STALL", "label": "Stall", "trigger_words": ["later", "next week"],
+     "recommended_counter_ids": ["CTR-STALL-01", "NOPE"], "confidence": 0.85},
+    {"id": "UNKNOWN", "label": "Unknown", "trigger_words": [],
+     "recommended_counter_ids": ["FLB-001"], "confidence": 0.5},
+]}
+TACTICS = {"tactics": {"counters": [
+    {"id": "CTR-LOWBALL-01", "name": "Re-anchor", "text": "Let's look at market data."},
+    {"id": "CTR-STALL-01", "name": "Pin a date", "text": "Can we pick a date?"},
+]}}
+
+
+def test_ranks_types_and_resolves_counters():
+    rc = ResponseClassifier(PREDICTOR, TACTICS)
+    ranked = rc.classify("Budget is tight, let's talk next week")
+    assert [r["id"] for r in ranked] == ["LOWBALL", "STALL"]
+    assert ranked[0]["matched"] == ["budget", "tight"] and ranked[0]["score"] == 1.8
+    assert ranked[0]["counters"] == [{"id": "CTR-LOWBALL-01", "name": "Re-anchor", "text": "Let's look at market data."}]
+    # unknown counter ids are dropped from the resolved list but kept in the ids
+    assert [c["id"] for c in ranked[1]["counters"]] == ["CTR-STALL-01"]
+    assert ranked[1]["recommended_counter_ids"] == ["CTR-STALL-01", "NOPE"]
+    # nothing matched -> the trigger-less fallback type
+    assert [r["id"] for r in rc.classify("sounds good")] == ["UNKNOWN"]
+
+
+def test_stream_matches_whole_utterance():
+    rc = ResponseClassifier(PREDICTOR, TACTICS)
+    s = rc.stream()
+    for chunk in ["That is to", "o hi", "gh, maybe lat", "er"]:
+        s.feed(chunk)
+    assert s.end() == rc.classify("That is too high, maybe later")
+    assert [r["id"] for r in s.end()] == ["UNKNOWN"]  # reset after end()
+
+
+def test_repo_data_files():
+    rc = ResponseClassifier.from_files()
+    top = rc.classify("You don't understand, that's unrealistic")[0]
+    assert top["id"] == "PERSONAL_ATTACK"
+    assert top["counters"][0]["id"] == "DEESC-BOUNDARY-01"
@@ -0,0 +1,60 @@
+# tests/test_serialization_unit.py
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from backend import serialization as ser
+
+
+def test_compact_roundtrip_and_bytes():
+    doc = {"name": "£ Négociation", "n": [1, 2.5, None], "ok": True}
+    text = ser.dumps(doc)
+    assert ", " not in text and ": " not in text
+    assert "£" in text  # no ASCII escaping
+    assert ser.loads(text) == doc
+    assert ser.loads(ser.dumps_bytes(doc)) == doc
+
+
+def test_default_handles_common_types():
+    out = ser.loads(ser.dumps({"d": date(2025, 8, 17), "s": {1}}))
+    assert out == {"d": "2025-08-17", "s": [1]}
+
+
+def test_default_covers_jsonify_types():
+    @dataclass
+    class Point:
+        x: int
+
+    uid = UUID("12345678-1234-5678-1234-567812345678")
+    out = ser.loads(ser.dumps({"amount": Decimal("10.50"), "id": uid, "p": Point(3)}))
+    assert out == {"amount": "10.50", "id": str(uid), "p": {"x": 3}}
+
+
+def test_pretty_is_opt_in():
+    assert "\n" in ser.dumps({"a": 1}, pretty=True)
+    assert "\n" not in ser.dumps({"a": 1})
+
+
+def test_ints_beyond_64_bits_fall_back_to_json():
+    big = 10 ** 20
+    assert ser.dumps({"n": big}) == '{"n":100000000000000000000}'
+    assert ser.dumps_bytes([big, -big]) == b"[100000000000000000000,-100000000000000000000]"
+
+
+def test_endpoints_accept_ints_beyond_64_bits(tmp_path, monkeypatch):
+    import api
+    from backend import app as app_module
+    from backend.feedback_store import FeedbackStore
+
+    monkeypatch.setattr(app_module, "REPORTS_DIR", tmp_path)
+    monkeypatch.setattr(api, "feedback_store", FeedbackStore(data_dir=str(tmp_path)))
+    client = api.app.test_client()
+
+    r = client.post("/questionnaire/report", json={"answers": {"salary_low": 10 ** 20, "salary_high": 10 ** 20 + 1}})
+    assert r.status_code == 201 and r.get_json()["ok"]
+
+    r = client.post("/feedback", json={"scenario_id": "lowball", "outcome": "win", "usefulness": 2 ** 70})
+    assert r.status_code == 200
+    assert r.get_json()["aggregate"]["count"] == 1
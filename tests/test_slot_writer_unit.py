@@ -0,0 +1,86 @@
+# tests/test_slot_writer_unit.py
+
+import json
+import threading
+
+from backend import app as app_module
+from backend.llm_client import EnhancementClient, FakeBackend
+from backend.slot_writer import SlotWriter
+
+FALLBACK = {"executive_summary": "fallback", "strategic_highlights": ["a"]}
+
+
+def _responder(msgs):
+    reqs = json.loads(msgs[-1]["content"])["requests"]
+    return json.dumps({"slots": [
+        {"id": r["id"], "executive_summary": f"{r['persona']} in {r['country']}" + (f" at {r['target']}" if r["target"] else ""),
+         "strategic_highlights": [f"anchor {r['range_high']}"]}
+        for r in reqs
+    ]})
+
+
+def test_concurrent_reports_share_one_batched_call():
+    fake = FakeBackend(latency=0.05, responder=_responder)
+    writer = SlotWriter(EnhancementClient(fake, deadline=2.0), batch_size=8, max_wait=0.1)
+    combos = [("fox", "UK", 50000, 70000), ("owl", "US", 90000, 120000)] * 3
+    results = [None] * len(combos)
+
+    def run(i):
+        results[i] = writer.write(*combos[i], FALLBACK)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(combos))]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    assert fake.calls == 1
+    assert results[0] == {"executive_summary": "fox in uk", "strategic_highlights": ["anchor 70000"]}
+    assert results[1]["executive_summary"] == "owl in us"
+    snap = writer.snapshot()
+    assert snap["slots_sent"] == 2
+    assert snap["coalesced"] + snap["cache_hits"] == 4
+    writer.close()
+
+
+def test_invalid_output_falls_back():
+    writer = SlotWriter(EnhancementClient(FakeBackend(responder=lambda m: "not json"), deadline=1.0), max_wait=0.01)
+    assert writer.write("fox", "UK", 1, 2, FALLBACK) == FALLBACK
+    assert writer.snapshot()["failed"] == 1
+    writer.close()
+
+
+def test_target_is_part_of_the_slot():
+    fake = FakeBackend(responder=_responder)
+    writer = SlotWriter(EnhancementClient(fake, deadline=1.0), max_wait=0.01)
+    a = writer.write("fox", "UK", 50000, 70000, FALLBACK, target=52000)
+    b = writer.write("fox", "UK", 50000, 70000, FALLBACK, target=69000)
+    assert (a["executive_summary"], b["executive_summary"]) == ("fox in uk at 52000", "fox in uk at 69000")
+    assert fake.calls == 2
+    writer.close()
+
+
+def test_close_stops_the_collector():
+    writer = SlotWriter(EnhancementClient(FakeBackend(responder=_responder), deadline=1.0), max_wait=0.01)
+    writer.close()
+    assert not writer._collector.is_alive()
+    assert writer.write("fox", "UK", 1, 2, FALLBACK) == FALLBACK  # closed: fallback, no call
+    writer.close()  # idempotent
+
+
+def test_report_render_makes_one_slot_write(monkeypatch):
+    calls = []
+
+    class Recorder:
+        def write(self, persona, country, low, high, fallback=None, target=None):
+            calls.append((persona, target))
+            return {"executive_summary": f"LLM summary for {target}", "strategic_highlights": ["LLM bullet"]}
+
+    monkeypatch.setattr(app_module, "SLOTS", Recorder())
+    answers = {"persona": "fox", "country": "UK", "salary_low": 50000, "salary_high": 70000, "salary_target": 66000}
+    html, state, _ = app_module.render_report_sections(answers)
+    assert calls == [("fox", 66000)]
+    assert "LLM summary for 66000" in html and "LLM bullet" in html
+
+    # a new target re-renders both slot sections (one more write), the market section is reused
+    _, _, reused = app_module.render_report_sections(dict(answers, salary_target=52000), prev=state)
+    assert calls == [("fox", 66000), ("fox", 52000)]
+    assert "highlights" not in reused and "summary" not in reused and "market" in reused
@@ -0,0 +1,96 @@
+# tests/test_tagger_unit.py
+
+from collections import Counter
+
+import pytest
+
+import backend.tagger as tagger
+from backend.tagger import PersonaDetector
+
+
+def _counter_emotion(rules, text):
+    # the original detect_emotion(): Counter over listed indicators, most_common(1)
+    lowered, counter = text.lower(), Counter()
+    for trig in rules["triggers"]:
+        for ind in trig["detection_indicators"]:
+            if ind.lower() in lowered:
+                counter[trig["name"]] += 1
+    return counter.most_common(1)[0][0] if counter else "neutral"
+
+
+def test_emotion_ties_follow_first_hit_like_counter():
+    rules = {"triggers": [
+        {"name": "anger", "detection_indicators": ["furious"]},
+        {"name": "anxiety", "detection_indicators": ["worried"]},
+        {"name": "anger", "detection_indicators": ["unfair", "Unfair"]},  # shares a name; listed twice
+    ]}
+    det = PersonaDetector(emotion_rules=rules)
+    for text in ["worried it's unfair", "unfair, furious and worried", "worried and unfair",
+                 "furious, worried", "worried", "calm"]:
+        assert det.detect_emotion(text) == _counter_emotion(rules, text), text
+    assert det.detect_emotion("I'm worried this is unfair") == "anger"  # 2 listed indicators vs 1
+
+    tie = {"triggers": [
+        {"name": "anger", "detection_indicators": ["furious"]},
+        {"name": "anxiety", "detection_indicators": ["worried"]},
+        {"name": "anger", "detection_indicators": ["unfair"]},
+    ]}
+    # 1 vs 1: anxiety was hit first (rule 2) even though anger's first rule comes earlier
+    assert PersonaDetector(emotion_rules=tie).detect_emotion("unfair and worried") == "anxiety"
+
+
+def test_tagger_reads_repo_data_files():
+    det = PersonaDetector.from_files()
+    assert det.tag("We MUST close this now, it's unfair") == ("aggressive", "anger")
+    assert det.detect("let's find a joint solution") == "collaborative"
+    assert det.detect_emotion("I'm worried and unsure, also angry") == "anxiety"
+    assert det.tag("hello") == ("default", "neutral")
+
+
+def test_scores_are_the_vectors_detect_and_tag_pick_from():
+    det = PersonaDetector.from_files()
+    text = "We MUST close this now, it's unfair and I'm worried"
+    personas, emotions = det.scores(text)
+    assert dict(zip(det.personas, personas)) == det.persona_scores(text)
+    assert list(emotions) == ["anger", "anxiety"]  # first-hit order
+    assert det.tag(text) == (det.detect(text), det.detect_emotion(text)) == ("aggressive", "anger")
+    assert det.scores(None) == ([0] * len(det.personas), {})
+
+
+def test_speech_patterns_add_to_keyword_scores():
+    det = PersonaDetector({"personas": [
+        {"type": "aggressive", "keywords": ["now"], "speechPatterns": [".*!$", "have to.*"]},
+        {"type": "analytical", "keywords": ["data", "report"], "speechPatterns": ["the data shows.*"]},
+        {"type": "collaborative", "keywords": [], "speechPatterns": ["let’s.*"]},
+    ]})
+    assert det.speech.regex.groupindex.keys() == {"p0_0", "p0_1", "p1_0", "p2_0"}
+    assert det.persona_scores("We have to sign now!") == {"aggressive": 3, "analytical": 0, "collaborative": 0}
+    # patterns alone decide when no keyword is present (straight or curly apostrophe)
+    assert det.detect("Let's talk") == "collaborative"
+    # 1 keyword + 1 pattern vs 2 keywords + 1 pattern
+    assert det.detect("The data shows the report is late, now") == "analytical"
+    # ties go to the earlier persona
+    assert det.detect("data!") == "aggressive"
+
+
+@pytest.mark.parametrize("parallel_min", [10 ** 9, 1])
+def test_tag_many_dedupes_and_counts(monkeypatch, parallel_min):
+    monkeypatch.setattr(tagger, "PARALLEL_MIN_LINES", parallel_min)
+    det = PersonaDetector.from_files()
+    lines = ["We MUST close this now, it's unfair", "hello", None, "let's find a joint solution", "hello"]
+    out = det.tag_many(iter(lines), workers=2, chunk_size=2)
+    assert out["labels"] == [det.tag(u) for u in lines]
+    assert (out["lines"], out["unique"]) == (5, 4)
+    assert out["personas"] == {"aggressive": 1, "default": 3, "collaborative": 1}
+    assert out["emotions"]["neutral"] == 4
+
+
+def test_overlapping_and_nested_patterns_all_count():
+    det = PersonaDetector({"personas": [
+        {"type": "a", "speechPatterns": ["must.*", "must go"]},           # same start position
+        {"type": "b", "speechPatterns": ["st go", "go"]},                  # inside / overlapping
+        {"type": "c", "speechPatterns": [r"(no)\1", "(?i)deal", "team(s)?"]},  # groups, inline flag
+    ]})
+    assert det.speech.separate == ["p2_0", "p2_1", "p2_2"]
+    assert det.persona_scores("we must go") == {"a": 2, "b": 2, "c": 0}
+    assert det.persona_scores("nono, teams, DEAL") == {"a": 0, "b": 0, "c": 3}
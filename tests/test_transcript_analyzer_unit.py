@@ -0,0 +1,49 @@
+# tests/test_transcript_analyzer_unit.py
+
+import pytest
+
+from backend.tagger import PersonaDetector
+from backend.transcript_analyzer import TranscriptAnalyzer
+
+PERSONAS = {"personas": [
+    {"type": "aggressive", "keywords": ["must", "now"]},
+    {"type": "collaborative", "keywords": ["together", "joint"]},
+]}
+EMOTIONS = {"rules": [
+    {"emotion": "anger", "triggers": ["angry", "unfair"], "intensity": 1.2},
+    {"emotion": "anxiety", "triggers": ["worried", "unsure"], "intensity": 0.9},
+]}
+
+
+def test_window_counters_intensity_and_events():
+    seen = []
+    ta = TranscriptAnalyzer(PersonaDetector(PERSONAS, EMOTIONS), window=2, on_event=seen.append)
+
+    s = ta.add("You must sign now, this is unfair")
+    assert (s["persona"], s["emotion"]) == ("aggressive", "anger")
+    assert s["intensity"] == pytest.approx(1.2)
+    assert [e["type"] for e in s["events"]] == ["persona_shift", "emotion_shift"]
+
+    s = ta.add("I'm worried and unsure, can we work together?")
+    assert s["emotion_counts"] == {"anger": 1, "anxiety": 2}
+    assert s["emotion"] == "anxiety" and s["persona"] == "aggressive"
+    assert s["intensity"] == pytest.approx((1.2 + 1.8) / 2)
+    assert s["events"] == [{"type": "emotion_shift", "from": "anger", "to": "anxiety", "turn": 2}]
+
+    # the first turn leaves the window: its scores are subtracted
+    s = ta.add("a joint plan")
+    assert s["window_turns"] == 2
+    assert s["persona_scores"] == {"aggressive": 0, "collaborative": 2}
+    assert s["persona"] == "collaborative" and s["message"]["persona"] == "collaborative"
+    assert s["events"] == [{"type": "persona_shift", "from": "aggressive", "to": "collaborative", "turn": 3}]
+
+    s = ta.add("ok")
+    s = ta.add("ok")
+    assert (s["persona"], s["emotion"], s["intensity"]) == ("default", "neutral", 0.0)
+    assert len(seen) == 6
+
+
+def test_repo_data_files():
+    ta = TranscriptAnalyzer.from_files(window=5)
+    s = ta.add("That's unfair, I'm angry")
+    assert s["emotion"] == "anger" and s["intensity"] == pytest.approx(2.4)